@@ -0,0 +1,185 @@
+"""Fingerprinted static assets of the landing page, served with long-lived caching.
+
+Every file under `app/static` is read once per process and served at
+`/assets/<stem>.<hash><suffix>`, with the hash taken from the file content. A changed file gets a
+new URL, so responses are cached as `immutable` for a year and repeat visits do not even
+revalidate. Text assets are compressed once when the manifest is built (gzip, and brotli when
+the `brotli` package is installed) and served in the encoding the client prefers.
+
+Pages link assets through `asset_url(name)`.
+"""
+
+import functools
+import gzip
+import hashlib
+import logging
+import mimetypes
+import re
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Callable, Mapping
+
+from nicegui import app
+from starlette.requests import Request
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).parent / "static"
+ASSETS_PREFIX = "/assets"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+COMPRESSIBLE_TYPES = ("text/", "image/svg+xml", "application/javascript", "application/json")
+# below this size the encoded response is not worth the Content-Encoding and Vary headers
+MIN_COMPRESS_SIZE = 256
+
+_QUALITY = re.compile(r"q=(0(?:\.\d{0,3})?|1(?:\.0{0,3})?)")
+# tie-break between encodings the client accepts with the same quality: smallest first
+_PREFERENCE = ("br", "gzip", "identity")
+
+Compressor = Callable[[bytes], bytes]
+
+
+@dataclass(frozen=True)
+class Asset:
+    name: str
+    path: str
+    media_type: str
+    etag: str
+    encodings: Mapping[str, bytes]
+
+    @property
+    def url(self) -> str:
+        return f"{ASSETS_PREFIX}/{self.path}"
+
+    def etag_for(self, encoding: str) -> str:
+        """Strong ETag of one encoding: each is a different byte sequence, so each gets its own tag."""
+        return self.etag if encoding == "identity" else f'{self.etag[:-1]}-{encoding}"'
+
+
+def _brotli() -> Compressor | None:
+    try:
+        import brotli  # pyright: ignore[reportMissingImports]
+    except ImportError:
+        logger.info("brotli is not installed, static assets are precompressed with gzip only")
+        return None
+    return functools.partial(brotli.compress, quality=11)
+
+
+def _compressors() -> dict[str, Compressor]:
+    compressors: dict[str, Compressor] = {"gzip": functools.partial(gzip.compress, compresslevel=9, mtime=0)}
+    if (brotli := _brotli()) is not None:
+        compressors["br"] = brotli
+    return compressors
+
+
+def build_asset(name: str, body: bytes, compressors: Mapping[str, Compressor]) -> Asset:
+    digest = hashlib.sha256(body).hexdigest()[:16]
+    source = PurePosixPath(name)
+    media_type = mimetypes.guess_type(source.name)[0] or "application/octet-stream"
+    encodings = {"identity": body}
+    if media_type.startswith(COMPRESSIBLE_TYPES) and len(body) >= MIN_COMPRESS_SIZE:
+        for encoding, compress in compressors.items():
+            compressed = compress(body)
+            if len(compressed) < len(body):
+                encodings[encoding] = compressed
+    if media_type.startswith("text/") or media_type == "image/svg+xml":
+        media_type += "; charset=utf-8"
+    return Asset(
+        name=name,
+        path=str(source.with_name(f"{source.stem}.{digest}{source.suffix}")),
+        media_type=media_type,
+        etag=f'"{digest}"',
+        encodings=encodings,
+    )
+
+
+class AssetManifest:
+    """Maps source names (`landing.css`) to fingerprinted assets and serves them by their path."""
+
+    def __init__(self, assets: list[Asset]) -> None:
+        self.by_name = {asset.name: asset for asset in assets}
+        self.by_path = {asset.path: asset for asset in assets}
+
+    @classmethod
+    def from_directory(cls, directory: Path, compressors: Mapping[str, Compressor] | None = None) -> "AssetManifest":
+        compressors = _compressors() if compressors is None else compressors
+        files = sorted(path for path in directory.rglob("*") if path.is_file())
+        return cls(
+            [build_asset(path.relative_to(directory).as_posix(), path.read_bytes(), compressors) for path in files]
+        )
+
+    def url(self, name: str) -> str | None:
+        asset = self.by_name.get(name)
+        return asset.url if asset is not None else None
+
+
+@functools.cache
+def asset_manifest() -> AssetManifest:
+    manifest = AssetManifest.from_directory(STATIC_DIR)
+    logger.info(f"Fingerprinted {len(manifest.by_name)} static assets")
+    return manifest
+
+
+@functools.cache
+def _warn_missing(name: str) -> None:
+    logger.warning(f"Static asset {name!r} not found in {STATIC_DIR}, linking it unversioned")
+
+
+def asset_url(name: str) -> str:
+    """Fingerprinted URL of `app/static/<name>`, or `name` itself if there is no such file."""
+    url = asset_manifest().url(name)
+    if url is None:
+        _warn_missing(name)
+        return name
+    return url
+
+
+def negotiate_encoding(accept_encoding: str, available: Mapping[str, bytes]) -> str:
+    """Pick the encoding with the highest quality in `Accept-Encoding` among `available`."""
+    qualities = {"identity": 0.001}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        if params.strip():
+            found = _QUALITY.fullmatch(params.strip())
+            quality = float(found.group(1)) if found is not None else 0.0
+        qualities[coding] = quality
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = "identity", 0.0
+    for encoding in _PREFERENCE:
+        quality = qualities.get(encoding, wildcard)
+        if encoding in available and quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+async def asset_response(request: Request) -> Response:
+    asset = asset_manifest().by_path.get(request.path_params["path"])
+    if asset is None:
+        return Response(status_code=404, headers={"Cache-Control": "no-store"})
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""), asset.encodings)
+    etag = asset.etag_for(encoding)
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": etag}
+    if len(asset.encodings) > 1:
+        headers["Vary"] = "Accept-Encoding"
+    if _is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(asset.encodings[encoding], media_type=asset.media_type, headers=headers)
+
+
+def create() -> None:
+    asset_manifest()
+    app.get(f"{ASSETS_PREFIX}/{{path:path}}", include_in_schema=False)(asset_response)
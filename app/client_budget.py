@@ -0,0 +1,219 @@
+"""Memory budget for NiceGUI clients, with eviction of the oldest idle or disconnected ones.
+
+Every visit to a NiceGUI page keeps a `Client` with its whole element tree in memory until the
+browser has been gone for the reconnect timeout, or for 60 s if it never opened the websocket (a
+bot, a closed tab). Under a traffic spike these add up. Each client's size is estimated from its
+element count (`CLIENT_ELEMENT_BYTES`, measured as RSS growth per landing page client); when all
+clients together exceed `CLIENT_BUDGET_MB` or `CLIENT_BUDGET_MAX_CLIENTS`, the budget evicts, oldest
+first:
+
+1. disconnected clients: never connected (after `CONNECT_GRACE_S`), or waiting for a reconnect
+2. idle clients: connected, but without a page load, reconnect or form input for `CLIENT_IDLE_TIMEOUT_S`
+
+An idle client's browser is asked to close its websocket and to reload on the next click or key
+press, so a returning visitor gets a fresh page instead of a dead one. Its memory is freed once it
+has disconnected, or after `RELEASE_GRACE_S` if the browser never answers.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from nicegui import Client
+
+from app.metrics import NICEGUI_CLIENT_EVICTIONS
+
+logger = logging.getLogger(__name__)
+
+# how long a page survives a dropped websocket (NiceGUI's default is 3 s)
+RECONNECT_TIMEOUT = float(os.environ.get("NICEGUI_RECONNECT_TIMEOUT_S", "3"))
+# a browser opens the websocket about a second after loading the page: younger clients are kept,
+# or their handshake would fail and the reload create yet another client
+CONNECT_GRACE_S = 5.0
+# a released browser that has not disconnected after this long is deleted anyway
+RELEASE_GRACE_S = 30.0
+
+# closes the websocket without the "connection lost" popup; the next interaction loads a new page
+RELEASE_JS = """
+window.socket.off("disconnect");
+window.socket.disconnect();
+for (const type of ["pointerdown", "keydown"]) {
+  document.addEventListener(type, () => window.location.reload(), {once: true, capture: true});
+}
+"""
+
+
+# NiceGUI (2.21) has no public record of a client's open websockets (`has_socket_connection` stays
+# true once a browser connected) nor of its pending "delete after the reconnect timeout" tasks. Both
+# are read with defaults, so a NiceGUI that renames them degrades to never evicting connected clients.
+def open_sockets(client: Client) -> int:
+    """Websockets the client has right now; without NiceGUI's counts, 1 for any client that ever connected."""
+    connections = getattr(client, "_num_connections", None)
+    if connections is None:
+        return int(client.has_socket_connection)
+    return sum(connections.values())
+
+
+@dataclass(frozen=True)
+class ClientUsage:
+    id: str
+    elements: int
+    approx_bytes: int
+    connected: bool
+    idle_s: float
+
+
+def _longest_idle(pair: tuple[Client, ClientUsage]) -> float:
+    return -pair[1].idle_s
+
+
+class ClientBudget:
+    """Tracks client activity and evicts clients while their estimated memory exceeds the budget."""
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_clients: int = 2000,
+        idle_timeout: float = 900.0,
+        element_bytes: int = 3584,
+        interval: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_bytes < 1 or max_clients < 1:
+            raise ValueError("the client budget must allow at least one client")
+        self.max_bytes = max_bytes
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.element_bytes = element_bytes
+        self.interval = interval
+        self._clock = clock
+        self._last_active: dict[str, float] = {}
+        # client id -> when its browser was asked to let go
+        self._released: dict[str, float] = {}
+        self._over_budget = False
+        self.evictions = {"disconnected": 0, "idle": 0, "unresponsive": 0}
+
+    @classmethod
+    def from_env(cls) -> "ClientBudget":
+        return cls(
+            max_bytes=int(float(os.environ.get("CLIENT_BUDGET_MB", "256")) * 1024 * 1024),
+            max_clients=int(os.environ.get("CLIENT_BUDGET_MAX_CLIENTS", "2000")),
+            idle_timeout=float(os.environ.get("CLIENT_IDLE_TIMEOUT_S", "900")),
+            element_bytes=int(os.environ.get("CLIENT_ELEMENT_BYTES", "3584")),
+            interval=float(os.environ.get("CLIENT_BUDGET_INTERVAL_S", "5")),
+        )
+
+    def touch(self, client: Client) -> None:
+        """Record activity; registered as connect handler and called on form input."""
+        self._last_active[client.id] = self._clock()
+
+    def usage(self, client: Client, now: float | None = None) -> ClientUsage:
+        now = self._clock() if now is None else now
+        elements = len(client.elements)
+        return ClientUsage(
+            id=client.id,
+            elements=elements,
+            approx_bytes=elements * self.element_bytes,
+            connected=open_sockets(client) > 0,
+            idle_s=now - self._last_active.get(client.id, client.created),
+        )
+
+    def _usages(self, clients: Iterable[Client] | None) -> list[tuple[Client, ClientUsage]]:
+        now = self._clock()
+        clients = Client.instances.values() if clients is None else clients
+        return [(client, self.usage(client, now)) for client in list(clients) if not client.shared]
+
+    def stats(self, clients: Iterable[Client] | None = None) -> dict[str, Any]:
+        usages = [usage for _, usage in self._usages(clients)]
+        return {
+            "clients": len(usages),
+            "connected": sum(1 for usage in usages if usage.connected),
+            "elements": sum(usage.elements for usage in usages),
+            "max_elements": max((usage.elements for usage in usages), default=0),
+            "approx_bytes": sum(usage.approx_bytes for usage in usages),
+            "max_bytes": self.max_bytes,
+            "max_clients": self.max_clients,
+            "evictions": dict(self.evictions),
+        }
+
+    def _evict(self, client: Client, reason: str) -> None:
+        # a pending "delete after reconnect timeout" task would delete the client a second time
+        for task in getattr(client, "_delete_tasks", {}).values():
+            task.cancel()
+        if client.id in Client.instances:
+            client.delete()
+        self._released.pop(client.id, None)
+        self._count(reason)
+
+    def _count(self, reason: str) -> None:
+        self.evictions[reason] += 1
+        NICEGUI_CLIENT_EVICTIONS.labels(reason).inc()
+
+    def enforce(self, clients: Iterable[Client] | None = None) -> int:
+        """Evict or release clients until they fit the budget; returns how many were."""
+        usages = self._usages(clients)
+        live = {usage.id for _, usage in usages}
+        self._last_active = {id: at for id, at in self._last_active.items() if id in live}
+        self._released = {id: at for id, at in self._released.items() if id in live}
+        count = len(usages)
+        total = sum(usage.approx_bytes for _, usage in usages)
+        if count <= self.max_clients and total <= self.max_bytes:
+            self._over_budget = False
+            return 0
+
+        now = self._clock()
+        disconnected = [
+            (client, usage) for client, usage in usages if not usage.connected and usage.idle_s >= CONNECT_GRACE_S
+        ]
+        idle = [
+            (client, usage)
+            for client, usage in usages
+            if usage.connected and (usage.idle_s >= self.idle_timeout or client.id in self._released)
+        ]
+        handled = 0
+        for client, usage in sorted(disconnected, key=_longest_idle) + sorted(idle, key=_longest_idle):
+            if count <= self.max_clients and total <= self.max_bytes:
+                break
+            if not usage.connected:
+                self._evict(client, "disconnected")
+                handled += 1
+            elif (released_at := self._released.get(client.id)) is None:
+                self._released[client.id] = now
+                client.run_javascript(RELEASE_JS)
+                self._count("idle")
+                handled += 1
+            elif now - released_at >= RELEASE_GRACE_S:
+                self._evict(client, "unresponsive")
+                handled += 1
+            # a released client frees its memory once it disconnects: count it as gone, or the
+            # next pass would release more clients than needed
+            count -= 1
+            total -= usage.approx_bytes
+
+        if count > self.max_clients or total > self.max_bytes:
+            if not self._over_budget:
+                logger.warning(
+                    f"{count} active NiceGUI clients (~{total / 2**20:.0f} MiB) exceed the client budget "
+                    f"of {self.max_clients} clients / {self.max_bytes / 2**20:.0f} MiB"
+                )
+            self._over_budget = True
+        else:
+            self._over_budget = False
+        return handled
+
+    async def run(self) -> None:
+        """Enforce the budget every `interval` seconds; started as a NiceGUI startup task."""
+        while True:
+            try:
+                if evicted := self.enforce():
+                    logger.info(f"Client budget evicted or released {evicted} NiceGUI clients")
+            except Exception as e:
+                # keep enforcing: a transient error must not leave memory unbounded for the process lifetime
+                logger.error(f"Client budget enforcement failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+client_budget = ClientBudget.from_env()
@@ -1,67 +1,644 @@
-from typing import List, Dict, Any, ClassVar, Sequence, TypeVar
+import asyncio
+import functools
+import os
+import threading
+import time
+from typing import (
+    List,
+    Dict,
+    Any,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    TypeVar,
+)
+
+import httpx
 from databricks.sdk import WorkspaceClient
-from databricks.sdk.service.sql import StatementState, State
+from databricks.sdk.errors import DatabricksError
+from databricks.sdk.service.sql import (
+    ColumnInfo,
+    Disposition,
+    EndpointInfo,
+    ExecuteStatementRequestOnWaitTimeout,
+    ExternalLink,
+    Format,
+    ServiceError,
+    ServiceErrorCode,
+    StatementResponse,
+    StatementState,
+    State,
+)
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from logging import getLogger
 
+from app.dbrx_types import converters_for, rows_from_columns, statement_parameters
+from app.metrics import (
+    DATABRICKS_EXECUTION_SECONDS,
+    DATABRICKS_FETCH_SECONDS,
+    DATABRICKS_MODEL_ROWS,
+    DATABRICKS_QUEUE_SECONDS,
+    DATABRICKS_RESULT_ROWS,
+)
+from app.query_cache import QueryResultCache, cache_key
+from app.tracing import traced, tracer
+
 logger = getLogger(__name__)
 
 T = TypeVar("T", bound="DatabricksModel")
 
+WarehousePolicy = Callable[[Sequence[EndpointInfo]], EndpointInfo | None]
 
-def execute_databricks_query(query: str) -> List[Dict[str, Any]]:
-    """helper function to execute SQL query via WorkspaceClient"""
-    client = WorkspaceClient()
 
-    # use warehouse to execute query
-    running_warehouses = [x for x in client.warehouses.list() if x.state == State.RUNNING]
-    if not running_warehouses:
-        warehouse = list(client.warehouses.list())[0]
-    else:
-        warehouse = running_warehouses[0]
+def prefer_running(warehouses: Sequence[EndpointInfo]) -> EndpointInfo | None:
+    """First RUNNING warehouse, else the first one listed (it is auto-started by the query)."""
+    for warehouse in warehouses:
+        if warehouse.state == State.RUNNING:
+            return warehouse
+    return warehouses[0] if warehouses else None
 
-    if warehouse.id is None:
-        raise RuntimeError("Warehouse ID is None")
 
-    logger.info(f"Executing query {query.replace('\n', '\t')} on warehouse: {warehouse.id}")
-    execution = client.statement_execution.execute_statement(
-        warehouse_id=warehouse.id, statement=query, wait_timeout="30s"
-    )
+def least_loaded(warehouses: Sequence[EndpointInfo]) -> EndpointInfo | None:
+    """RUNNING warehouse with the fewest active sessions per cluster."""
+    running = [warehouse for warehouse in warehouses if warehouse.state == State.RUNNING]
+    if not running:
+        return prefer_running(warehouses)
+    return min(running, key=lambda w: (w.num_active_sessions or 0) / max(w.num_clusters or 1, 1))
+
+
+def pin_warehouse(warehouse_id: str) -> WarehousePolicy:
+    """Always use the warehouse with the given ID."""
+
+    def policy(warehouses: Sequence[EndpointInfo]) -> EndpointInfo | None:
+        return next((warehouse for warehouse in warehouses if warehouse.id == warehouse_id), None)
+
+    return policy
+
+
+class WarehouseResolver:
+    """Caches the warehouse chosen by `policy` for `ttl` seconds.
+
+    The cache is dropped with `invalidate()` when a statement fails because the warehouse went
+    away, so the next query lists warehouses again.
+    """
+
+    def __init__(
+        self, policy: WarehousePolicy = prefer_running, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.policy = policy
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._warehouse_id: str | None = None
+        self._expires_at = 0.0
+
+    def resolve(self, client: WorkspaceClient) -> str:
+        with self._lock:
+            if self._warehouse_id is not None and self._clock() < self._expires_at:
+                return self._warehouse_id
+            warehouse = self.policy(list(client.warehouses.list()))
+            if warehouse is None:
+                raise RuntimeError("No SQL warehouse available")
+            if warehouse.id is None:
+                raise RuntimeError("Warehouse ID is None")
+            self._warehouse_id = warehouse.id
+            self._expires_at = self._clock() + self.ttl
+            return warehouse.id
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._warehouse_id = None
+            self._expires_at = 0.0
+
+
+def _policy_from_env() -> WarehousePolicy:
+    warehouse_id = os.environ.get("DATABRICKS_WAREHOUSE_ID")
+    if warehouse_id:
+        return pin_warehouse(warehouse_id)
+    match os.environ.get("DATABRICKS_WAREHOUSE_POLICY", "running"):
+        case "least_loaded":
+            return least_loaded
+        case _:
+            return prefer_running
+
+
+warehouse_resolver = WarehouseResolver(
+    policy=_policy_from_env(), ttl=float(os.environ.get("DATABRICKS_WAREHOUSE_CACHE_TTL", "300"))
+)
+
+query_cache = QueryResultCache(max_bytes=int(os.environ.get("DATABRICKS_CACHE_MAX_BYTES", 64 * 1024 * 1024)))
+
+_client: WorkspaceClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_workspace_client() -> WorkspaceClient:
+    """Process-wide WorkspaceClient; authentication happens once, not per query."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = WorkspaceClient()
+    return _client
+
+
+def set_workspace_client(client: WorkspaceClient | None) -> None:
+    """Replace the shared client (e.g. with a fake in tests); None re-creates it on next use."""
+    global _client
+    with _client_lock:
+        _client = client
+    warehouse_resolver.invalidate()
+
+
+def warehouse_state() -> str:
+    """State of the warehouse that queries go to, read from the workspace API on every call."""
+    client = get_workspace_client()
+    warehouse_id = warehouse_resolver.resolve(client)
+    for warehouse in client.warehouses.list():
+        if warehouse.id == warehouse_id:
+            return warehouse.state.value if warehouse.state is not None else "UNKNOWN"
+    warehouse_resolver.invalidate()
+    raise RuntimeError(f"Warehouse {warehouse_id} no longer exists")
+
+
+_WAREHOUSE_ERROR_CODES = {
+    ServiceErrorCode.NOT_FOUND,
+    ServiceErrorCode.TEMPORARILY_UNAVAILABLE,
+    ServiceErrorCode.WORKSPACE_TEMPORARILY_UNAVAILABLE,
+    ServiceErrorCode.SERVICE_UNDER_MAINTENANCE,
+}
+
+
+def _is_warehouse_error(error: ServiceError | None) -> bool:
+    if error is None:
+        return False
+    return error.error_code in _WAREHOUSE_ERROR_CODES or "warehouse" in (error.message or "").lower()
+
 
+def _check_status(execution: StatementResponse) -> None:
     if execution.status is None:
         raise RuntimeError("Execution status is None")
 
     if execution.status.state != StatementState.SUCCEEDED:
+        if _is_warehouse_error(execution.status.error):
+            warehouse_resolver.invalidate()
         error_msg = f"Query failed with state: {execution.status.state}"
         if execution.status.error is not None:
             error_msg += f" - {execution.status.error.message}"
         raise RuntimeError(error_msg)
 
-    # convert result to dictionaries
-    if (
-        execution.result is not None
-        and execution.result.data_array is not None
-        and execution.manifest is not None
-        and execution.manifest.schema is not None
-        and execution.manifest.schema.columns is not None
-    ):
-        col_names = [col.name or "" for col in execution.manifest.schema.columns]
-        rows = execution.result.data_array
-        return [dict(zip(col_names, row)) for row in rows]
 
-    return []
+def _state(execution: StatementResponse) -> str:
+    if execution.status is None or execution.status.state is None:
+        return "UNKNOWN"
+    return execution.status.state.value
+
+
+def _columns(execution: StatementResponse) -> List[ColumnInfo]:
+    if execution.manifest is None or execution.manifest.schema is None or execution.manifest.schema.columns is None:
+        return []
+    return execution.manifest.schema.columns
+
+
+def _column_names(execution: StatementResponse) -> List[str]:
+    return [col.name or "" for col in _columns(execution)]
+
+
+def _download_chunk(http: httpx.Client, link: ExternalLink) -> List[List[str | None]]:
+    # the URL and headers carry temporary credentials, keep them out of logs and error messages
+    if link.external_link is None:
+        raise RuntimeError("External link is None")
+    response = http.get(link.external_link, headers=link.http_headers or {})
+    if response.is_error:
+        raise RuntimeError(f"Downloading result chunk {link.chunk_index} failed with HTTP {response.status_code}")
+    return response.json()
+
+
+def iter_result_chunks(
+    client: WorkspaceClient, execution: StatementResponse, http: httpx.Client | None = None
+) -> Iterator[List[List[str | None]]]:
+    """Yield the rows of every result chunk of a finished statement, in order.
+
+    Follows `next_chunk_index` for INLINE results and downloads EXTERNAL_LINKS results. A chunk is
+    only fetched once the previous one has been consumed, so at most one chunk is held at a time.
+    """
+    result = execution.result
+    statement_id = execution.statement_id
+    own_http = False
+    try:
+        while result is not None:
+            next_index = result.next_chunk_index
+            if result.data_array is not None:
+                DATABRICKS_RESULT_ROWS.inc(len(result.data_array))
+                yield result.data_array
+            for link in result.external_links or ():
+                if http is None:
+                    http = httpx.Client(timeout=60.0)
+                    own_http = True
+                with DATABRICKS_FETCH_SECONDS.labels("external").time(), tracer.span("databricks.download_chunk"):
+                    rows = _download_chunk(http, link)
+                DATABRICKS_RESULT_ROWS.inc(len(rows))
+                yield rows
+                next_index = link.next_chunk_index
+            if next_index is None:
+                return
+            if statement_id is None:
+                raise RuntimeError("Statement ID is None")
+            with DATABRICKS_FETCH_SECONDS.labels("inline").time(), tracer.span("databricks.fetch_chunk"):
+                result = client.statement_execution.get_statement_result_chunk_n(statement_id, next_index)
+    finally:
+        if own_http and http is not None:
+            http.close()
+
+
+class RowBatch(NamedTuple):
+    """Rows of one result chunk; values are strings (or None) as returned by the API."""
+
+    columns: List[str]
+    rows: List[List[str | None]]
+
+
+def _iter_batches(client: WorkspaceClient, execution: StatementResponse) -> Iterator[RowBatch]:
+    columns = _column_names(execution)
+    for rows in iter_result_chunks(client, execution):
+        yield RowBatch(columns, rows)
+
+
+def _iter_dicts(batches: Iterable[RowBatch]) -> Iterator[Dict[str, Any]]:
+    for batch in batches:
+        for row in batch.rows:
+            yield dict(zip(batch.columns, row))
+
+
+Params = Mapping[str, Any]
+
+
+def _statement_options(params: Params | None, external_links: bool) -> Dict[str, Any]:
+    options: Dict[str, Any] = {}
+    if params:
+        options["parameters"] = statement_parameters(params)
+    if external_links:
+        options.update(disposition=Disposition.EXTERNAL_LINKS, format=Format.JSON_ARRAY)
+    return options
+
+
+def _describe(query: str, params: Params | None) -> str:
+    # parameter values may be personal data, only their names are logged
+    described = query.replace("\n", "\t")
+    if params:
+        described += f" with parameters {', '.join(params)}"
+    return described
+
+
+def _run_statement(
+    client: WorkspaceClient, query: str, params: Params | None = None, external_links: bool = False
+) -> StatementResponse:
+    warehouse_id = warehouse_resolver.resolve(client)
+
+    described = _describe(query, params)
+    logger.info(f"Executing query {described} on warehouse: {warehouse_id}")
+    start = time.perf_counter()
+    with tracer.span(
+        "databricks.execute_statement", kind="client", attributes={"db.statement": described, "warehouse": warehouse_id}
+    ) as span:
+        try:
+            execution = client.statement_execution.execute_statement(
+                warehouse_id=warehouse_id,
+                statement=query,
+                wait_timeout="30s",
+                **_statement_options(params, external_links),
+            )
+        except DatabricksError:
+            DATABRICKS_EXECUTION_SECONDS.labels("sync", "ERROR").observe(time.perf_counter() - start)
+            warehouse_resolver.invalidate()
+            raise
+        span.set_attribute("statement_id", execution.statement_id)
+        span.set_attribute("state", _state(execution))
+    DATABRICKS_EXECUTION_SECONDS.labels("sync", _state(execution)).observe(time.perf_counter() - start)
+
+    _check_status(execution)
+    return execution
+
+
+def stream_databricks_batches(
+    query: str, params: Params | None = None, external_links: bool = False
+) -> Iterator[RowBatch]:
+    """Run `query` and lazily yield its result one chunk at a time.
+
+    `params` are bound to `:name` parameter markers in `query` by the warehouse, so the statement
+    text stays the same across values and warehouse-side caches are shared.
+
+    `external_links=True` asks for the EXTERNAL_LINKS disposition, which lifts the 25 MiB limit of
+    inline results; chunks are then downloaded from cloud storage as they are consumed.
+    """
+    client = get_workspace_client()
+    yield from _iter_batches(client, _run_statement(client, query, params, external_links))
+
+
+def stream_databricks_query(
+    query: str, params: Params | None = None, external_links: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """Run `query` and lazily yield one dict per row across all result chunks."""
+    yield from _iter_dicts(stream_databricks_batches(query, params, external_links))
+
+
+@traced()
+def execute_databricks_query(query: str, params: Params | None = None) -> List[Dict[str, Any]]:
+    """helper function to execute SQL query via WorkspaceClient"""
+    return list(stream_databricks_query(query, params))
+
+
+@traced()
+def execute_databricks_query_columnar(
+    query: str, params: Params | None = None, external_links: bool = False, typed: bool = False
+) -> Dict[str, List[Any]]:
+    """Run `query` and return one list of values per column, without building a dict per row.
+
+    With `typed=True` each column is converted from API strings to the Python type named in the
+    result manifest (int, float, Decimal, bool, date, datetime, ...), one chunk at a time.
+    """
+    client = get_workspace_client()
+    execution = _run_statement(client, query, params, external_links)
+    columns: Dict[str, List[Any]] = {name: [] for name in _column_names(execution)}
+    values = list(columns.values())
+    converters = converters_for(_columns(execution)) if typed else [list] * len(values)
+    for batch in _iter_batches(client, execution):
+        for column, convert, chunk_values in zip(values, converters, zip(*batch.rows)):
+            column.extend(convert(chunk_values))
+    return columns
+
+
+def execute_databricks_query_rows(
+    query: str, params: Params | None = None, name: str = "Row", external_links: bool = False
+) -> List[Any]:
+    """Run `query` and return typed rows as instances of a slotted class with one attribute per column."""
+    return rows_from_columns(execute_databricks_query_columnar(query, params, external_links, typed=True), name)
+
+
+def execute_databricks_query_arrow(query: str, params: Params | None = None, external_links: bool = False) -> Any:
+    """Run `query` and return a `pyarrow.Table` of string columns; requires the optional pyarrow package."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("execute_databricks_query_arrow requires pyarrow: uv add pyarrow") from e
+    return pyarrow.table(execute_databricks_query_columnar(query, params, external_links))
+
+
+_IN_PROGRESS = {StatementState.PENDING, StatementState.RUNNING}
+
+MAX_CONCURRENT_QUERIES = int(os.environ.get("DATABRICKS_MAX_CONCURRENT_QUERIES", "8"))
+
+
+@traced()
+async def _cancel_statement(client: WorkspaceClient, statement_id: str) -> None:
+    logger.info(f"Cancelling statement {statement_id}")
+    await asyncio.to_thread(client.statement_execution.cancel_execution, statement_id)
+
+
+async def _cancel_submitted(client: WorkspaceClient, submit: "asyncio.Future[StatementResponse]") -> None:
+    """Cancel the statement of a submission whose caller was cancelled while it was in flight."""
+    try:
+        execution = await submit
+    except DatabricksError as e:
+        logger.info(f"Submission of a cancelled query failed, nothing to cancel: {e}")
+        return
+    if execution.statement_id is not None:
+        await _cancel_statement(client, execution.statement_id)
+
+
+async def execute_databricks_query_async(
+    query: str,
+    params: Params | None = None,
+    poll_interval: float = 0.1,
+    max_poll_interval: float = 2.0,
+    external_links: bool = False,
+) -> List[Dict[str, Any]]:
+    """Async variant of `execute_databricks_query` that never blocks the event loop.
+
+    The statement is submitted without waiting and its status is polled with exponential backoff,
+    each SDK call running in a worker thread. Cancelling the awaiting task (a disconnected client,
+    an `asyncio.timeout()`) cancels the statement on the warehouse as well.
+    """
+    client = get_workspace_client()
+    warehouse_id = await asyncio.to_thread(warehouse_resolver.resolve, client)
+
+    logger.info(f"Submitting query {_describe(query, params)} on warehouse: {warehouse_id}")
+    start = time.perf_counter()
+    submit = asyncio.ensure_future(
+        asyncio.to_thread(
+            client.statement_execution.execute_statement,
+            warehouse_id=warehouse_id,
+            statement=query,
+            wait_timeout="0s",
+            on_wait_timeout=ExecuteStatementRequestOnWaitTimeout.CONTINUE,
+            **_statement_options(params, external_links),
+        )
+    )
+    try:
+        # shielded: the worker thread cannot be interrupted, and its statement id is needed to cancel
+        execution = await asyncio.shield(submit)
+    except DatabricksError:
+        DATABRICKS_EXECUTION_SECONDS.labels("async", "ERROR").observe(time.perf_counter() - start)
+        warehouse_resolver.invalidate()
+        raise
+    except asyncio.CancelledError:
+        DATABRICKS_EXECUTION_SECONDS.labels("async", StatementState.CANCELED.value).observe(time.perf_counter() - start)
+        await asyncio.shield(_cancel_submitted(client, submit))
+        raise
+
+    statement_id = execution.statement_id
+    delay = poll_interval
+    try:
+        while execution.status is not None and execution.status.state in _IN_PROGRESS:
+            if statement_id is None:
+                raise RuntimeError("Statement ID is None")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+            execution = await asyncio.to_thread(client.statement_execution.get_statement, statement_id)
+    except asyncio.CancelledError:
+        DATABRICKS_EXECUTION_SECONDS.labels("async", StatementState.CANCELED.value).observe(time.perf_counter() - start)
+        if statement_id is not None:
+            # shielded so a repeated cancellation does not abandon the cancel request half-way
+            await asyncio.shield(_cancel_statement(client, statement_id))
+        raise
+    DATABRICKS_EXECUTION_SECONDS.labels("async", _state(execution)).observe(time.perf_counter() - start)
+
+    _check_status(execution)
+    # remaining chunks are fetched with blocking SDK/HTTP calls
+    return await asyncio.to_thread(lambda: list(_iter_dicts(_iter_batches(client, execution))))
+
+
+async def gather_bounded(
+    calls: Iterable[Callable[[], Awaitable[Any]]], max_concurrency: int = MAX_CONCURRENT_QUERIES
+) -> List[Any]:
+    """Run the coroutine factories concurrently, at most `max_concurrency` at a time, in order.
+
+    If one fails, the others are cancelled (and their statements with them) and the error is raised.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(call: Callable[[], Awaitable[Any]]) -> Any:
+        queued = time.perf_counter()
+        async with semaphore:
+            DATABRICKS_QUEUE_SECONDS.observe(time.perf_counter() - queued)
+            return await call()
+
+    async with asyncio.TaskGroup() as group:
+        tasks = [group.create_task(run(call)) for call in calls]
+    return [task.result() for task in tasks]
+
+
+async def execute_databricks_queries(
+    queries: Iterable[str], max_concurrency: int = MAX_CONCURRENT_QUERIES
+) -> List[List[Dict[str, Any]]]:
+    """Fan out several independent queries, e.g. all widgets of a dashboard, and return rows per query."""
+    return await gather_bounded(
+        [lambda query=query: execute_databricks_query_async(query) for query in queries], max_concurrency
+    )
+
+
+def _typed_rows(query: str, params: Params | None) -> List[Dict[str, Any]]:
+    columns = execute_databricks_query_columnar(query, params, typed=True)
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+@functools.cache
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])  # type: ignore[valid-type]
+
+
+@functools.cache
+def _render_statement(model: type["DatabricksModel"], name: str) -> str:
+    try:
+        template = model.__statements__[name]
+    except KeyError:
+        raise KeyError(f"{model.__name__} has no statement {name!r}") from None
+    return template.format(table=model.table_name())
+
+
+def _construct_all(model: type[T], names: List[str], records: Iterable[Dict[str, Any]]) -> List[T]:
+    """`model_construct()` for many records with the same keys.
+
+    `model_construct()` walks every field (aliases, defaults) for each record. When the records
+    hold exactly the plain model fields, the instance state it would produce is set directly.
+    Models with private attributes keep `model_construct()`, which fills in their defaults.
+    """
+    fields_set = set(names)
+    plain = (
+        fields_set == set(model.model_fields)
+        and all(field.alias is None and field.validation_alias is None for field in model.model_fields.values())
+        and not model.__pydantic_post_init__
+        and model.model_config.get("extra") != "allow"
+        and not model.__private_attributes__
+    )
+    if not plain:
+        return [model.model_construct(fields_set, **record) for record in records]
+
+    # one shared fields set is safe: it already holds every field, so assignments never add to it
+    new = model.__new__
+    setattr_ = object.__setattr__
+    instances = []
+    for record in records:
+        instance = new(model)
+        setattr_(instance, "__dict__", record)
+        setattr_(instance, "__pydantic_fields_set__", fields_set)
+        setattr_(instance, "__pydantic_extra__", None)
+        setattr_(instance, "__pydantic_private__", None)
+        instances.append(instance)
+    return instances
 
 
 class DatabricksModel(BaseModel):
     __catalog__: ClassVar[str]
     __schema__: ClassVar[str]
     __table__: ClassVar[str]
+    # seconds a query result is reused by cached_query(); 0 disables caching
+    __cache_ttl__: ClassVar[float] = 0.0
+    # rows from the warehouse already match the field types: query_models() skips validation
+    __trusted_schema__: ClassVar[bool] = False
+    # named SQL templates; `{table}` is replaced by table_name(), values are passed as `:name` parameters
+    __statements__: ClassVar[Dict[str, str]] = {}
 
     @classmethod
     def table_name(cls) -> str:
         return f"{cls.__catalog__}.{cls.__schema__}.{cls.__table__}"
 
+    @classmethod
+    def cached_query(cls, query: str, params: Params | None = None, typed: bool = False) -> List[Dict[str, Any]]:
+        """Run `query` through the shared result cache with this model's `__cache_ttl__`.
+
+        Identical queries (after whitespace normalization) with equal `params` within the TTL cost
+        no warehouse call, and concurrent identical queries share one execution. The rows are
+        shared, do not mutate them. With `typed=True` the values are converted with the manifest
+        types, as `query_models()` gets them, and cached apart from the raw strings.
+        """
+        if typed:
+            return query_cache.get_or_load(
+                (cache_key(query, params), "typed"), lambda: _typed_rows(query, params), cls.__cache_ttl__
+            )
+        return query_cache.get_or_load(
+            cache_key(query, params), lambda: execute_databricks_query(query, params), cls.__cache_ttl__
+        )
+
+    @classmethod
+    def statement(cls, name: str, /) -> str:
+        """SQL of the registered statement `name`, rendered once per class."""
+        return _render_statement(cls, name)
+
+    @classmethod
+    def run(cls: type[T], name: str, /, **params) -> List[T]:
+        """Execute the registered statement `name` with `params` bound as named parameters.
+
+        The SQL text does not change with the values, so the warehouse can reuse plans and cached
+        results across calls; with `__cache_ttl__` set the rows also go through the result cache.
+        """
+        statement = cls.statement(name)
+        if cls.__cache_ttl__ > 0:
+            rows = cls.cached_query(statement, params, typed=True)
+            names = [column for column in rows[0] if column in cls.model_fields] if rows else []
+            # fresh dicts: trusted models take a record as their instance `__dict__`
+            return cls._from_records(names, ({column: row[column] for column in names} for row in rows))
+        return cls.query_models(statement, params)
+
+    @classmethod
+    def from_columns(cls: type[T], columns: Dict[str, List[Any]]) -> List[T]:
+        """Build models from column lists, ignoring columns that are not fields.
+
+        Trusted schemas use `model_construct()` (no validation); otherwise the whole list is
+        validated in one `TypeAdapter` call instead of one `model_validate()` per row.
+        """
+        names = [name for name in columns if name in cls.model_fields]
+        records = (dict(zip(names, values)) for values in zip(*(columns[name] for name in names)))
+        return cls._from_records(names, records)
+
+    @classmethod
+    def _from_records(cls: type[T], names: List[str], records: Iterable[Dict[str, Any]]) -> List[T]:
+        if cls.__trusted_schema__:
+            models = _construct_all(cls, names, records)
+        else:
+            models = _list_adapter(cls).validate_python(list(records))
+        DATABRICKS_MODEL_ROWS.labels(cls.__name__).inc(len(models))
+        return models
+
+    @classmethod
+    def query_models(cls: type[T], query: str, params: Params | None = None, external_links: bool = False) -> List[T]:
+        """Run `query` and materialize the result column-wise with manifest types (see `from_columns`)."""
+        return cls.from_columns(execute_databricks_query_columnar(query, params, external_links, typed=True))
+
     @classmethod
     def fetch(cls: type[T], **params) -> Sequence[T]:
+        if "fetch" in cls.__statements__:
+            return cls.run("fetch", **params)
         raise NotImplementedError(f"Must implement fetch() method, but {cls.__name__} does not have it.")
+
+    @classmethod
+    async def fetch_async(cls: type[T], **params) -> Sequence[T]:
+        """Awaitable `fetch()` for page handlers; override with `execute_databricks_query_async` for cancellation."""
+        return await asyncio.to_thread(cls.fetch, **params)
@@ -0,0 +1,91 @@
+"""Conversion between Python values and the strings the Databricks statement API sends and expects."""
+
+import base64
+import dataclasses
+import functools
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Mapping, Sequence
+
+from databricks.sdk.service.sql import ColumnInfo, ColumnInfoTypeName, StatementParameterListItem
+
+
+def _parse_bool(value: str) -> bool:
+    return value == "true"
+
+
+CONVERTERS: dict[ColumnInfoTypeName, Callable[[str], Any]] = {
+    ColumnInfoTypeName.BYTE: int,
+    ColumnInfoTypeName.SHORT: int,
+    ColumnInfoTypeName.INT: int,
+    ColumnInfoTypeName.LONG: int,
+    ColumnInfoTypeName.FLOAT: float,
+    ColumnInfoTypeName.DOUBLE: float,
+    ColumnInfoTypeName.DECIMAL: Decimal,
+    ColumnInfoTypeName.BOOLEAN: _parse_bool,
+    ColumnInfoTypeName.DATE: date.fromisoformat,
+    ColumnInfoTypeName.TIMESTAMP: datetime.fromisoformat,
+    ColumnInfoTypeName.BINARY: base64.b64decode,
+    ColumnInfoTypeName.ARRAY: json.loads,
+    ColumnInfoTypeName.MAP: json.loads,
+    ColumnInfoTypeName.STRUCT: json.loads,
+}
+
+
+def convert_column(values: Sequence[str | None], type_name: ColumnInfoTypeName | None) -> list[Any]:
+    """Convert one column of API strings to Python values; unknown types stay strings, NULLs stay None."""
+    convert = CONVERTERS.get(type_name) if type_name is not None else None
+    if convert is None:
+        return list(values)
+    if None not in values:
+        return list(map(convert, values))  # type: ignore[arg-type]
+    return [None if value is None else convert(value) for value in values]
+
+
+def converters_for(columns: Sequence[ColumnInfo]) -> list[Callable[[Sequence[str | None]], list[Any]]]:
+    return [functools.partial(convert_column, type_name=column.type_name) for column in columns]
+
+
+@functools.cache
+def row_type(name: str, fields: tuple[str, ...]) -> type:
+    """Slotted row class with one attribute per column; built once per column set.
+
+    Instances take the column values positionally, so a whole result is built with
+    `list(map(row_type(...), *columns.values()))`. Column names must be valid identifiers.
+    """
+    return dataclasses.make_dataclass(name, fields, slots=True)
+
+
+def rows_from_columns(columns: Mapping[str, Sequence[Any]], name: str = "Row") -> list[Any]:
+    return list(map(row_type(name, tuple(columns)), *columns.values()))
+
+
+def _parameter(name: str, value: Any) -> StatementParameterListItem:
+    # bool before int: bool is an int subclass
+    match value:
+        case None:
+            return StatementParameterListItem(name=name)
+        case bool():
+            return StatementParameterListItem(name=name, value="true" if value else "false", type="BOOLEAN")
+        case int():
+            return StatementParameterListItem(name=name, value=str(value), type="BIGINT")
+        case float():
+            return StatementParameterListItem(name=name, value=repr(value), type="DOUBLE")
+        case Decimal():
+            exponent = value.as_tuple().exponent
+            scale = -exponent if isinstance(exponent, int) and exponent < 0 else 0
+            return StatementParameterListItem(name=name, value=str(value), type=f"DECIMAL(38,{scale})")
+        case datetime():
+            return StatementParameterListItem(name=name, value=value.isoformat(), type="TIMESTAMP")
+        case date():
+            return StatementParameterListItem(name=name, value=value.isoformat(), type="DATE")
+        case str():
+            return StatementParameterListItem(name=name, value=value, type="STRING")
+        case _:
+            raise TypeError(f"Unsupported type {type(value).__name__} for statement parameter {name!r}")
+
+
+def statement_parameters(params: Mapping[str, Any]) -> list[StatementParameterListItem]:
+    """Typed named parameters for `:name` markers; the warehouse binds them, no SQL is interpolated."""
+    return [_parameter(name, value) for name, value in params.items()]
@@ -0,0 +1,108 @@
+"""Suppression of repeated contact form submissions.
+
+A submission is identified by its normalized email plus a hash of its normalized message. The
+first one within `window` seconds is let through; repeats are rejected in memory, before any
+database round-trip. The in-memory index is a bounded TTL-LRU, so it only protects one process
+and forgets the oldest entries under pressure; the unique `dedup_key` column catches what slips
+past it (other workers, restarts, evictions) for submissions in the same window bucket.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+
+class DuplicateInquiry(Exception):
+    """The same email already sent the same message within the de-duplication window."""
+
+
+def normalize_message(message: str) -> str:
+    return " ".join(message.split()).casefold()
+
+
+def inquiry_fingerprint(email: str, message: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(email.strip().lower().encode())
+    digest.update(b"\0")
+    digest.update(normalize_message(message).encode())
+    return digest.hexdigest()
+
+
+class DuplicateGuard:
+    """Thread-safe TTL-LRU set of recently seen fingerprints with counters for monitoring."""
+
+    def __init__(self, window: float = 600.0, max_entries: int = 100_000, clock: Callable[[], float] = time.time):
+        if window <= 0:
+            raise ValueError("window must be positive")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.window = window
+        self.max_entries = max_entries
+        self._clock = clock
+        # fingerprint -> expiry; insertion order is expiry order because the window is fixed
+        self._entries: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.duplicates = 0
+        self.db_duplicates = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "DuplicateGuard":
+        return cls(
+            window=float(os.environ.get("INQUIRY_DEDUP_WINDOW_S", "600")),
+            max_entries=int(os.environ.get("INQUIRY_DEDUP_MAX_ENTRIES", "100000")),
+        )
+
+    def claim(self, fingerprint: str) -> bool:
+        """Remember `fingerprint` and return True, or return False if it was seen within the window."""
+        now = self._clock()
+        with self._lock:
+            self.checked += 1
+            self._expire(now)
+            if fingerprint in self._entries:
+                self.duplicates += 1
+                return False
+            self._entries[fingerprint] = now + self.window
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def release(self, fingerprint: str) -> None:
+        """Forget a claimed fingerprint, e.g. because its submission could not be stored."""
+        with self._lock:
+            self._entries.pop(fingerprint, None)
+
+    def record_db_duplicate(self) -> None:
+        with self._lock:
+            self.db_duplicates += 1
+
+    def dedup_key(self, fingerprint: str) -> str:
+        """Value for the unique `dedup_key` column: the fingerprint plus the current window bucket."""
+        return f"{fingerprint}:{int(self._clock() // self.window)}"
+
+    def _expire(self, now: float) -> None:
+        while self._entries:
+            fingerprint, expires = next(iter(self._entries.items()))
+            if expires > now:
+                break
+            del self._entries[fingerprint]
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            return {
+                "window": self.window,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "checked": self.checked,
+                "duplicates": self.duplicates,
+                "db_duplicates": self.db_duplicates,
+                "evictions": self.evictions,
+            }
+
+
+duplicate_guard = DuplicateGuard.from_env()
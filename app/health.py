@@ -0,0 +1,170 @@
+"""Health endpoints for container orchestration and load balancers.
+
+`/health/live` only says the process serves requests. `/health/ready` also checks the
+dependencies: Postgres through the application's own connection pool and, when enabled,
+reachability of the Databricks warehouse. Each check result is cached for `HEALTH_CHECK_TTL_S`
+and concurrent probes share one in-flight check, so a probe storm costs at most one query per
+dependency and TTL.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any, Awaitable, Callable
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.client_budget import client_budget
+from app.database import get_async_engine, get_pool_stats
+from app.dedup import duplicate_guard
+from app.metrics import query_cache_stats
+from app.startup import startup_report
+
+logger = getLogger(__name__)
+
+CHECK_TTL = float(os.environ.get("HEALTH_CHECK_TTL_S", "2"))
+CHECK_TIMEOUT = float(os.environ.get("HEALTH_CHECK_TIMEOUT_S", "1"))
+# "off", "optional" (reported, does not affect readiness) or "required"
+DATABRICKS_CHECK = os.environ.get("HEALTH_CHECK_DATABRICKS", "off")
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    ok: bool
+    latency_ms: float
+    checked_at: float
+    detail: str | None = None
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "latency_ms": round(self.latency_ms, 2),
+            "age_s": round(now - self.checked_at, 2),
+            "detail": self.detail,
+        }
+
+
+class CachedCheck:
+    """Runs `probe` at most once per `ttl` seconds; callers arriving meanwhile get the cached result."""
+
+    def __init__(
+        self,
+        name: str,
+        probe: Callable[[], Awaitable[str | None]],
+        required: bool = True,
+        ttl: float = CHECK_TTL,
+        timeout: float = CHECK_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.probe = probe
+        self.required = required
+        self.ttl = ttl
+        self.timeout = timeout
+        self._clock = clock
+        self._result: CheckResult | None = None
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> CheckResult | None:
+        if self._result is not None and self._clock() - self._result.checked_at < self.ttl:
+            return self._result
+        return None
+
+    async def result(self) -> CheckResult:
+        if (cached := self._fresh()) is not None:
+            return cached
+        async with self._lock:
+            if (cached := self._fresh()) is not None:
+                return cached
+            start = time.perf_counter()
+            try:
+                detail = await asyncio.wait_for(self.probe(), self.timeout)
+                ok = True
+            except TimeoutError:
+                ok, detail = False, f"timed out after {self.timeout}s"
+                logger.warning(f"Health check {self.name} failed: {detail}")
+            except Exception as e:
+                ok, detail = False, str(e)
+                logger.warning(f"Health check {self.name} failed: {detail}", exc_info=True)
+            self._result = CheckResult(ok, (time.perf_counter() - start) * 1000, self._clock(), detail)
+            return self._result
+
+
+async def probe_database() -> str | None:
+    async with get_async_engine().connect() as conn:
+        await conn.exec_driver_sql("SELECT 1")
+    return None
+
+
+async def probe_databricks() -> str | None:
+    # imported here: the SDK is heavy and only needed when this check is enabled
+    from app.dbrx import warehouse_state
+
+    return await asyncio.to_thread(warehouse_state)
+
+
+def default_checks() -> list[CachedCheck]:
+    checks = [CachedCheck("database", probe_database)]
+    match DATABRICKS_CHECK:
+        case "off":
+            pass
+        case "optional" | "required":
+            checks.append(CachedCheck("databricks", probe_databricks, required=DATABRICKS_CHECK == "required"))
+        case _:
+            raise ValueError(f"Unknown HEALTH_CHECK_DATABRICKS value {DATABRICKS_CHECK!r}")
+    return checks
+
+
+async def readiness(checks: list[CachedCheck]) -> tuple[bool, dict[str, Any]]:
+    """Whether the app should get traffic, and the report behind that answer."""
+    report = startup_report.as_dict()
+    if not startup_report.ready:
+        return False, report
+    results = await asyncio.gather(*(check.result() for check in checks))
+    now = time.monotonic()
+    report["checks"] = {check.name: result.as_dict(now) for check, result in zip(checks, results)}
+    ready = all(result.ok for check, result in zip(checks, results) if check.required)
+    report["status"] = "ready" if ready else "unavailable"
+    return ready, report
+
+
+def create_router(checks: list[CachedCheck] | None = None) -> APIRouter:
+    checks = default_checks() if checks is None else checks
+    router = APIRouter(prefix="/health")
+
+    @router.get("")
+    async def health() -> dict[str, str]:
+        return {"status": "healthy", "service": "nicegui-app"}
+
+    @router.get("/live")
+    async def live() -> dict[str, str]:
+        """The process is up and its event loop responds; says nothing about dependencies."""
+        return {"status": "alive", "service": "nicegui-app"}
+
+    @router.get("/ready")
+    async def ready() -> JSONResponse:
+        """200 once startup finished, the pools are warm and every required dependency answers, else 503."""
+        is_ready, report = await readiness(checks)
+        return JSONResponse(report, status_code=200 if is_ready else 503)
+
+    @router.get("/pool")
+    async def pool() -> dict[str, Any]:
+        return get_pool_stats()
+
+    @router.get("/dedup")
+    async def dedup() -> dict[str, Any]:
+        return duplicate_guard.stats()
+
+    @router.get("/clients")
+    async def clients() -> dict[str, Any]:
+        return client_budget.stats()
+
+    @router.get("/query-cache")
+    async def query_cache() -> dict[str, Any]:
+        """Databricks result cache counters; empty until the first Databricks query."""
+        return query_cache_stats() or {}
+
+    return router
@@ -0,0 +1,166 @@
+"""Read API for contact inquiries: keyset-paginated listing and streamed CSV/NDJSON export.
+
+Both endpoints require `Authorization: Bearer <INQUIRY_API_TOKEN>` and are not registered at all
+when the variable is unset. CSV cells that a spreadsheet would evaluate as a formula (visitor
+input starting with `=`, `+`, `-`, `@`, tab or carriage return) are exported with a leading `'`.
+"""
+
+import base64
+import csv
+import io
+import json
+import os
+import secrets
+from datetime import datetime
+from logging import getLogger
+from typing import Annotated, Any, AsyncIterator, Literal, Sequence, TypeVar
+
+from nicegui import app
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select, literal, tuple_
+from sqlmodel import col, select
+
+from app.database import get_async_session
+from app.models import ContactInquiry, ContactInquiryRead
+
+logger = getLogger(__name__)
+
+INQUIRY_API_TOKEN = os.environ.get("INQUIRY_API_TOKEN")
+# statement_timeout for the export transaction; the regular 1s limit would cut off large exports
+EXPORT_STATEMENT_TIMEOUT_MS = int(os.environ.get("INQUIRY_EXPORT_STATEMENT_TIMEOUT_MS", "0"))
+EXPORT_BATCH_SIZE = 1000
+
+COLUMNS = ("id", "name", "email", "company", "message", "created_at")
+
+# cells a spreadsheet would evaluate as a formula; a leading quote makes them plain text
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+S = TypeVar("S", bound=Select)
+
+
+class InquiryPage(BaseModel):
+    items: list[ContactInquiryRead]
+    next_cursor: str | None
+
+
+def encode_cursor(created_at: datetime, inquiry_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), inquiry_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, inquiry_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at), int(inquiry_id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def _filtered(statement: S, email: str | None, since: datetime | None) -> S:
+    if email is not None:
+        statement = statement.where(col(ContactInquiry.email) == email.strip().lower())
+    if since is not None:
+        statement = statement.where(col(ContactInquiry.created_at) >= since)
+    return statement
+
+
+def _newest_first(statement: S) -> S:
+    return statement.order_by(col(ContactInquiry.created_at).desc(), col(ContactInquiry.id).desc())
+
+
+def _values(row: Sequence[Any]) -> tuple[Any, ...]:
+    # created_at is the last column
+    return (*row[:-1], row[-1].isoformat())
+
+
+def _csv_cell(value: Any) -> Any:
+    return f"'{value}" if isinstance(value, str) and value.startswith(FORMULA_PREFIXES) else value
+
+
+def _csv_chunk(rows: Sequence[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_csv_cell(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def _ndjson_chunk(rows: Sequence[Sequence[Any]]) -> str:
+    return "".join(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + "\n" for row in rows)
+
+
+async def export_chunks(
+    export_format: Literal["csv", "ndjson"], email: str | None = None, since: datetime | None = None
+) -> AsyncIterator[str]:
+    """Encoded export text, one chunk per `EXPORT_BATCH_SIZE` rows read from a server-side cursor."""
+    statement = _newest_first(_filtered(select(*(getattr(ContactInquiry, name) for name in COLUMNS)), email, since))
+    async with get_async_session() as session, session.begin():
+        connection = await session.connection()
+        await connection.exec_driver_sql(f"SET LOCAL statement_timeout = {EXPORT_STATEMENT_TIMEOUT_MS}")
+        result = await session.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        if export_format == "csv":
+            yield _csv_chunk([COLUMNS])
+        async for rows in result.partitions():
+            values = [_values(row) for row in rows]
+            match export_format:
+                case "csv":
+                    yield _csv_chunk(values)
+                case "ndjson":
+                    yield _ndjson_chunk(values)
+
+
+def create_router(token: str) -> APIRouter:
+    def require_token(request: Request) -> None:
+        scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not secrets.compare_digest(credentials.encode(), token.encode()):
+            raise HTTPException(status_code=401, detail="Invalid token", headers={"WWW-Authenticate": "Bearer"})
+
+    router = APIRouter(prefix="/api/inquiries", dependencies=[Depends(require_token)])
+
+    @router.get("", response_model=InquiryPage)
+    async def list_inquiries(
+        limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+        cursor: str | None = None,
+        email: str | None = None,
+        since: datetime | None = None,
+    ) -> InquiryPage:
+        """Newest first; pass `next_cursor` back as `cursor` for the following page."""
+        statement = _filtered(select(ContactInquiry), email, since)
+        if cursor is not None:
+            created_at, inquiry_id = decode_cursor(cursor)
+            statement = statement.where(
+                tuple_(col(ContactInquiry.created_at), col(ContactInquiry.id))
+                < tuple_(literal(created_at), literal(inquiry_id))
+            )
+        async with get_async_session() as session:
+            inquiries = list((await session.exec(_newest_first(statement).limit(limit + 1))).all())
+        next_cursor = None
+        if len(inquiries) > limit:
+            inquiries = inquiries[:limit]
+            last = inquiries[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)  # type: ignore[arg-type]
+        return InquiryPage(
+            items=[ContactInquiryRead.model_validate(inquiry, from_attributes=True) for inquiry in inquiries],
+            next_cursor=next_cursor,
+        )
+
+    @router.get("/export")
+    async def export_inquiries(
+        format: Literal["csv", "ndjson"] = "csv", email: str | None = None, since: datetime | None = None
+    ) -> StreamingResponse:
+        media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+        filename = f"contact_inquiries.{format}"
+        return StreamingResponse(
+            export_chunks(format, email, since),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"},
+        )
+
+    return router
+
+
+def create() -> None:
+    if not INQUIRY_API_TOKEN:
+        logger.info("INQUIRY_API_TOKEN is not set, the inquiry API is disabled")
+        return
+    app.include_router(create_router(INQUIRY_API_TOKEN))
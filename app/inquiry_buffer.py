@@ -0,0 +1,156 @@
+"""Write-behind buffer that batches contact inquiry inserts.
+
+Submissions are collected for at most `max_delay` seconds (or until `max_batch_size` are
+waiting) and written with a single multi-row INSERT ... RETURNING in one transaction. Each
+submitter awaits its own future, which only resolves after the batch has committed, so the
+UI never reports success for a row that is not durable.
+
+With a `DuplicateGuard`, a repeated submission is rejected with `DuplicateInquiry` before it is
+queued; one that only the unique `dedup_key` column catches is rejected after the flush.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import insert
+
+from app.database import get_async_session
+from app.dedup import DuplicateGuard, DuplicateInquiry, duplicate_guard, inquiry_fingerprint
+from app.models import ContactInquiry, ContactInquiryCreate
+from app.tracing import SpanContext, current_context, traced, tracer
+from app.validation import inquiry_from_create
+
+logger = logging.getLogger(__name__)
+
+# inquiry, dedup fingerprint, the submitter's future and trace context
+Pending = tuple[ContactInquiry, str | None, "asyncio.Future[ContactInquiry | None]", SpanContext | None]
+
+
+class InquiryWriteBuffer:
+    """Collects `ContactInquiryCreate` payloads and flushes them in batches."""
+
+    def __init__(self, max_batch_size: int = 50, max_delay: float = 0.02, guard: DuplicateGuard | None = None) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_delay < 0:
+            raise ValueError("max_delay must not be negative")
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.guard = guard
+        self._pending: list[Pending] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task[None]] = set()
+        self._draining = False
+
+    @classmethod
+    def from_env(cls) -> "InquiryWriteBuffer":
+        return cls(
+            max_batch_size=int(os.environ.get("INQUIRY_BATCH_SIZE", "50")),
+            max_delay=int(os.environ.get("INQUIRY_BATCH_DELAY_MS", "20")) / 1000,
+            guard=duplicate_guard,
+        )
+
+    @property
+    def pending(self) -> int:
+        """Number of submissions waiting for the next flush."""
+        return len(self._pending)
+
+    @traced("inquiry_buffer.submit")
+    async def submit(self, data: ContactInquiry | ContactInquiryCreate) -> ContactInquiry | None:
+        """Queue an inquiry and wait until its batch is committed.
+
+        `data` is a row from `validate_inquiry()` or a `ContactInquiryCreate`. Returns the stored
+        inquiry, or None if the batch could not be written. Raises `DuplicateInquiry` if the guard
+        has seen the same email and message within its window.
+        """
+        loop = asyncio.get_running_loop()
+        inquiry = data if isinstance(data, ContactInquiry) else inquiry_from_create(data)
+        fingerprint = None
+        if self.guard is not None:
+            fingerprint = inquiry_fingerprint(inquiry.email, inquiry.message)
+            if not self.guard.claim(fingerprint):
+                raise DuplicateInquiry(inquiry.email)
+            inquiry.dedup_key = self.guard.dedup_key(fingerprint)
+        future: asyncio.Future[ContactInquiry | None] = loop.create_future()
+        self._pending.append((inquiry, fingerprint, future, current_context()))
+
+        if self._draining or len(self._pending) >= self.max_batch_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._start_flush)
+        return await future
+
+    async def drain(self) -> None:
+        """Flush everything that is queued and wait for in-flight batches to commit."""
+        self._draining = True
+        try:
+            while self._pending or self._flushes:
+                if self._pending:
+                    self._start_flush()
+                await asyncio.gather(*self._flushes)
+        finally:
+            self._draining = False
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        # a fresh context: the batch belongs to every submitter's trace, its span links to each of them
+        task = asyncio.create_task(self._flush(batch), context=contextvars.Context())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[Pending]) -> None:
+        inquiries = [inquiry for inquiry, _, _, _ in batch]
+        rows = [inquiry.model_dump(exclude={"id"}) for inquiry in inquiries]
+        links = [trace for _, _, _, trace in batch if trace is not None]
+        try:
+            with tracer.span("inquiry_buffer.flush", attributes={"batch_size": len(batch)}, links=links):
+                async with get_async_session() as session:
+                    if self.guard is None:
+                        statement = insert(ContactInquiry).returning(
+                            ContactInquiry.id,  # type: ignore[arg-type]
+                            sort_by_parameter_order=True,
+                        )
+                        result = await session.exec(statement, params=rows)
+                        ids = list(result.scalars().all())
+                    else:
+                        # rows whose dedup_key already exists are skipped and missing from RETURNING
+                        statement = (
+                            pg_insert(ContactInquiry)
+                            .on_conflict_do_nothing()
+                            .returning(ContactInquiry.id, ContactInquiry.dedup_key)  # type: ignore[arg-type]
+                        )
+                        result = await session.exec(statement, params=rows)
+                        stored = {dedup_key: inquiry_id for inquiry_id, dedup_key in result.all()}
+                        ids = [stored.get(inquiry.dedup_key) for inquiry in inquiries]
+                    await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to write batch of {len(batch)} contact inquiries: {e}")
+            for _, fingerprint, future, _ in batch:
+                if fingerprint is not None and self.guard is not None:
+                    self.guard.release(fingerprint)
+                if not future.done():
+                    future.set_result(None)
+            return
+
+        for (inquiry, _, future, _), inquiry_id in zip(batch, ids, strict=True):
+            if future.done():
+                continue
+            if inquiry_id is None:
+                logger.info("Duplicate contact inquiry rejected by the database")
+                if self.guard is not None:
+                    self.guard.record_db_duplicate()
+                future.set_exception(DuplicateInquiry(inquiry.email))
+                continue
+            inquiry.id = inquiry_id
+            future.set_result(inquiry)
+
+
+inquiry_buffer = InquiryWriteBuffer.from_env()
@@ -0,0 +1,155 @@
+"""Physical layout of contact_inquiries: indexes, optional monthly partitions and the archive table.
+
+Everything here is idempotent; the schema itself is created by the migrations in `app.migrations`,
+which also create upcoming monthly partitions on every run.
+"""
+
+import os
+import re
+from datetime import date
+from logging import getLogger
+from typing import Sequence
+
+from sqlalchemy import Column, Connection, Engine, MetaData, Table, text
+
+from app.models import ContactInquiry
+
+logger = getLogger(__name__)
+
+# "none" or "monthly": RANGE partitions on created_at, one per calendar month plus a default one
+PARTITIONING = os.environ.get("APP_INQUIRY_PARTITIONING", "none")
+PARTITIONS_AHEAD = int(os.environ.get("APP_INQUIRY_PARTITIONS_AHEAD", "3"))
+
+INQUIRY_TABLE: Table = ContactInquiry.__table__  # type: ignore[attr-defined]
+
+ARCHIVE_TABLE = Table(
+    "contact_inquiries_archive",
+    MetaData(),
+    *(
+        Column(column.name, column.type, primary_key=column.primary_key, autoincrement=False, nullable=column.nullable)
+        for column in INQUIRY_TABLE.columns
+    ),
+)
+
+_PARTITION_NAME = re.compile(rf"^{INQUIRY_TABLE.name}_p(\d{{4}})(\d{{2}})$")
+
+# unique indexes that every partition gets (see `create_index`), with their columns
+PARTITION_UNIQUE_INDEXES: dict[str, Sequence[str]] = {"ux_contact_inquiries_dedup_key": ["dedup_key"]}
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{INQUIRY_TABLE.name}_p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    """Month covered by a partition created by `ensure_partitions`, None for any other table."""
+    match = _PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def is_partitioned(conn: Connection) -> bool:
+    relkind = conn.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"), {"table": INQUIRY_TABLE.name}
+    ).scalar()
+    return relkind == "p"
+
+
+def partitions(conn: Connection) -> list[str]:
+    return list(
+        conn.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:table) ORDER BY c.relname"
+            ),
+            {"table": INQUIRY_TABLE.name},
+        ).scalars()
+    )
+
+
+def _create_partition(conn: Connection, name: str, month: date) -> None:
+    parent, default = INQUIRY_TABLE.name, f"{INQUIRY_TABLE.name}_default"
+    bounds = f"FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    in_month = f"created_at >= '{month.isoformat()}' AND created_at < '{add_months(month, 1).isoformat()}'"
+    if not conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_month})")).scalar():
+        conn.execute(text(f"CREATE TABLE {name} PARTITION OF {parent} FOR VALUES {bounds}"))
+        return
+    # rows of this month already landed in the default partition (no partition existed for it yet);
+    # Postgres refuses the new partition until they are moved out
+    logger.warning(f"Moving rows from {default} into new partition {name}")
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {parent} INCLUDING DEFAULTS)"))
+    conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {in_month} RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+        )
+    )
+    conn.execute(text(f"ALTER TABLE {parent} ATTACH PARTITION {name} FOR VALUES {bounds}"))
+
+
+def ensure_partitions(conn: Connection, today: date, ahead: int = PARTITIONS_AHEAD) -> list[str]:
+    """Create the default partition and monthly partitions from this month up to `ahead` months on.
+
+    New partitions get the `PARTITION_UNIQUE_INDEXES` right away, while they are still small.
+    """
+    default = f"{INQUIRY_TABLE.name}_default"
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {default} PARTITION OF {INQUIRY_TABLE.name} DEFAULT"))
+    existing = set(partitions(conn))
+    created = []
+    for offset in range(ahead + 1):
+        month = add_months(month_start(today), offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        _create_partition(conn, name, month)
+        created.append(name)
+    for partition in [default, *created]:
+        for index, columns in PARTITION_UNIQUE_INDEXES.items():
+            _create_index(conn, _partition_index_name(index, partition), partition, columns, True, concurrently=False)
+    if created:
+        logger.info(f"Created partitions {', '.join(created)}")
+    return created
+
+
+def _partition_index_name(name: str, partition: str) -> str:
+    return name.replace(INQUIRY_TABLE.name, partition, 1)
+
+
+def _create_index(
+    conn: Connection, name: str, table: str, columns: Sequence[str], unique: bool, concurrently: bool
+) -> None:
+    invalid = conn.execute(
+        text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    ).scalar()
+    if invalid:
+        logger.warning(f"Rebuilding invalid index {name}")
+        conn.exec_driver_sql(f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}{name}")
+    conn.exec_driver_sql(
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS "
+        f"{name} ON {table} ({', '.join(columns)})"
+    )
+
+
+def create_index(engine: Engine, name: str, columns: Sequence[str], unique: bool = False) -> None:
+    """Create an index on contact_inquiries unless it exists.
+
+    On a plain table it is built CONCURRENTLY so inserts are not blocked while it is built over
+    existing rows; Postgres does not support that on a partitioned parent. A unique index on a
+    partitioned parent would have to include created_at, which defeats a unique `dedup_key`:
+    there it is built CONCURRENTLY on each partition instead, and only holds within one month.
+    An invalid leftover of an interrupted concurrent build is dropped and built again.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        partitioned = is_partitioned(conn)
+        if partitioned and unique:
+            for partition in partitions(conn):
+                _create_index(conn, _partition_index_name(name, partition), partition, columns, True, concurrently=True)
+            return
+        _create_index(conn, name, INQUIRY_TABLE.name, columns, unique, concurrently=not partitioned)
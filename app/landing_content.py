@@ -0,0 +1,71 @@
+"""Copy and theme of the landing page, shared by the live NiceGUI page and the pre-rendered HTML.
+
+The stylesheet and images live in `app/static` and are linked through `app.assets.asset_url`.
+"""
+
+PAGE_TITLE = "DV-ONES AI Vision - Solusi AI & Visualisasi Data"
+
+THEME_COLORS = {
+    "primary": "#2563eb",  # Professional blue
+    "secondary": "#64748b",  # Subtle gray
+    "accent": "#10b981",  # Success green
+    "positive": "#10b981",
+    "negative": "#ef4444",  # Error red
+    "warning": "#f59e0b",  # Warning amber
+    "info": "#3b82f6",  # Info blue
+}
+# the pre-rendered page loads Quasar's CSS without its JS, which would otherwise set these variables
+THEME_CSS = ":root{" + "".join(f"--q-{name}:{value};" for name, value in THEME_COLORS.items()) + "}"
+
+HERO_TITLE = "Solusi AI & Visualisasi Data yang Mengubah Cara Bisnis Mengambil Keputusan"
+HERO_SUBTITLE = "Kecerdasan buatan dan visualisasi canggih untuk korporasi, edukasi, retail, dan regulasi"
+HERO_CTA = "Gabung sebagai Investor"
+HERO_IMAGE = "hero-ai-dashboard.svg"
+CONTACT_ANCHOR = "investor-contact"
+
+PROBLEMS_TITLE = "Masalah yang Kami Atasi"
+PROBLEMS = (
+    "Informasi bisnis tidak terstruktur & sulit diakses",
+    "Regulasi & compliance makin kompleks",
+    "Tim non-teknis kesulitan membaca data",
+    "Kebutuhan efisiensi dalam edukasi & pelatihan",
+)
+
+SOLUTION_TITLE = "Solusi Kami"
+SOLUTION_INTRO = (
+    "Kami menghadirkan 5 produk AI untuk menyederhanakan analisis, pelaporan, "
+    "dan pencarian informasi dengan UI ramah pengguna."
+)
+PRODUCTS = (
+    {"name": "Knowledge-as-a-Service RAG", "icon": "rag.svg"},
+    {"name": "NL2SQL Data Assistant", "icon": "nl2sql.svg"},
+    {"name": "Retail Intelligence Dashboard", "icon": "retail-intel.svg"},
+)
+
+MARKETS_TITLE = "Target Pasar"
+MARKETS = (
+    "Perusahaan menengah & besar",
+    "Institusi pendidikan",
+    "eCommerce & retail",
+    "Industri keuangan & kesehatan",
+)
+
+OPPORTUNITIES_TITLE = "Potensi Bisnis"
+OPPORTUNITIES = (
+    "Model SaaS berbasis subscription",
+    "Integrasi multiplatform: Web, WhatsApp, API",
+    "Margin tinggi dari modularisasi produk",
+    "Peluang ekspansi ke Asia Tenggara",
+)
+
+INVESTMENT_TITLE = "Ajakan Investasi"
+INVESTMENT_TEXT = (
+    "Kami membuka peluang kolaborasi, pendanaan awal, dan venture partnership "
+    "untuk mendorong transformasi digital berbasis AI."
+)
+
+CONTACT_TITLE = "Tertarik Bergabung?"
+CONTACT_INTRO = "Isi formulir atau hubungi tim kami untuk informasi detail kemitraan dan proposal investasi."
+
+FOOTER_TITLE = "DV-ONES AI Vision"
+FOOTER_TEXT = "© 2024 DV-ONES AI Vision. Transformasi Digital Berbasis Kecerdasan Buatan."
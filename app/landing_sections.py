@@ -0,0 +1,283 @@
+"""Declarative model of the live landing page and the builder that turns it into NiceGUI elements.
+
+The sections are frozen data built once at import from `landing_content`, with every Tailwind
+class string already split into a tuple. `build_sections()` walks them and extends each new
+element's class list and props directly: `.classes("...")` would split, de-duplicate and queue
+an update for every element of every visit. The theme colors go into Quasar's brand config and
+the stylesheet link into the shared page head, once (`install_theme()`), instead of a `ui.colors`
+element and a head snippet per client.
+"""
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Callable, Literal, Mapping, TypeVar
+
+from nicegui import Client, app, ui
+from nicegui.element import Element
+
+from app import landing_content as content
+from app.assets import asset_url
+
+E = TypeVar("E", bound=Element)
+Classes = tuple[str, ...]
+
+_NO_PROPS: Mapping[str, str] = MappingProxyType({})
+_NO_SLOTS: Mapping[str, Callable[[], None]] = MappingProxyType({})
+
+
+def classes(names: str) -> Classes:
+    return tuple(names.split())
+
+
+@dataclass(frozen=True)
+class Label:
+    text: str
+    classes: Classes
+
+
+@dataclass(frozen=True)
+class Html:
+    """Trusted markup from `landing_content`, never user input."""
+
+    content: str
+
+
+@dataclass(frozen=True)
+class Figure:
+    """An image from `app/static` on a card."""
+
+    image: str
+    card_classes: Classes
+    image_classes: Classes
+
+
+@dataclass(frozen=True)
+class Item:
+    text: str
+    icon: str | None = None
+    image: str | None = None
+
+
+@dataclass(frozen=True)
+class ItemStyle:
+    """How each item of an `ItemList` looks: a card or a row with an icon or image and a label."""
+
+    kind: Literal["card", "row"]
+    classes: Classes
+    label_classes: Classes
+    icon_color: str | None = None
+    icon_classes: Classes = ()
+    image_classes: Classes = ()
+
+
+@dataclass(frozen=True)
+class ItemList:
+    items: tuple[Item, ...]
+    layout: Literal["row", "column"]
+    classes: Classes
+    style: ItemStyle
+
+
+@dataclass(frozen=True)
+class Slot:
+    """Where the page fills in a live part, such as the contact form."""
+
+    name: str
+
+
+Block = Label | Html | Figure | ItemList | Slot
+
+
+@dataclass(frozen=True)
+class Section:
+    classes: Classes
+    inner_classes: Classes
+    blocks: tuple[Block, ...]
+    props: Mapping[str, str] = field(default=_NO_PROPS)
+
+
+SECTION_TITLE = classes("text-3xl font-bold text-gray-800 text-center mb-12")
+
+SECTIONS: tuple[Section, ...] = (
+    Section(
+        classes("hero-section w-full min-h-screen flex items-center justify-center p-8"),
+        classes("max-w-6xl mx-auto text-center"),
+        (
+            Label(content.HERO_TITLE, classes("text-4xl md:text-6xl font-bold mb-6 leading-tight")),
+            Label(
+                content.HERO_SUBTITLE, classes("text-xl md:text-2xl mb-8 opacity-90 max-w-4xl mx-auto leading-relaxed")
+            ),
+            Html(
+                f'<a href="#{content.CONTACT_ANCHOR}" class="gradient-button inline-block px-8 py-4 rounded-lg '
+                f'text-lg font-semibold no-underline">{content.HERO_CTA}</a>'
+            ),
+            Figure(
+                content.HERO_IMAGE,
+                classes("mt-12 p-6 section-card rounded-xl shadow-2xl max-w-4xl mx-auto"),
+                classes("w-full h-auto rounded-lg"),
+            ),
+        ),
+    ),
+    Section(
+        classes("w-full bg-gray-50 py-16 px-8"),
+        classes("max-w-6xl mx-auto"),
+        (
+            Label(content.PROBLEMS_TITLE, SECTION_TITLE),
+            ItemList(
+                tuple(Item(problem, icon="error_outline") for problem in content.PROBLEMS),
+                "row",
+                classes("gap-6 flex-wrap justify-center"),
+                ItemStyle(
+                    "card",
+                    classes("p-6 max-w-sm shadow-lg rounded-xl hover:shadow-xl transition-shadow"),
+                    classes("text-gray-700 font-medium leading-relaxed"),
+                    icon_color="negative",
+                    icon_classes=classes("text-4xl mb-4"),
+                ),
+            ),
+        ),
+    ),
+    Section(
+        classes("w-full bg-white py-16 px-8"),
+        classes("max-w-6xl mx-auto"),
+        (
+            Label(content.SOLUTION_TITLE, classes("text-3xl font-bold text-gray-800 text-center mb-8")),
+            Label(
+                content.SOLUTION_INTRO,
+                classes("text-xl text-gray-600 text-center mb-12 max-w-4xl mx-auto leading-relaxed"),
+            ),
+            ItemList(
+                tuple(Item(product["name"], image=product["icon"]) for product in content.PRODUCTS),
+                "row",
+                classes("gap-8 flex-wrap justify-center"),
+                ItemStyle(
+                    "card",
+                    classes("product-card p-8 max-w-sm rounded-xl shadow-lg"),
+                    classes("text-xl font-semibold text-gray-800 text-center"),
+                    image_classes=classes("w-16 h-16 mb-6 mx-auto"),
+                ),
+            ),
+        ),
+    ),
+    Section(
+        classes("w-full bg-gradient-to-br from-blue-50 to-indigo-100 py-16 px-8"),
+        classes("max-w-6xl mx-auto"),
+        (
+            Label(content.MARKETS_TITLE, SECTION_TITLE),
+            ItemList(
+                tuple(Item(market, icon="business") for market in content.MARKETS),
+                "row",
+                classes("gap-6 flex-wrap justify-center"),
+                ItemStyle(
+                    "card",
+                    classes("p-6 max-w-sm shadow-lg rounded-xl bg-white hover:shadow-xl transition-shadow"),
+                    classes("text-gray-700 font-medium text-center leading-relaxed"),
+                    icon_color="primary",
+                    icon_classes=classes("text-4xl mb-4"),
+                ),
+            ),
+        ),
+    ),
+    Section(
+        classes("w-full bg-white py-16 px-8"),
+        classes("max-w-6xl mx-auto"),
+        (
+            Label(content.OPPORTUNITIES_TITLE, SECTION_TITLE),
+            ItemList(
+                tuple(Item(opportunity, icon="trending_up") for opportunity in content.OPPORTUNITIES),
+                "column",
+                classes("max-w-4xl mx-auto space-y-4"),
+                ItemStyle(
+                    "row",
+                    classes("items-center p-4 bg-green-50 rounded-lg"),
+                    classes("text-gray-700 font-medium text-lg"),
+                    icon_color="positive",
+                    icon_classes=classes("text-2xl mr-4"),
+                ),
+            ),
+        ),
+    ),
+    Section(
+        classes("w-full bg-gradient-to-r from-purple-600 to-blue-600 py-16 px-8 text-white"),
+        classes("max-w-4xl mx-auto text-center"),
+        (
+            Label(content.INVESTMENT_TITLE, classes("text-3xl font-bold mb-8")),
+            Label(content.INVESTMENT_TEXT, classes("text-xl leading-relaxed opacity-90")),
+        ),
+    ),
+    Section(
+        classes("w-full bg-gray-50 py-16 px-8"),
+        classes("max-w-4xl mx-auto"),
+        (
+            Label(content.CONTACT_TITLE, classes("text-3xl font-bold text-gray-800 text-center mb-6")),
+            Label(content.CONTACT_INTRO, classes("text-xl text-gray-600 text-center mb-12 leading-relaxed")),
+            Slot("contact_form"),
+        ),
+        props=MappingProxyType({"id": content.CONTACT_ANCHOR}),
+    ),
+    Section(
+        classes("w-full bg-gray-800 text-white py-12 px-8"),
+        classes("max-w-6xl mx-auto text-center"),
+        (
+            Label(content.FOOTER_TITLE, classes("text-2xl font-bold mb-4")),
+            Label(content.FOOTER_TEXT, classes("text-gray-300 text-lg")),
+        ),
+    ),
+)
+
+
+def _styled(element: E, names: Classes, props: Mapping[str, str] = _NO_PROPS) -> E:
+    # the element is new and its first update is already queued, so nothing else needs to be sent
+    element.classes.extend(names)
+    if props:
+        element.props.update(props)
+    return element
+
+
+def _build_item(item: Item, style: ItemStyle) -> None:
+    container = ui.card() if style.kind == "card" else ui.row()
+    with _styled(container, style.classes):
+        if item.icon is not None:
+            _styled(ui.icon(item.icon, color=style.icon_color), style.icon_classes)
+        if item.image is not None:
+            _styled(ui.image(asset_url(item.image)), style.image_classes)
+        _styled(ui.label(item.text), style.label_classes)
+
+
+def _build_block(block: Block, slots: Mapping[str, Callable[[], None]]) -> None:
+    match block:
+        case Label(text, names):
+            _styled(ui.label(text), names)
+        case Html(markup):
+            ui.html(markup)
+        case Figure(image, card_classes, image_classes):
+            with _styled(ui.card(), card_classes):
+                _styled(ui.image(asset_url(image)), image_classes)
+        case ItemList(items, layout, names, style):
+            with _styled(ui.row() if layout == "row" else ui.column(), names):
+                for item in items:
+                    _build_item(item, style)
+        case Slot(name):
+            slots[name]()
+
+
+def build_sections(sections: tuple[Section, ...], slots: Mapping[str, Callable[[], None]] = _NO_SLOTS) -> None:
+    """Create the elements of `sections` in the current context; `slots` fill the `Slot` blocks."""
+    for section in sections:
+        with _styled(ui.column(), section.classes, section.props):
+            with _styled(ui.column(), section.inner_classes):
+                for block in section.blocks:
+                    _build_block(block, slots)
+
+
+def theme_head_html() -> str:
+    return f'<link href="{asset_url("landing.css")}" rel="stylesheet">'
+
+
+def install_theme() -> None:
+    """Set the theme colors and add the stylesheet to the head of every page, once per process."""
+    # Quasar sets the brand colors as inline variables on <body>, which override a :root stylesheet
+    app.config.quasar_config["brand"].update(content.THEME_COLORS)
+    head = theme_head_html()
+    if head not in Client.shared_head_html:
+        ui.add_head_html(head, shared=True)
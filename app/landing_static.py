@@ -0,0 +1,211 @@
+"""Pre-rendered landing page for anonymous visitors.
+
+The marketing sections are rendered once per process into plain HTML and served with
+`ETag`/`Last-Modified` validators, so a visit costs neither a NiceGUI client nor a websocket.
+Only the contact form runs live: it is embedded from `/contact-form` in a lazily loaded iframe,
+which the browser fetches when the section scrolls into view.
+"""
+
+import functools
+import hashlib
+import logging
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from html import escape
+from pathlib import Path
+
+import nicegui
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app import landing_content as content
+from app.assets import asset_url
+
+logger = logging.getLogger(__name__)
+
+CONTACT_FORM_PATH = "/contact-form"
+CACHE_CONTROL = "public, max-age=300"
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    body: bytes
+    etag: str
+    last_modified: float
+
+    @property
+    def last_modified_header(self) -> str:
+        return formatdate(self.last_modified, usegmt=True)
+
+
+def _icon(name: str, color: str, classes: str) -> str:
+    return f'<i class="q-icon notranslate material-icons text-{color} {classes}" aria-hidden="true">{name}</i>'
+
+
+def _card(classes: str, inner: str) -> str:
+    return f'<div class="q-card {classes}">{inner}</div>'
+
+
+def _section(outer_classes: str, inner_classes: str, inner: str, section_id: str | None = None) -> str:
+    id_attr = f' id="{section_id}"' if section_id else ""
+    return (
+        f'<section class="flex flex-col gap-4 {outer_classes}"{id_attr}>'
+        f'<div class="flex flex-col gap-4 {inner_classes}">{inner}</div></section>'
+    )
+
+
+def render_landing_html() -> str:
+    """Render the full landing page, with the contact form as a lazy iframe."""
+    static = f"/_nicegui/{nicegui.__version__}/static"
+
+    hero = _section(
+        "hero-section w-full min-h-screen items-center justify-center p-8",
+        "max-w-6xl mx-auto text-center",
+        f'<h1 class="text-4xl md:text-6xl font-bold mb-6 leading-tight">{escape(content.HERO_TITLE)}</h1>'
+        f'<p class="text-xl md:text-2xl mb-8 opacity-90 max-w-4xl mx-auto leading-relaxed">'
+        f"{escape(content.HERO_SUBTITLE)}</p>"
+        f'<div><a href="#{content.CONTACT_ANCHOR}" class="gradient-button inline-block px-8 py-4 rounded-lg '
+        f'text-lg font-semibold no-underline">{escape(content.HERO_CTA)}</a></div>'
+        + _card(
+            "mt-12 p-6 section-card rounded-xl shadow-2xl max-w-4xl mx-auto",
+            f'<img src="{escape(asset_url(content.HERO_IMAGE))}" alt="" class="w-full h-auto rounded-lg">',
+        ),
+    )
+
+    problems = _section(
+        "w-full bg-gray-50 py-16 px-8",
+        "max-w-6xl mx-auto",
+        f'<h2 class="text-3xl font-bold text-gray-800 text-center mb-12">{escape(content.PROBLEMS_TITLE)}</h2>'
+        '<div class="flex flex-row gap-6 flex-wrap justify-center">'
+        + "".join(
+            _card(
+                "p-6 max-w-sm shadow-lg rounded-xl hover:shadow-xl transition-shadow flex flex-col gap-4",
+                _icon("error_outline", "negative", "text-4xl mb-4")
+                + f'<div class="text-gray-700 font-medium leading-relaxed">{escape(problem)}</div>',
+            )
+            for problem in content.PROBLEMS
+        )
+        + "</div>",
+    )
+
+    solution = _section(
+        "w-full bg-white py-16 px-8",
+        "max-w-6xl mx-auto",
+        f'<h2 class="text-3xl font-bold text-gray-800 text-center mb-8">{escape(content.SOLUTION_TITLE)}</h2>'
+        f'<p class="text-xl text-gray-600 text-center mb-12 max-w-4xl mx-auto leading-relaxed">'
+        f"{escape(content.SOLUTION_INTRO)}</p>"
+        '<div class="flex flex-row gap-8 flex-wrap justify-center">'
+        + "".join(
+            _card(
+                "product-card p-8 max-w-sm rounded-xl shadow-lg flex flex-col gap-4",
+                f'<img src="{escape(asset_url(product["icon"]))}" alt="" class="w-16 h-16 mb-6 mx-auto">'
+                f'<div class="text-xl font-semibold text-gray-800 text-center">{escape(product["name"])}</div>',
+            )
+            for product in content.PRODUCTS
+        )
+        + "</div>",
+    )
+
+    markets = _section(
+        "w-full bg-gradient-to-br from-blue-50 to-indigo-100 py-16 px-8",
+        "max-w-6xl mx-auto",
+        f'<h2 class="text-3xl font-bold text-gray-800 text-center mb-12">{escape(content.MARKETS_TITLE)}</h2>'
+        '<div class="flex flex-row gap-6 flex-wrap justify-center">'
+        + "".join(
+            _card(
+                "p-6 max-w-sm shadow-lg rounded-xl bg-white hover:shadow-xl transition-shadow flex flex-col gap-4",
+                _icon("business", "primary", "text-4xl mb-4")
+                + f'<div class="text-gray-700 font-medium text-center leading-relaxed">{escape(market)}</div>',
+            )
+            for market in content.MARKETS
+        )
+        + "</div>",
+    )
+
+    opportunities = _section(
+        "w-full bg-white py-16 px-8",
+        "max-w-6xl mx-auto",
+        f'<h2 class="text-3xl font-bold text-gray-800 text-center mb-12">{escape(content.OPPORTUNITIES_TITLE)}</h2>'
+        '<div class="flex flex-col max-w-4xl mx-auto space-y-4">'
+        + "".join(
+            '<div class="flex flex-row items-center p-4 bg-green-50 rounded-lg">'
+            + _icon("trending_up", "positive", "text-2xl mr-4")
+            + f'<div class="text-gray-700 font-medium text-lg">{escape(opportunity)}</div></div>'
+            for opportunity in content.OPPORTUNITIES
+        )
+        + "</div>",
+    )
+
+    investment = _section(
+        "w-full bg-gradient-to-r from-purple-600 to-blue-600 py-16 px-8 text-white",
+        "max-w-4xl mx-auto text-center",
+        f'<h2 class="text-3xl font-bold mb-8">{escape(content.INVESTMENT_TITLE)}</h2>'
+        f'<p class="text-xl leading-relaxed opacity-90">{escape(content.INVESTMENT_TEXT)}</p>',
+    )
+
+    contact = _section(
+        "w-full bg-gray-50 py-16 px-8",
+        "max-w-4xl mx-auto",
+        f'<h2 class="text-3xl font-bold text-gray-800 text-center mb-6">{escape(content.CONTACT_TITLE)}</h2>'
+        f'<p class="text-xl text-gray-600 text-center mb-12 leading-relaxed">{escape(content.CONTACT_INTRO)}</p>'
+        f'<iframe src="{CONTACT_FORM_PATH}" loading="lazy" title="{escape(content.CONTACT_TITLE)}" '
+        'class="w-full max-w-2xl mx-auto block border-0" style="height: 40rem"></iframe>',
+        section_id=content.CONTACT_ANCHOR,
+    )
+
+    footer = (
+        '<footer class="w-full bg-gray-800 text-white py-12 px-8"><div class="max-w-6xl mx-auto text-center">'
+        f'<div class="text-2xl font-bold mb-4">{escape(content.FOOTER_TITLE)}</div>'
+        f'<div class="text-gray-300 text-lg">{escape(content.FOOTER_TEXT)}</div></div></footer>'
+    )
+
+    return (
+        '<!DOCTYPE html><html lang="id"><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f"<title>{escape(content.PAGE_TITLE)}</title>"
+        f'<link href="{static}/fonts.css" rel="stylesheet">'
+        f'<link href="{static}/quasar.prod.css" rel="stylesheet">'
+        f'<script defer src="{static}/tailwindcss.min.js"></script>'
+        f'<link href="{asset_url("landing.css")}" rel="stylesheet">'
+        f"<style>{content.THEME_CSS}</style>"
+        "</head><body><main>"
+        f"{hero}{problems}{solution}{markets}{opportunities}{investment}{contact}"
+        f"</main>{footer}</body></html>"
+    )
+
+
+@functools.cache
+def rendered_landing_page() -> RenderedPage:
+    """Render the page once per process; the validators only change when the content does."""
+    body = render_landing_html().encode()
+    sources = (Path(content.__file__), Path(__file__))
+    return RenderedPage(
+        body=body,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        last_modified=float(int(max(path.stat().st_mtime for path in sources))),
+    )
+
+
+def _is_not_modified(request: Request, page: RenderedPage) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110, section 13.2.2)
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or page.etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return parsedate_to_datetime(if_modified_since).timestamp() >= page.last_modified
+        except (TypeError, ValueError):
+            # a malformed date is ignored and the full page is sent (RFC 9110, section 13.1.3)
+            logger.debug(f"Ignoring malformed If-Modified-Since header {if_modified_since!r}")
+            return False
+    return False
+
+
+async def static_landing_response(request: Request) -> Response:
+    page = rendered_landing_page()
+    headers = {"ETag": page.etag, "Last-Modified": page.last_modified_header, "Cache-Control": CACHE_CONTROL}
+    if _is_not_modified(request, page):
+        return Response(status_code=304, headers=headers)
+    return Response(page.body, media_type="text/html; charset=utf-8", headers=headers)
@@ -0,0 +1,458 @@
+"""Prometheus metrics, served in the text exposition format at `/metrics`.
+
+A small registry instead of a client library: counters, gauges and histograms keep one row of
+values per thread, so recording from the event loop and from worker threads (sync DB sessions,
+Databricks calls) never takes a lock; the rows are summed when `/metrics` is scraped.
+
+Label values come from bounded sets (route templates, never raw paths; model class names). A
+metric that still exceeds `max_series` label combinations records the excess under `other`.
+"""
+
+import bisect
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import AbstractContextManager, contextmanager
+from typing import Any, Callable, Iterable, Iterator, Sequence, TypeVar
+
+from fastapi import APIRouter
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").strip().lower() in {"1", "true", "yes", "on"}
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# seconds; covers sub-millisecond cache hits up to warehouse statements near their 30s wait timeout
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+OVERFLOW_LABEL = "other"
+
+LabelValues = tuple[str, ...]
+
+
+class _Cells:
+    """Per-thread rows of floats; a thread only ever writes its own row, collection sums them all."""
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._local = threading.local()
+        self._rows: list[list[float]] = []
+        # only taken when a thread records for the first time, and when collecting
+        self._lock = threading.Lock()
+
+    def row(self) -> list[float]:
+        row = getattr(self._local, "row", None)
+        if row is None:
+            row = self._local.row = [0.0] * self._size
+            with self._lock:
+                self._rows.append(row)
+        return row
+
+    def totals(self) -> list[float]:
+        with self._lock:
+            rows = list(self._rows)
+        return [sum(column) for column in zip(*rows)] if rows else [0.0] * self._size
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+class Metric:
+    """A metric family; `labels(*values)` returns the child recording one label combination."""
+
+    type_name = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), max_series: int = 200) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._children: dict[LabelValues, Any] = {}
+        self._lock = threading.Lock()
+
+    def _size(self) -> int:
+        return 1
+
+    def _child(self, cells: _Cells) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> Any:
+        child = self._children.get(values)
+        if child is not None:
+            return child
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"Metric {self.name} takes labels {self.labelnames}, got {values}")
+        with self._lock:
+            if values not in self._children and len(self._children) >= self.max_series:
+                logger.warning(f"Metric {self.name} has {self.max_series} label combinations, recording more as other")
+                values = (OVERFLOW_LABEL,) * len(self.labelnames)
+            if values not in self._children:
+                self._children[values] = self._child(_Cells(self._size()))
+            return self._children[values]
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+
+    def collect(self) -> list[str]:
+        lines = self._header()
+        for values, child in sorted(self._children.items()):
+            value = child.cells.totals()[0]
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}")
+        return lines
+
+
+class CounterChild:
+    __slots__ = ("cells",)
+
+    def __init__(self, cells: _Cells) -> None:
+        self.cells = cells
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.cells.row()[0] += amount
+
+
+class GaugeChild(CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.cells.row()[0] -= amount
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def _child(self, cells: _Cells) -> CounterChild:
+        return CounterChild(cells)
+
+    def labels(self, *values: str) -> CounterChild:
+        return super().labels(*values)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    type_name = "gauge"
+
+    def _child(self, cells: _Cells) -> GaugeChild:
+        return GaugeChild(cells)
+
+    def labels(self, *values: str) -> GaugeChild:
+        return super().labels(*values)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+
+class CallbackGauge(Metric):
+    """Gauge read from `callback` at scrape time, e.g. the size of a collection owned elsewhere."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        callback: Callable[[], Iterable[tuple[LabelValues, float]]],
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.callback = callback
+
+    def collect(self) -> list[str]:
+        lines = self._header()
+        for values, value in self.callback():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}")
+        return lines
+
+
+class CallbackCounter(CallbackGauge):
+    """Counter read from `callback` at scrape time, for totals another component keeps itself."""
+
+    type_name = "counter"
+
+
+class HistogramChild:
+    """Each row holds the bucket counts, +Inf last, followed by the sum of observations."""
+
+    __slots__ = ("cells", "buckets")
+
+    def __init__(self, cells: _Cells, buckets: tuple[float, ...]) -> None:
+        self.cells = cells
+        self.buckets = buckets
+
+    def observe(self, value: float) -> None:
+        row = self.cells.row()
+        row[bisect.bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        max_series: int = 200,
+    ) -> None:
+        super().__init__(name, help, labelnames, max_series)
+        self.buckets = tuple(sorted(buckets))
+
+    def _size(self) -> int:
+        return len(self.buckets) + 2
+
+    def _child(self, cells: _Cells) -> HistogramChild:
+        return HistogramChild(cells, self.buckets)
+
+    def labels(self, *values: str) -> HistogramChild:
+        return super().labels(*values)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self) -> AbstractContextManager[None]:
+        return self.labels().time()
+
+    def collect(self) -> list[str]:
+        lines = self._header()
+        for values, child in sorted(self._children.items()):
+            totals = child.cells.totals()
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), totals[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(totals[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics.values() for line in metric.collect()) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def _nicegui_clients() -> Iterable[tuple[LabelValues, float]]:
+    from app.client_budget import client_budget
+
+    stats = client_budget.stats()
+    return [(("connected",), stats["connected"]), (("disconnected",), stats["clients"] - stats["connected"])]
+
+
+def _nicegui_client_totals(key: str) -> Callable[[], Iterable[tuple[LabelValues, float]]]:
+    def collect() -> Iterable[tuple[LabelValues, float]]:
+        from app.client_budget import client_budget
+
+        return [((), client_budget.stats()[key])]
+
+    return collect
+
+
+# QueryResultCache.stats() key -> event label
+_QUERY_CACHE_EVENTS = {
+    "hits": "hit",
+    "misses": "miss",
+    "coalesced": "coalesced",
+    "evictions": "eviction",
+    "expirations": "expiration",
+}
+
+
+def query_cache_stats() -> dict[str, int] | None:
+    """Counters of the Databricks result cache, or None while nothing has used Databricks yet."""
+    # looked up, not imported: importing app.dbrx would load the Databricks SDK on the first scrape
+    dbrx = sys.modules.get("app.dbrx")
+    return None if dbrx is None else dbrx.query_cache.stats()
+
+
+def _query_cache_events() -> Iterable[tuple[LabelValues, float]]:
+    stats = query_cache_stats()
+    return [] if stats is None else [((event,), stats[key]) for key, event in _QUERY_CACHE_EVENTS.items()]
+
+
+def _query_cache_totals(key: str) -> Callable[[], Iterable[tuple[LabelValues, float]]]:
+    def collect() -> Iterable[tuple[LabelValues, float]]:
+        stats = query_cache_stats()
+        return [] if stats is None else [((), stats[key])]
+
+    return collect
+
+
+def _pool_connections() -> Iterable[tuple[LabelValues, float]]:
+    from app.database import get_pool_stats
+
+    for engine, stats in get_pool_stats().items():
+        for state in ("checked_in", "checked_out", "overflow"):
+            if state in stats:
+                yield (engine, state), stats[state]
+
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(
+    Histogram("http_request_duration_seconds", "HTTP request latency by route template", ["method", "route", "status"])
+)
+WEBSOCKETS = REGISTRY.register(Gauge("websocket_connections", "Open websocket connections"))
+NICEGUI_CLIENTS = REGISTRY.register(
+    CallbackGauge("nicegui_clients", "NiceGUI clients by socket state", _nicegui_clients, ["state"])
+)
+NICEGUI_CLIENT_ELEMENTS = REGISTRY.register(
+    CallbackGauge("nicegui_client_elements", "Elements held by all NiceGUI clients", _nicegui_client_totals("elements"))
+)
+NICEGUI_CLIENT_BYTES = REGISTRY.register(
+    CallbackGauge(
+        "nicegui_client_memory_bytes", "Estimated memory of all NiceGUI clients", _nicegui_client_totals("approx_bytes")
+    )
+)
+NICEGUI_CLIENT_EVICTIONS = REGISTRY.register(
+    Counter("nicegui_client_evictions_total", "NiceGUI clients evicted by the client budget", ["reason"])
+)
+DB_POOL_CONNECTIONS = REGISTRY.register(
+    CallbackGauge("db_pool_connections", "Pooled database connections", _pool_connections, ["engine", "state"])
+)
+DB_TRANSACTION_SECONDS = REGISTRY.register(
+    Histogram(
+        "db_session_transaction_seconds",
+        "Time an ORM session holds a connection, from first statement to commit or rollback",
+        ["driver", "outcome"],
+    )
+)
+DB_COMMIT_SECONDS = REGISTRY.register(Histogram("db_session_commit_seconds", "ORM session commit latency", ["driver"]))
+DATABRICKS_QUEUE_SECONDS = REGISTRY.register(
+    Histogram("databricks_queue_seconds", "Time a query waits for a concurrency slot in gather_bounded")
+)
+DATABRICKS_EXECUTION_SECONDS = REGISTRY.register(
+    Histogram(
+        "databricks_execution_seconds", "Statement submission until its final state", ["mode", "state"], max_series=50
+    )
+)
+DATABRICKS_FETCH_SECONDS = REGISTRY.register(
+    Histogram("databricks_fetch_seconds", "Fetching one additional result chunk", ["source"])
+)
+DATABRICKS_CACHE_EVENTS = REGISTRY.register(
+    CallbackCounter(
+        "databricks_query_cache_events_total",
+        "Databricks result cache lookups and removals",
+        _query_cache_events,
+        ["event"],
+    )
+)
+DATABRICKS_CACHE_ENTRIES = REGISTRY.register(
+    CallbackGauge(
+        "databricks_query_cache_entries", "Results held by the Databricks cache", _query_cache_totals("entries")
+    )
+)
+DATABRICKS_CACHE_BYTES = REGISTRY.register(
+    CallbackGauge(
+        "databricks_query_cache_bytes", "Estimated memory of the Databricks result cache", _query_cache_totals("bytes")
+    )
+)
+DATABRICKS_RESULT_ROWS = REGISTRY.register(Counter("databricks_result_rows_total", "Rows read from statement results"))
+DATABRICKS_MODEL_ROWS = REGISTRY.register(
+    Counter("databricks_model_rows_total", "Rows materialized per DatabricksModel", ["model"])
+)
+
+
+_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+def route_label(scope: Scope) -> str:
+    """Route template (`/api/inquiries/{inquiry_id}`) or mount prefix the router matched, never the raw path."""
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path", OVERFLOW_LABEL)
+    # Mount sets root_path to its prefix, e.g. NiceGUI's socket.io and static files
+    return scope.get("root_path") or "unmatched"
+
+
+class MetricsMiddleware:
+    """Records latency per method, route template and status class, and counts open websockets."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        match scope["type"]:
+            case "http":
+                await self._http(scope, receive, send)
+            case "websocket":
+                WEBSOCKETS.inc()
+                try:
+                    await self.app(scope, receive, send)
+                finally:
+                    WEBSOCKETS.dec()
+            case _:
+                await self.app(scope, receive, send)
+
+    async def _http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            method = scope["method"] if scope["method"] in _METHODS else OVERFLOW_LABEL
+            HTTP_REQUEST_SECONDS.labels(method, route_label(scope), f"{status // 100}xx").observe(
+                time.perf_counter() - start
+            )
+
+
+def create_router() -> APIRouter:
+    router = APIRouter()
+
+    @router.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+    return router
@@ -0,0 +1,130 @@
+"""Pure ASGI middleware for the FastAPI app behind NiceGUI.
+
+These wrap the ASGI `send` callable instead of subclassing Starlette's `BaseHTTPMiddleware`,
+which would run every response (static assets included) through an extra task and a
+streaming body copy.
+"""
+
+from dataclasses import dataclass, field
+from typing import Mapping, Sequence
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+RawHeaders = list[tuple[bytes, bytes]]
+
+# Responses that a browser renders as a document, where a Content-Security-Policy has an effect.
+DOCUMENT_CONTENT_TYPES = (b"text/html", b"image/svg+xml")
+
+CONTENT_SECURITY_POLICY = (
+    "default-src 'self' http: https: data: blob: 'unsafe-inline'; "
+    "frame-ancestors 'self' https://app.build/ https://www.app.build/ https://staging.app.build/"
+)
+
+
+@dataclass(frozen=True)
+class HeaderRule:
+    """Headers added to every response whose path starts with `prefix`.
+
+    Rules are cumulative: a request matching `/health` also gets the headers of the `/` rule,
+    with the more specific rule winning on conflicts. `document_headers` are only added to
+    HTML (and SVG) responses.
+    """
+
+    prefix: str
+    headers: Mapping[str, str] = field(default_factory=dict)
+    document_headers: Mapping[str, str] = field(default_factory=dict)
+
+
+DEFAULT_HEADER_RULES = (
+    HeaderRule(
+        "/",
+        headers={
+            "X-XSS-Protection": "1; mode=block",
+            "X-Content-Type-Options": "nosniff",
+            "Referrer-Policy": "strict-origin-when-cross-origin",
+        },
+        document_headers={"Content-Security-Policy": CONTENT_SECURITY_POLICY},
+    ),
+    HeaderRule("/health", headers={"Cache-Control": "no-store"}),
+)
+
+
+def _encode(headers: Mapping[str, str]) -> RawHeaders:
+    return [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+
+
+@dataclass(frozen=True)
+class _CompiledRule:
+    prefix: str
+    headers: RawHeaders
+    document_headers: RawHeaders
+    names: frozenset[bytes]
+    document_names: frozenset[bytes]
+
+
+def _compile(rules: Sequence[HeaderRule]) -> list[_CompiledRule]:
+    compiled = []
+    for rule in rules:
+        headers: dict[str, str] = {}
+        document_headers: dict[str, str] = {}
+        for parent in sorted(rules, key=lambda r: len(r.prefix)):
+            if rule.prefix.startswith(parent.prefix):
+                headers.update({name.lower(): value for name, value in parent.headers.items()})
+                document_headers.update({name.lower(): value for name, value in parent.document_headers.items()})
+        encoded = _encode(headers)
+        encoded_document = encoded + _encode({k: v for k, v in document_headers.items() if k not in headers})
+        compiled.append(
+            _CompiledRule(
+                prefix=rule.prefix,
+                headers=encoded,
+                document_headers=encoded_document,
+                names=frozenset(name for name, _ in encoded),
+                document_names=frozenset(name for name, _ in encoded_document),
+            )
+        )
+    # most specific prefix first
+    return sorted(compiled, key=lambda r: len(r.prefix), reverse=True)
+
+
+class SecurityHeadersMiddleware:
+    """Adds precomputed headers to `http.response.start` messages, configurable per path prefix."""
+
+    def __init__(self, app: ASGIApp, rules: Sequence[HeaderRule] = DEFAULT_HEADER_RULES) -> None:
+        self.app = app
+        self.rules = _compile(rules)
+
+    def _match(self, path: str) -> _CompiledRule | None:
+        for rule in self.rules:
+            if path.startswith(rule.prefix):
+                return rule
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rule = self._match(scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                raw = message.get("headers")
+                headers: RawHeaders = raw if isinstance(raw, list) else list(raw or ())
+                message["headers"] = headers
+                is_document = False
+                for name, value in headers:
+                    if name == b"content-type":
+                        is_document = value.startswith(DOCUMENT_CONTENT_TYPES)
+                        break
+                names, extra = (
+                    (rule.document_names, rule.document_headers) if is_document else (rule.names, rule.headers)
+                )
+                if any(name in names for name, _ in headers):
+                    # the configured value replaces whatever the endpoint set
+                    headers[:] = [header for header in headers if header[0] not in names]
+                headers.extend(extra)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
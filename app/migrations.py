@@ -0,0 +1,216 @@
+"""Versioned schema migrations, applied by a one-shot command before the app starts.
+
+Each migration runs once and is recorded in `schema_version`. Migrations are append-only: never
+edit one that has shipped, add a new one instead. Their SQL is written out rather than derived
+from the models, so a migration keeps doing what it did when it was written.
+
+The app itself only checks that the database is at `LATEST_VERSION` (see `check_schema`), which
+is a single query on boot.
+
+A session-level advisory lock makes concurrent runs (several replicas started with the same
+command) wait for each other, so run this against Postgres directly, not through PgBouncer in
+transaction mode. Index migrations run outside a transaction to build CONCURRENTLY; every step
+is idempotent, so a run interrupted between a step and its `schema_version` row is safe to repeat.
+
+Usage:
+
+    uv run python -m app.migrations
+    uv run python -m app.migrations --check
+"""
+
+import argparse
+import logging
+import sys
+import time
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+from typing import Callable
+
+from sqlalchemy import Connection, Engine, text
+
+from app.inquiry_storage import (
+    INQUIRY_TABLE,
+    PARTITIONING,
+    create_index,
+    ensure_partitions,
+    is_partitioned,
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION_TABLE = "schema_version"
+# Postgres advisory lock key held while migrations run
+MIGRATION_LOCK_KEY = 0x6E696365_67756901
+
+_INQUIRY_COLUMNS = """
+    id SERIAL NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    company VARCHAR(200) NOT NULL,
+    message VARCHAR(2000) NOT NULL,
+    created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL"""
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema does not match the version this code needs."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """`apply` gets a connection inside a transaction, or the engine when `transactional` is False."""
+
+    version: int
+    name: str
+    apply: Callable[..., None]
+    transactional: bool = True
+
+
+def _create_contact_inquiries(conn: Connection, partitioning: str) -> None:
+    # databases created before migrations existed already have the table, which is kept as it is
+    exists = conn.execute(text("SELECT to_regclass(:table)"), {"table": INQUIRY_TABLE.name}).scalar() is not None
+    match partitioning:
+        case "monthly":
+            if not exists:
+                conn.execute(
+                    text(
+                        f"CREATE TABLE {INQUIRY_TABLE.name} ({_INQUIRY_COLUMNS},\n    PRIMARY KEY (id, created_at)\n)"
+                        " PARTITION BY RANGE (created_at)"
+                    )
+                )
+            elif not is_partitioned(conn):
+                logger.warning(f"{INQUIRY_TABLE.name} exists and is not partitioned, keeping it as is")
+        case "none":
+            conn.execute(
+                text(f"CREATE TABLE IF NOT EXISTS {INQUIRY_TABLE.name} ({_INQUIRY_COLUMNS},\n    PRIMARY KEY (id)\n)")
+            )
+        case _:
+            raise ValueError(f"Unknown APP_INQUIRY_PARTITIONING value {partitioning!r}, expected none or monthly")
+
+
+def _index_created_at_and_email(engine: Engine) -> None:
+    create_index(engine, "ix_contact_inquiries_created_at", ["created_at"])
+    # (email, created_at) also serves lookups by email alone
+    create_index(engine, "ix_contact_inquiries_email_created_at", ["email", "created_at"])
+
+
+def _add_dedup_key(conn: Connection) -> None:
+    for table in (INQUIRY_TABLE.name, "contact_inquiries_archive"):
+        conn.execute(text(f"ALTER TABLE IF EXISTS {table} ADD COLUMN IF NOT EXISTS dedup_key VARCHAR(64)"))
+
+
+def _index_dedup_key(engine: Engine) -> None:
+    create_index(engine, "ux_contact_inquiries_dedup_key", ["dedup_key"], unique=True)
+
+
+def migrations(partitioning: str = PARTITIONING) -> tuple[Migration, ...]:
+    return (
+        Migration(1, "create contact_inquiries", lambda conn: _create_contact_inquiries(conn, partitioning)),
+        Migration(
+            2, "index contact_inquiries by created_at and email", _index_created_at_and_email, transactional=False
+        ),
+        Migration(3, "add contact_inquiries.dedup_key", _add_dedup_key),
+        Migration(4, "unique index on contact_inquiries.dedup_key", _index_dedup_key, transactional=False),
+    )
+
+
+LATEST_VERSION = migrations()[-1].version
+
+
+def _ensure_version_table(conn: Connection) -> None:
+    conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+            "version INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, "
+            "applied_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'))"
+        )
+    )
+
+
+def current_version(conn: Connection) -> int:
+    """Highest applied migration, 0 for a database that was never migrated."""
+    if conn.execute(text("SELECT to_regclass(:table)"), {"table": SCHEMA_VERSION_TABLE}).scalar() is None:
+        return 0
+    return conn.execute(text(f"SELECT coalesce(max(version), 0) FROM {SCHEMA_VERSION_TABLE}")).scalar_one()
+
+
+def _record(conn: Connection, migration: Migration) -> None:
+    conn.execute(
+        text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, name) VALUES (:version, :name)"),
+        {"version": migration.version, "name": migration.name},
+    )
+
+
+def _acquire(lock: Connection, poll_interval: float = 0.2) -> None:
+    # Poll instead of blocking in pg_advisory_lock: a waiting statement holds a snapshot, and
+    # CREATE INDEX CONCURRENTLY in the run holding the lock would wait for it, a deadlock.
+    if lock.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}).scalar():
+        return
+    logger.info("Waiting for another migration run to finish")
+    while not lock.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}).scalar():
+        time.sleep(poll_interval)
+
+
+def migrate(engine: Engine, partitioning: str = PARTITIONING, today: date | None = None) -> list[int]:
+    """Apply pending migrations and create upcoming monthly partitions; return the applied versions."""
+    applied = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock:
+        _acquire(lock)
+        try:
+            _ensure_version_table(lock)
+            version = current_version(lock)
+            for migration in migrations(partitioning):
+                if migration.version <= version:
+                    continue
+                logger.info(f"Applying migration {migration.version}: {migration.name}")
+                if migration.transactional:
+                    with engine.begin() as conn:
+                        migration.apply(conn)
+                        _record(conn, migration)
+                else:
+                    migration.apply(engine)
+                    with engine.begin() as conn:
+                        _record(conn, migration)
+                applied.append(migration.version)
+            with engine.begin() as conn:
+                if is_partitioned(conn):
+                    ensure_partitions(conn, today or datetime.utcnow().date())
+        finally:
+            lock.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    if applied:
+        logger.info(f"Database schema migrated to version {applied[-1]}")
+    return applied
+
+
+def check_schema(engine: Engine) -> int:
+    """Raise `SchemaVersionError` unless the database has every migration this code needs."""
+    with engine.connect() as conn:
+        version = current_version(conn)
+    if version < LATEST_VERSION:
+        raise SchemaVersionError(
+            f"Database schema is at version {version}, this code needs {LATEST_VERSION}: "
+            "run `python -m app.migrations` first"
+        )
+    if version > LATEST_VERSION:
+        # a newer release is rolling out; migrations are additive, so older code keeps working
+        logger.warning(f"Database schema is at version {version}, newer than this code ({LATEST_VERSION})")
+    return version
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description=(__doc__ or "").partition("\n")[0])
+    parser.add_argument("--check", action="store_true", help="only check the schema version, exit 1 if behind")
+    args = parser.parse_args()
+
+    from app.database import DATABASE_URL, ENGINE_SETTINGS, create_db_engine
+
+    # DDL on a large table may run longer than the application's statement_timeout
+    engine = create_db_engine(DATABASE_URL, replace(ENGINE_SETTINGS, statement_timeout_ms=0))
+    if args.check:
+        try:
+            logger.info(f"Database schema is at version {check_schema(engine)}")
+        except SchemaVersionError as e:
+            logger.error(str(e))
+            sys.exit(1)
+    else:
+        migrate(engine)
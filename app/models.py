@@ -1,21 +1,32 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 from datetime import datetime
 from typing import Optional
 
+# checked once, precompiled, by app.validation; table models do not validate on construction
+EMAIL_REGEX = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
+
 
 class ContactInquiry(SQLModel, table=True):
     """Model for storing contact inquiries from potential investors and partners."""
 
     __tablename__ = "contact_inquiries"  # type: ignore[assignment]
+    # (email, created_at) also serves lookups by email alone, so email gets no separate index
+    __table_args__ = (
+        Index("ix_contact_inquiries_created_at", "created_at"),
+        Index("ix_contact_inquiries_email_created_at", "email", "created_at"),
+        Index("ux_contact_inquiries_dedup_key", "dedup_key", unique=True),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(max_length=100, description="Name of the person making the inquiry")
-    email: str = Field(
-        max_length=255, regex=r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$", description="Email address"
-    )
+    email: str = Field(max_length=255, regex=EMAIL_REGEX, description="Email address")
     company: str = Field(max_length=200, description="Company or organization name")
     message: str = Field(max_length=2000, description="Inquiry message or details")
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Timestamp when inquiry was submitted")
+    dedup_key: Optional[str] = Field(
+        default=None, max_length=64, description="Submission fingerprint and time bucket, see app.dedup"
+    )
 
 
 class ContactInquiryCreate(SQLModel, table=False):
@@ -0,0 +1,157 @@
+"""Result cache for warehouse queries: per-entry TTL, memory-bounded LRU and single-flight loading."""
+
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Mapping
+
+CacheKey = tuple[str, tuple[tuple[str, str], ...]]
+
+# quotes end a literal unless doubled or backslash-escaped, as Databricks SQL allows both
+_STRING_LITERAL_COMMENT_OR_SPACE = re.compile(
+    r"('(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"|`[^`]*`)|(?:\s|--[^\n]*|/\*.*?\*/)+", re.DOTALL
+)
+
+
+def normalize_sql(sql: str) -> str:
+    """Drop comments, collapse whitespace outside quoted literals and drop a trailing semicolon.
+
+    Queries that differ only in formatting then share one cache entry. Comments go before the
+    whitespace is collapsed: a `--` comment would otherwise swallow the lines that follow it.
+    """
+    normalized = _STRING_LITERAL_COMMENT_OR_SPACE.sub(lambda m: m.group(1) or " ", sql).strip()
+    return normalized.removesuffix(";").rstrip()
+
+
+def cache_key(sql: str, params: Mapping[str, Any] | None = None) -> CacheKey:
+    return normalize_sql(sql), tuple(sorted((name, repr(value)) for name, value in (params or {}).items()))
+
+
+def estimate_size(rows: list[dict[str, Any]]) -> int:
+    """Approximate retained bytes of a list of row dicts (keys are shared column names)."""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for value in row.values():
+            size += sys.getsizeof(value)
+    return size
+
+
+@dataclass
+class _Entry:
+    rows: list[dict[str, Any]]
+    size: int
+    expires_at: float
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.rows: list[dict[str, Any]] | None = None
+        self.error: BaseException | None = None
+
+
+class QueryResultCache:
+    """LRU of query results bounded by approximate memory use.
+
+    Concurrent misses for the same key are de-duplicated: one caller runs the query, the others
+    wait for its result. Cached rows are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._flights: dict[Hashable, _Flight] = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_or_load(self, key: Hashable, load: Callable[[], list[dict[str, Any]]], ttl: float) -> list[dict[str, Any]]:
+        """Return cached rows for `key`, or run `load()` once and cache its rows for `ttl` seconds."""
+        if ttl <= 0:
+            return load()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return list(entry.rows)
+                self._remove(key)
+                self.expirations += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            assert flight.rows is not None
+            return list(flight.rows)
+
+        try:
+            rows = load()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            flight.rows = rows
+            self._store(key, rows, ttl)
+            return list(rows)
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Drop one entry, or everything when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self.size = 0
+            elif key in self._entries:
+                self._remove(key)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _store(self, key: Hashable, rows: list[dict[str, Any]], ttl: float) -> None:
+        size = estimate_size(rows)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(rows=rows, size=size, expires_at=self._clock() + ttl)
+            self.size += size
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        self.size -= self._entries.pop(key).size
@@ -0,0 +1,274 @@
+"""Token-bucket rate limiting for HTTP routes, websocket sessions and the contact form.
+
+`RateLimitMiddleware` throttles requests per client IP with limits configured per path prefix
+and answers `429 Too Many Requests` with `Retry-After`. The contact form additionally checks
+per-session and per-IP buckets before it queues an inquiry.
+
+Buckets live in a backend. `InMemoryBackend` keeps them in the worker process in an LRU of
+bounded size, so idle clients are forgotten first; with several workers each enforces its own
+limits. `RedisBackend` shares buckets between workers and is used when `RATE_LIMIT_REDIS_URL`
+is set (requires the `redis` package).
+"""
+
+import math
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any, Callable, Protocol, Sequence
+from urllib.parse import parse_qs
+
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = getLogger(__name__)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """`burst` requests at once, refilled at `rate` requests per second."""
+
+    rate: float
+    burst: int
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0 or self.burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parse `"<count>/<second|minute|hour|day>"`, e.g. `"5/minute"` (a burst of 5, one every 12s)."""
+        count, _, period = value.strip().partition("/")
+        try:
+            seconds = _PERIODS[period.strip().lower().rstrip("s")]
+            return cls(rate=int(count) / seconds, burst=int(count))
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"Invalid rate limit {value!r}, expected e.g. '5/minute'") from e
+
+
+class RateLimitBackend(Protocol):
+    async def acquire(self, key: str, limit: RateLimit, cost: float = 1.0) -> float:
+        """Take `cost` tokens from the bucket `key`; return 0 if allowed, else seconds until it would be.
+
+        A negative `cost` gives tokens back, up to `limit.burst`, and always returns 0.
+        """
+        ...
+
+
+class InMemoryBackend:
+    """Buckets in an `OrderedDict` used as LRU; every operation is O(1).
+
+    Nothing awaits between reading and updating a bucket, so no lock is needed on the event loop.
+    """
+
+    def __init__(self, max_buckets: int = 100_000, clock: Callable[[], float] = time.monotonic) -> None:
+        if max_buckets < 1:
+            raise ValueError("max_buckets must be at least 1")
+        self.max_buckets = max_buckets
+        self._clock = clock
+        # key -> [tokens, last refill time]
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self.limited = 0
+        self.evictions = 0
+
+    async def acquire(self, key: str, limit: RateLimit, cost: float = 1.0) -> float:
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(limit.burst), now]
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(float(limit.burst), bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+        if bucket[0] >= cost:
+            bucket[0] = min(float(limit.burst), bucket[0] - cost)
+            return 0.0
+        self.limited += 1
+        return (cost - bucket[0]) / limit.rate
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "buckets": len(self._buckets),
+            "max_buckets": self.max_buckets,
+            "limited": self.limited,
+            "evictions": self.evictions,
+        }
+
+
+# KEYS[1] bucket; ARGV rate, burst, cost. Redis' own clock keeps workers consistent, and the
+# bucket expires once it would be full again, which bounds memory like the in-process LRU.
+_TOKEN_BUCKET_SCRIPT = """
+local rate, burst, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'at')
+local tokens = tonumber(state[1]) or burst
+if state[2] then tokens = math.min(burst, tokens + (now - tonumber(state[2])) * rate) end
+local wait = 0
+if tokens >= cost then tokens = math.min(burst, tokens - cost) else wait = (cost - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'at', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisBackend:
+    """Buckets shared by all workers, updated atomically by a Lua script."""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:") -> None:
+        try:
+            import redis.asyncio  # pyright: ignore[reportMissingImports]
+        except ImportError as e:
+            raise ImportError("RATE_LIMIT_REDIS_URL requires the 'redis' package") from e
+        self.prefix = prefix
+        self._redis = redis.asyncio.Redis.from_url(url)
+        self._script = self._redis.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str, limit: RateLimit, cost: float = 1.0) -> float:
+        try:
+            wait = await self._script(keys=[self.prefix + key], args=[limit.rate, limit.burst, cost])
+        except Exception as e:
+            # fail open: an unreachable Redis must not take the site down with it
+            logger.warning(f"Rate limit backend unavailable, allowing request: {e}")
+            return 0.0
+        return float(wait)
+
+
+def backend_from_env() -> RateLimitBackend:
+    url = os.environ.get("RATE_LIMIT_REDIS_URL")
+    if url:
+        return RedisBackend(url)
+    return InMemoryBackend(max_buckets=int(os.environ.get("RATE_LIMIT_MAX_BUCKETS", "100000")))
+
+
+@dataclass(frozen=True)
+class RouteLimit:
+    """Limit for requests whose path starts with `prefix`; the most specific prefix applies.
+
+    `limit=None` exempts the prefix. With `new_sessions_only`, requests that carry a Socket.IO
+    `sid` belong to an already open session and are not counted.
+    """
+
+    prefix: str
+    limit: RateLimit | None
+    new_sessions_only: bool = False
+
+
+def _env_bool(value: str) -> bool:
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _limit_from_env(name: str, default: str) -> RateLimit:
+    return RateLimit.parse(os.environ.get(name, default))
+
+
+def default_route_limits() -> tuple[RouteLimit, ...]:
+    return (
+        RouteLimit("/", _limit_from_env("RATE_LIMIT_PAGES", "60/minute")),
+        RouteLimit("/_nicegui_ws", _limit_from_env("RATE_LIMIT_SESSIONS", "30/minute"), new_sessions_only=True),
+        RouteLimit("/api", _limit_from_env("RATE_LIMIT_API", "600/minute")),
+        # JS/CSS of NiceGUI itself and our static assets, requested with every page load that is already counted
+        RouteLimit("/_nicegui", None),
+        RouteLimit("/assets", None),
+        RouteLimit("/health", None),
+        RouteLimit("/metrics", None),
+    )
+
+
+FORM_SESSION_LIMIT = _limit_from_env("RATE_LIMIT_FORM_SESSION", "3/minute")
+FORM_IP_LIMIT = _limit_from_env("RATE_LIMIT_FORM_IP", "20/hour")
+RATE_LIMIT_ENABLED = _env_bool(os.environ.get("RATE_LIMIT_ENABLED", "true"))
+TRUST_FORWARDED = _env_bool(os.environ.get("RATE_LIMIT_TRUST_FORWARDED", "false"))
+
+
+def client_ip(scope: Scope, trust_forwarded: bool = TRUST_FORWARDED) -> str:
+    """Client address of the connection, or the one the reverse proxy appended to X-Forwarded-For."""
+    if trust_forwarded:
+        for name, value in scope.get("headers", ()):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").rsplit(",", 1)[-1].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def retry_after(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware applying `RouteLimit`s per client IP to HTTP and websocket requests."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: RateLimitBackend | None = None,
+        rules: Sequence[RouteLimit] | None = None,
+        trust_forwarded: bool = TRUST_FORWARDED,
+    ) -> None:
+        self.app = app
+        self.backend = backend if backend is not None else rate_limiter
+        self.rules = sorted(rules if rules is not None else default_route_limits(), key=lambda r: -len(r.prefix))
+        self.trust_forwarded = trust_forwarded
+
+    def _match(self, path: str) -> RouteLimit | None:
+        for rule in self.rules:
+            if path.startswith(rule.prefix):
+                return rule
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        rule = self._match(scope["path"])
+        if rule is None or rule.limit is None or (rule.new_sessions_only and _has_sid(scope)):
+            await self.app(scope, receive, send)
+            return
+        wait = await self.backend.acquire(f"{rule.prefix}:{client_ip(scope, self.trust_forwarded)}", rule.limit)
+        if wait <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {"Retry-After": retry_after(wait)}
+        if scope["type"] == "http":
+            await PlainTextResponse("Too Many Requests", status_code=429, headers=headers)(scope, receive, send)
+        elif "websocket.http.response" in scope.get("extensions", {}):
+            await send({"type": "websocket.http.response.start", "status": 429, "headers": _raw(headers)})
+            await send({"type": "websocket.http.response.body", "body": b"Too Many Requests"})
+        else:
+            # closing before accepting rejects the handshake with 403
+            await send({"type": "websocket.close", "code": 1008})
+
+
+def _has_sid(scope: Scope) -> bool:
+    return "sid" in parse_qs(scope.get("query_string", b"").decode("latin-1"))
+
+
+def _raw(headers: dict[str, Any]) -> list[tuple[bytes, bytes]]:
+    return [(name.lower().encode("latin-1"), str(value).encode("latin-1")) for name, value in headers.items()]
+
+
+rate_limiter = backend_from_env()
+
+
+async def form_submission_wait(session_id: str, ip: str, backend: RateLimitBackend | None = None) -> float:
+    """Seconds until the contact form accepts another submission from this session and IP, 0 if it does now.
+
+    `session_id` should outlive page reloads (the browser session, not the NiceGUI client). A
+    submission refused by the IP limit gives its session token back: it was never accepted.
+    """
+    backend = backend if backend is not None else rate_limiter
+    session_key = f"form-session:{session_id}"
+    wait = await backend.acquire(session_key, FORM_SESSION_LIMIT)
+    if wait > 0:
+        return wait
+    wait = await backend.acquire(f"form-ip:{ip}", FORM_IP_LIMIT)
+    if wait > 0:
+        await backend.acquire(session_key, FORM_SESSION_LIMIT, cost=-1.0)
+    return wait
@@ -0,0 +1,125 @@
+"""Retention job for contact inquiries: archive or delete old rows without long locks.
+
+Rows are moved in small batches, each in its own short transaction, so concurrent inserts and
+reads never wait long. With monthly partitioning, partitions that lie entirely before the cutoff
+are detached (archive) or dropped (delete) as a whole instead, which touches no rows at all.
+
+Usage:
+
+    uv run python -m app.retention --older-than-days 365
+    uv run python -m app.retention --older-than-days 365 --delete
+"""
+
+import argparse
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy import Engine, delete, insert, select, text
+
+from app.database import ENGINE
+from app.inquiry_storage import (
+    ARCHIVE_TABLE,
+    INQUIRY_TABLE,
+    add_months,
+    ensure_partitions,
+    is_partitioned,
+    partition_month,
+    partitions,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetentionResult:
+    rows: int = 0
+    batches: int = 0
+    partitions: list[str] = field(default_factory=list)
+
+
+def _retire_partitions(engine: Engine, cutoff: datetime, archive: bool) -> list[str]:
+    """Detach or drop monthly partitions whose whole range is older than `cutoff`.
+
+    A detached partition stays as a standalone table under its own name, which is the archive.
+    """
+    retired = []
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            return retired
+        ensure_partitions(conn, datetime.utcnow().date())
+        for name in partitions(conn):
+            month = partition_month(name)
+            if month is None or datetime.combine(add_months(month, 1), datetime.min.time()) > cutoff:
+                continue
+            if archive:
+                conn.execute(text(f"ALTER TABLE {INQUIRY_TABLE.name} DETACH PARTITION {name}"))
+            else:
+                conn.execute(text(f"DROP TABLE {name}"))
+            retired.append(name)
+    return retired
+
+
+def _move_batch(engine: Engine, cutoff: datetime, archive: bool, batch_size: int) -> int:
+    inquiry = INQUIRY_TABLE.c
+    batch = (
+        select(inquiry.id, inquiry.created_at)
+        .where(inquiry.created_at < cutoff)
+        .order_by(inquiry.created_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .cte("batch")
+    )
+    removed = delete(INQUIRY_TABLE).where(inquiry.id == batch.c.id, inquiry.created_at == batch.c.created_at)
+    with engine.begin() as conn:
+        if not archive:
+            return conn.execute(removed).rowcount
+        moved = removed.returning(*INQUIRY_TABLE.columns).cte("moved")
+        columns = [column.name for column in ARCHIVE_TABLE.columns]
+        statement = insert(ARCHIVE_TABLE).from_select(columns, select(*(moved.c[name] for name in columns)))
+        return conn.execute(statement).rowcount
+
+
+def expire_inquiries(
+    engine: Engine, older_than: timedelta, archive: bool = True, batch_size: int = 1000, pause: float = 0.0
+) -> RetentionResult:
+    """Archive (into contact_inquiries_archive) or delete inquiries created more than `older_than` ago.
+
+    `pause` seconds are slept between batches to leave I/O headroom for the live application.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    cutoff = datetime.utcnow() - older_than
+    result = RetentionResult(partitions=_retire_partitions(engine, cutoff, archive))
+    if archive:
+        ARCHIVE_TABLE.create(engine, checkfirst=True)
+
+    while True:
+        moved = _move_batch(engine, cutoff, archive, batch_size)
+        result.rows += moved
+        result.batches += 1
+        if moved < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+
+    action = "Archived" if archive else "Deleted"
+    logger.info(
+        f"{action} {result.rows} inquiries older than {cutoff.isoformat()} in {result.batches} batches"
+        + (f", partitions {', '.join(result.partitions)}" if result.partitions else "")
+    )
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description=(__doc__ or "").partition("\n")[0])
+    parser.add_argument("--older-than-days", type=int, required=True, help="age in days of rows to remove")
+    parser.add_argument("--delete", action="store_true", help="delete rows instead of archiving them")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per transaction")
+    parser.add_argument("--pause", type=float, default=0.05, help="seconds to sleep between batches")
+    args = parser.parse_args()
+    expire_inquiries(
+        ENGINE, timedelta(days=args.older_than_days), not args.delete, batch_size=args.batch_size, pause=args.pause
+    )
@@ -1,8 +1,86 @@
-from app.database import create_tables
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from app.database import create_tables, dispose_async_engine, get_engine, warm_up_pools
+from app.inquiry_buffer import inquiry_buffer
+from app.migrations import check_schema
+import app.assets
+import app.inquiry_api
 import app.landing
 
+logger = logging.getLogger(__name__)
+
+# local development only: deployments run `python -m app.migrations` once before starting replicas
+MIGRATE_ON_STARTUP = os.environ.get("APP_MIGRATE_ON_STARTUP", "false").strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass
+class StartupReport:
+    """Durations of the startup phases, and whether the app is ready to take traffic."""
+
+    phases: dict[str, float] = field(default_factory=dict)
+    ready: bool = False
+    error: str | None = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.error = f"{name}: {e}"
+            raise
+        finally:
+            self.phases[name] = time.perf_counter() - start
+
+    def summary(self) -> str:
+        phases = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items())
+        return f"Startup took {sum(self.phases.values()) * 1000:.0f} ms ({phases})"
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "failed" if self.error else "starting",
+            "error": self.error,
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+        }
+
+
+startup_report = StartupReport()
+
 
 def startup() -> None:
     # this function is called before the first request
-    create_tables()
-    app.landing.create()
+    with startup_report.phase("schema"):
+        if MIGRATE_ON_STARTUP:
+            create_tables()
+        else:
+            check_schema(get_engine())
+    with startup_report.phase("pages"):
+        app.assets.create()
+        app.landing.create()
+        app.inquiry_api.create()
+
+
+async def warm_up() -> None:
+    """Fill the connection pools, then report ready; runs in the background after `startup`."""
+    if startup_report.error is not None:
+        logger.error(f"Not ready, startup failed in {startup_report.error}")
+        return
+    try:
+        with startup_report.phase("pool_warm_up"):
+            await warm_up_pools()
+    except Exception as e:
+        logger.error(f"Not ready, connection pool warm-up failed: {e}")
+        return
+    startup_report.ready = True
+    logger.info(startup_report.summary())
+
+
+async def shutdown() -> None:
+    # write out queued contact inquiries before the process exits
+    await inquiry_buffer.drain()
+    await dispose_async_engine()
@@ -0,0 +1,307 @@
+"""OpenTelemetry-style tracing with in-process exporters, so traces can be read offline and in tests.
+
+A span records a named piece of work with its start and end time, attributes and parent. The
+current span lives in a context variable, so child spans nest across `await`, `asyncio.to_thread`
+and SQLAlchemy's greenlets without being passed around. HTTP requests continue a W3C
+`traceparent` header when present.
+
+NiceGUI event handlers run in the websocket's context, not the page request's: a page keeps
+`current_context()` from its build and passes it as `parent` to its handlers, which puts the form
+submission into the same trace as the page load.
+
+Nothing is recorded unless `TRACING_EXPORTER` is set:
+
+- `memory` keeps the last `TRACING_MEMORY_SPANS` finished spans (see `InMemoryExporter`)
+- `file` appends one JSON object per finished span to `TRACING_FILE`
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Protocol, Sequence, TypeVar
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import route_label
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_TRACEPARENT = re.compile(r"00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}")
+# NiceGUI's own static files and socket.io transport, and probes: high volume, nothing to learn
+UNTRACED_PREFIXES = ("/_nicegui", "/health", "/metrics")
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @classmethod
+    def from_traceparent(cls, header: str | None) -> "SpanContext | None":
+        found = _TRACEPARENT.fullmatch(header.strip().lower()) if header else None
+        if found is None or found.group(1) == "0" * 32 or found.group(2) == "0" * 16:
+            return None
+        return cls(found.group(1), found.group(2))
+
+
+@dataclass
+class Span:
+    name: str
+    context: SpanContext
+    parent_id: str | None = None
+    kind: str = "internal"
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    status: str = "OK"
+    attributes: dict[str, Any] = field(default_factory=dict)
+    links: list[SpanContext] = field(default_factory=list)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+            "links": [{"trace_id": link.trace_id, "span_id": link.span_id} for link in self.links],
+        }
+
+
+class _NonRecordingSpan(Span):
+    """Handed out while tracing is off, so callers can set attributes without checking."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NON_RECORDING = _NonRecordingSpan("", SpanContext("0" * 32, "0" * 16))
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+class InMemoryExporter:
+    """Keeps the most recent finished spans, oldest first."""
+
+    def __init__(self, max_spans: int = 10_000) -> None:
+        self._spans: deque[Span] = deque(maxlen=max_spans)
+
+    def export(self, span: Span) -> None:
+        self._spans.append(span)
+
+    @property
+    def spans(self) -> list[Span]:
+        return list(self._spans)
+
+    def trace(self, trace_id: str) -> list[Span]:
+        return [span for span in self._spans if span.context.trace_id == trace_id]
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+
+class FileExporter:
+    """Appends finished spans as JSON lines; read them with `jq` or load them into any trace viewer."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.as_dict(), default=str) + "\n"
+        try:
+            with self._lock, self.path.open("a", encoding="utf-8") as file:
+                file.write(line)
+        except OSError as e:
+            # a full disk must not fail the request that produced the span
+            logger.warning(f"Could not write span {span.name} to {self.path}: {e}")
+
+
+_current: ContextVar[SpanContext | None] = ContextVar("current_span", default=None)
+
+
+def current_context() -> SpanContext | None:
+    """Context of the span running in this task or thread, to continue the trace elsewhere."""
+    return _current.get()
+
+
+class Tracer:
+    def __init__(self, exporter: SpanExporter | None = None) -> None:
+        self.exporter = exporter
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        match os.environ.get("TRACING_EXPORTER", "off").strip().lower():
+            case "off" | "":
+                return cls()
+            case "memory":
+                return cls(InMemoryExporter(int(os.environ.get("TRACING_MEMORY_SPANS", "10000"))))
+            case "file":
+                return cls(FileExporter(Path(os.environ.get("TRACING_FILE", "traces.jsonl"))))
+            case other:
+                raise ValueError(f"Unknown TRACING_EXPORTER value {other!r}, expected off, memory or file")
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def start_span(
+        self,
+        name: str,
+        parent: SpanContext | None = None,
+        kind: str = "internal",
+        attributes: dict[str, Any] | None = None,
+        links: Sequence[SpanContext] = (),
+    ) -> Span:
+        """Start a span without making it current; finish it with `end()`."""
+        if self.exporter is None:
+            return _NON_RECORDING
+        parent = parent or _current.get()
+        trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        return Span(
+            name,
+            SpanContext(trace_id, f"{random.getrandbits(64):016x}"),
+            parent_id=parent.span_id if parent is not None else None,
+            kind=kind,
+            attributes=dict(attributes or {}),
+            links=list(links),
+        )
+
+    def end(self, span: Span, error: BaseException | None = None) -> None:
+        if self.exporter is None or span is _NON_RECORDING:
+            return
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.status = "ERROR"
+            span.attributes["exception"] = f"{type(error).__name__}: {error}"
+        self.exporter.export(span)
+
+    def span(
+        self,
+        name: str,
+        parent: SpanContext | None = None,
+        kind: str = "internal",
+        attributes: dict[str, Any] | None = None,
+        links: Sequence[SpanContext] = (),
+    ) -> AbstractContextManager[Span]:
+        """Run the block as the current span, a child of `parent` or else of the current span."""
+        if self.exporter is None:
+            # no generator-based context manager while off: this sits on every request and query
+            return nullcontext(_NON_RECORDING)
+        return self._recording_span(name, parent, kind, attributes, links)
+
+    @contextmanager
+    def _recording_span(
+        self,
+        name: str,
+        parent: SpanContext | None,
+        kind: str,
+        attributes: dict[str, Any] | None,
+        links: Sequence[SpanContext],
+    ) -> Iterator[Span]:
+        span = self.start_span(name, parent, kind, attributes, links)
+        token = _current.set(span.context)
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current.reset(token)
+            self.end(span, error)
+
+
+tracer = Tracer.from_env()
+
+
+def set_exporter(exporter: SpanExporter | None) -> None:
+    """Switch exporters at runtime (e.g. to an `InMemoryExporter` in tests); None turns tracing off."""
+    tracer.exporter = exporter
+
+
+def traced(name: str | None = None, parent: SpanContext | None = None) -> Callable[[F], F]:
+    """Run each call of the decorated function, sync or async, in a span named after it."""
+
+    def decorate(func: F) -> F:
+        span_name = name or func.__name__
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with tracer.span(span_name, parent=parent):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with tracer.span(span_name, parent=parent):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+class TracingMiddleware:
+    """Runs each HTTP request in a server span, continuing the caller's `traceparent` if sent."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracer.enabled or scope["path"].startswith(UNTRACED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+        parent = SpanContext.from_traceparent(Headers(scope=scope).get("traceparent"))
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with tracer.span(f"{scope['method']} request", parent=parent, kind="server") as span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = route_label(scope)
+                span.name = f"{scope['method']} {route}"
+                span.set_attribute("http.method", scope["method"])
+                span.set_attribute("http.route", route)
+                span.set_attribute("http.status_code", status)
+                if status >= 500:
+                    span.status = "ERROR"
@@ -0,0 +1,65 @@
+"""The one validation pass for contact inquiries, shared by the contact form, the write buffer and any API.
+
+`validate_inquiry()` normalizes raw input (whitespace stripped, email lowercased), checks it once
+against the precompiled email pattern and the column lengths of `ContactInquiry`, and returns the
+table row ready to be stored. `ContactInquiry` itself never re-checks: SQLModel table models do not
+validate on construction, so the row is built straight from the checked values instead of going
+through a `ContactInquiryCreate` and a `model_dump()` copy.
+
+`inquiry_from_create()` is the same last step for a `ContactInquiryCreate`, whose lengths pydantic
+already checked when it was built.
+"""
+
+import re
+
+from annotated_types import MaxLen
+
+from app.models import EMAIL_REGEX, ContactInquiry, ContactInquiryCreate
+
+EMAIL_PATTERN = re.compile(EMAIL_REGEX)
+
+# the labels of the contact form fields, used in the messages shown to the visitor
+FIELD_LABELS = {"name": "Nama", "email": "Email", "company": "Perusahaan", "message": "Pesan"}
+
+
+def _max_length(field: str) -> int:
+    return next(rule.max_length for rule in ContactInquiry.model_fields[field].metadata if isinstance(rule, MaxLen))
+
+
+MAX_LENGTHS = {field: _max_length(field) for field in FIELD_LABELS}
+
+
+class InvalidInquiry(ValueError):
+    """The input cannot be stored; the message is meant for the visitor who entered it."""
+
+    def __init__(self, field: str | None, message: str):
+        super().__init__(message)
+        self.field = field
+        self.message = message
+
+
+def validate_inquiry(name: str | None, email: str | None, company: str | None, message: str | None) -> ContactInquiry:
+    """Normalize and check raw form input; raises `InvalidInquiry` for the first problem found."""
+    values = {
+        "name": (name or "").strip(),
+        "email": (email or "").strip().lower(),
+        "company": (company or "").strip(),
+        "message": (message or "").strip(),
+    }
+    if not all(values.values()):
+        raise InvalidInquiry(None, "Semua field harus diisi")
+    if EMAIL_PATTERN.fullmatch(values["email"]) is None:
+        raise InvalidInquiry("email", "Format email tidak valid")
+    for field, value in values.items():
+        if len(value) > MAX_LENGTHS[field]:
+            raise InvalidInquiry(
+                field, f"{FIELD_LABELS[field]} terlalu panjang (maksimal {MAX_LENGTHS[field]} karakter)"
+            )
+    return ContactInquiry(
+        name=values["name"], email=values["email"], company=values["company"], message=values["message"]
+    )
+
+
+def inquiry_from_create(data: ContactInquiryCreate) -> ContactInquiry:
+    """The row for an already validated payload, with its email normalized."""
+    return ContactInquiry(name=data.name, email=data.email.lower(), company=data.company, message=data.message)
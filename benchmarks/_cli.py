@@ -0,0 +1,15 @@
+"""Command-line setup shared by the benchmark scripts."""
+
+import argparse
+import logging
+
+
+def benchmark_parser(doc: str | None, *quiet_loggers: str) -> argparse.ArgumentParser:
+    """Log bare messages at INFO and return a parser described by the first line of `doc`.
+
+    `quiet_loggers` are set to WARNING so their per-request lines do not bury the results.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    for name in quiet_loggers:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    return argparse.ArgumentParser(description=(doc or "").partition("\n")[0])
@@ -0,0 +1,128 @@
+"""Soak test: server RSS while thousands of visitors load the live landing page, with and without the client budget.
+
+Starts `main.py` once with the client budget in force and once with a budget too large to ever
+trigger, and sends the same stream of visitors to each. Visitors load `/` and leave without
+opening the websocket, as bouncing visitors and crawlers do, so every visit leaves a NiceGUI client
+behind that only NiceGUI's own 60 s pruning would otherwise remove. The server's resident set
+size is read from /proc (Linux only) while the visits run.
+
+The budgeted run levels off at the budget plus the clients of the last `CONNECT_GRACE_S`, which are
+never evicted; without a budget RSS grows by about 330 KiB per visitor (and Python keeps most of
+that memory even after NiceGUI prunes the clients) until the server stops answering.
+
+Usage:
+
+    uv run python -m benchmarks.bench_client_budget --visitors 10000 --budget-mb 64
+"""
+
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks._cli import benchmark_parser
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _rss_mib(pid: int) -> float:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) / 1024
+    raise RuntimeError(f"no VmRSS for process {pid}")
+
+
+def _start_server(port: int, budget_mb: float) -> subprocess.Popen:
+    env = os.environ | {
+        "NICEGUI_PORT": str(port),
+        "RATE_LIMIT_ENABLED": "false",
+        "LANDING_MODE": "live",
+        "CLIENT_BUDGET_MB": str(budget_mb),
+        "CLIENT_BUDGET_MAX_CLIENTS": "1000000",
+        "CLIENT_BUDGET_INTERVAL_S": "1",
+    }
+    return subprocess.Popen(
+        [sys.executable, "main.py"], cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+async def _wait_ready(client: httpx.AsyncClient, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError as e:
+            logger.debug(f"Server is not answering yet: {e}")
+        if time.monotonic() > deadline:
+            raise TimeoutError("server did not become ready")
+        await asyncio.sleep(0.2)
+
+
+async def soak(port: int, budget_mb: float, visitors: int, concurrency: int, samples: int) -> None:
+    server = _start_server(port, budget_mb)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=30) as client:
+            await _wait_ready(client)
+            await client.get("/")
+            baseline = _rss_mib(server.pid)
+            peak = baseline
+            done = 0
+            start = time.perf_counter()
+
+            async def visitor() -> None:
+                nonlocal done, peak
+                while done < visitors:
+                    done += 1
+                    visit = done
+                    (await client.get("/")).raise_for_status()
+                    if visit % max(visitors // samples, 1) == 0:
+                        rss = _rss_mib(server.pid)
+                        peak = max(peak, rss)
+                        clients = (await client.get("/health/clients")).json()
+                        logger.info(
+                            f"  {visit:>6} visitors  rss={rss:7.1f} MiB  clients={clients['clients']:<6} "
+                            f"estimated={clients['approx_bytes'] / 2**20:6.1f} MiB"
+                        )
+
+            try:
+                await asyncio.gather(*(visitor() for _ in range(concurrency)))
+            except httpx.TimeoutException:
+                logger.warning(
+                    f"budget={budget_mb:g} MiB: server stopped answering after {done} visitors, "
+                    f"rss={_rss_mib(server.pid):.1f} MiB"
+                )
+                return
+            elapsed = time.perf_counter() - start
+            clients = (await client.get("/health/clients")).json()
+        logger.info(
+            f"budget={budget_mb:g} MiB: {visitors / elapsed:6.1f} visits/s  rss baseline={baseline:.1f} MiB "
+            f"peak={peak:.1f} MiB (+{peak - baseline:.1f})  evictions={clients['evictions']}"
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def main(port: int, budget_mb: float, visitors: int, concurrency: int, samples: int) -> None:
+    for budget in (budget_mb, 1_000_000):
+        logger.info(f"budget={budget:g} MiB, {visitors} visitors, {concurrency} concurrent")
+        await soak(port, budget, visitors, concurrency, samples)
+
+
+if __name__ == "__main__":
+    parser = benchmark_parser(__doc__, "httpx")
+    parser.add_argument("--port", type=int, default=8200, help="port of the measured server")
+    parser.add_argument("--budget-mb", type=float, default=64, help="CLIENT_BUDGET_MB of the budgeted run")
+    parser.add_argument("--visitors", type=int, default=10_000, help="page loads per run")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent visitors")
+    parser.add_argument("--samples", type=int, default=10, help="RSS samples per run")
+    args = parser.parse_args()
+    asyncio.run(main(args.port, args.budget_mb, args.visitors, args.concurrency, args.samples))
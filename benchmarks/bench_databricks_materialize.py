@@ -0,0 +1,130 @@
+"""Time to turn a Databricks result into Python objects: per-row pydantic vs. column-wise paths.
+
+The statement execution API is replaced by an in-process service returning a pre-generated result
+in chunks, so only conversion and object construction are measured:
+
+- per-row pydantic: `execute_databricks_query()` dicts of strings, one `Model(**row)` per row
+- bulk validate: typed columns, one TypeAdapter call for the whole list
+- trusted construct: typed columns, `model_construct()` without validation
+- slotted rows: typed columns into `__slots__` row objects
+
+Usage:
+
+    uv run python -m benchmarks.bench_databricks_materialize --rows 100000
+"""
+
+import logging
+import time
+from datetime import date
+from typing import Any, Callable
+
+from databricks.sdk.service.sql import (
+    ColumnInfo,
+    ColumnInfoTypeName,
+    EndpointInfo,
+    ResultData,
+    ResultManifest,
+    ResultSchema,
+    State,
+    StatementResponse,
+    StatementState,
+    StatementStatus,
+)
+
+from app.dbrx import DatabricksModel, execute_databricks_query, execute_databricks_query_rows, set_workspace_client
+from benchmarks._cli import benchmark_parser
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    ("id", ColumnInfoTypeName.LONG),
+    ("name", ColumnInfoTypeName.STRING),
+    ("revenue", ColumnInfoTypeName.DOUBLE),
+    ("signup_date", ColumnInfoTypeName.DATE),
+    ("active", ColumnInfoTypeName.BOOLEAN),
+)
+QUERY = "SELECT id, name, revenue, signup_date, active FROM bench"
+
+
+class Customer(DatabricksModel):
+    __catalog__ = "bench"
+    __schema__ = "bench"
+    __table__ = "customers"
+
+    id: int
+    name: str
+    revenue: float
+    signup_date: date
+    active: bool
+
+
+class TrustedCustomer(Customer):
+    __trusted_schema__ = True
+
+
+class PregeneratedStatements:
+    def __init__(self, rows: int, chunk_rows: int) -> None:
+        data = [[str(n), f"customer-{n}", f"{n * 1.5:.2f}", "2024-01-01", "true"] for n in range(rows)]
+        self.chunks = [data[start : start + chunk_rows] for start in range(0, rows, chunk_rows)]
+
+    def execute_statement(self, **kwargs) -> StatementResponse:
+        return StatementResponse(
+            statement_id="bench",
+            status=StatementStatus(state=StatementState.SUCCEEDED),
+            manifest=ResultManifest(
+                schema=ResultSchema(columns=[ColumnInfo(name=name, type_name=type_name) for name, type_name in COLUMNS])
+            ),
+            result=self.get_statement_result_chunk_n("bench", 0),
+        )
+
+    def get_statement_result_chunk_n(self, statement_id: str, chunk_index: int) -> ResultData:
+        next_index = chunk_index + 1 if chunk_index + 1 < len(self.chunks) else None
+        return ResultData(chunk_index=chunk_index, data_array=self.chunks[chunk_index], next_chunk_index=next_index)
+
+
+class PregeneratedWarehouses:
+    def list(self) -> list[EndpointInfo]:
+        return [EndpointInfo(id="bench", state=State.RUNNING)]
+
+
+class PregeneratedClient:
+    def __init__(self, rows: int, chunk_rows: int) -> None:
+        self.warehouses = PregeneratedWarehouses()
+        self.statement_execution = PregeneratedStatements(rows, chunk_rows)
+
+
+def per_row_pydantic() -> list[Any]:
+    return [Customer(**row) for row in execute_databricks_query(QUERY)]
+
+
+PATHS: dict[str, Callable[[], list[Any]]] = {
+    "per-row pydantic": per_row_pydantic,
+    "bulk validate": lambda: Customer.query_models(QUERY),
+    "trusted construct": lambda: TrustedCustomer.query_models(QUERY),
+    "slotted rows": lambda: execute_databricks_query_rows(QUERY, name="CustomerRow"),
+}
+
+
+def main(rows: int, chunk_rows: int, repeat: int) -> None:
+    set_workspace_client(PregeneratedClient(rows, chunk_rows))  # type: ignore[arg-type]
+    baseline = None
+    for name, path in PATHS.items():
+        assert len(path()) == rows  # warm-up and sanity check
+        best = min(_timed(path) for _ in range(repeat))
+        baseline = baseline or best
+        logger.info(f"{name:<18} {best * 1000:8.1f} ms  {rows / best:10.0f} rows/s  {baseline / best:5.1f}x")
+
+
+def _timed(path: Callable[[], list[Any]]) -> float:
+    start = time.perf_counter()
+    path()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = benchmark_parser(__doc__, "app.dbrx")
+    parser.add_argument("--rows", type=int, default=100_000, help="rows in the result")
+    parser.add_argument("--chunk-rows", type=int, default=20_000, help="rows per result chunk")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per path, the best is reported")
+    args = parser.parse_args()
+    main(args.rows, args.chunk_rows, args.repeat)
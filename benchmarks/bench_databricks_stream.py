@@ -0,0 +1,115 @@
+"""Rows/sec and peak memory of Databricks result retrieval: list of dicts vs. streaming vs. columnar.
+
+The statement execution API is replaced by an in-process service that generates each result
+chunk on request, so the numbers cover chunk walking and row conversion only. Every mode runs in
+a fresh interpreter, which makes the reported max RSS comparable between modes.
+
+Usage:
+
+    uv run python -m benchmarks.bench_databricks_stream --rows 1000000 --chunk-rows 20000
+"""
+
+import logging
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from databricks.sdk.service.sql import (
+    ColumnInfo,
+    EndpointInfo,
+    ResultData,
+    ResultManifest,
+    ResultSchema,
+    State,
+    StatementResponse,
+    StatementState,
+    StatementStatus,
+)
+
+from app.dbrx import (
+    execute_databricks_query,
+    execute_databricks_query_columnar,
+    set_workspace_client,
+    stream_databricks_query,
+)
+from benchmarks._cli import benchmark_parser
+
+logger = logging.getLogger(__name__)
+
+MODES = ("list", "stream", "columnar")
+COLUMNS = ("id", "customer", "signup_date", "revenue")
+
+
+class GeneratedStatements:
+    def __init__(self, rows: int, chunk_rows: int) -> None:
+        self.rows = rows
+        self.chunk_rows = chunk_rows
+
+    def execute_statement(self, **kwargs) -> StatementResponse:
+        return StatementResponse(
+            statement_id="bench",
+            status=StatementStatus(state=StatementState.SUCCEEDED),
+            manifest=ResultManifest(schema=ResultSchema(columns=[ColumnInfo(name=name) for name in COLUMNS])),
+            result=self.get_statement_result_chunk_n("bench", 0),
+        )
+
+    def get_statement_result_chunk_n(self, statement_id: str, chunk_index: int) -> ResultData:
+        start = chunk_index * self.chunk_rows
+        stop = min(start + self.chunk_rows, self.rows)
+        data = [[str(n), f"customer-{n}", "2024-01-01", f"{n * 1.5:.2f}"] for n in range(start, stop)]
+        next_index = None if stop >= self.rows else chunk_index + 1
+        return ResultData(chunk_index=chunk_index, data_array=data, next_chunk_index=next_index)
+
+
+class GeneratedWarehouses:
+    def list(self) -> list[EndpointInfo]:
+        return [EndpointInfo(id="bench", state=State.RUNNING)]
+
+
+class GeneratedClient:
+    def __init__(self, rows: int, chunk_rows: int) -> None:
+        self.warehouses = GeneratedWarehouses()
+        self.statement_execution = GeneratedStatements(rows, chunk_rows)
+
+
+def run_mode(mode: str, rows: int, chunk_rows: int) -> None:
+    set_workspace_client(GeneratedClient(rows, chunk_rows))  # type: ignore[arg-type]
+    tracemalloc.start()
+    start = time.perf_counter()
+    match mode:
+        case "list":
+            count = len(execute_databricks_query("SELECT * FROM bench"))
+        case "stream":
+            count = sum(1 for _ in stream_databricks_query("SELECT * FROM bench"))
+        case "columnar":
+            count = len(execute_databricks_query_columnar("SELECT * FROM bench")["id"])
+        case _:
+            raise ValueError(f"Unknown mode {mode}")
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    max_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    logger.info(
+        f"{mode:<9} {count:>9} rows  {count / elapsed:12.0f} rows/s  "
+        f"peak alloc {peak / 2**20:8.1f} MiB  max RSS {max_rss_kib / 1024:8.1f} MiB"
+    )
+
+
+def main(rows: int, chunk_rows: int) -> None:
+    for mode in MODES:
+        command = [sys.executable, "-m", "benchmarks.bench_databricks_stream", "--mode", mode]
+        subprocess.run([*command, "--rows", str(rows), "--chunk-rows", str(chunk_rows)], check=True)
+
+
+if __name__ == "__main__":
+    parser = benchmark_parser(__doc__, "app.dbrx")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows in the generated result")
+    parser.add_argument("--chunk-rows", type=int, default=20_000, help="rows per result chunk")
+    parser.add_argument("--mode", choices=MODES, help="run a single mode in this process")
+    args = parser.parse_args()
+    if args.mode:
+        run_mode(args.mode, args.rows, args.chunk_rows)
+    else:
+        main(args.rows, args.chunk_rows)
@@ -0,0 +1,184 @@
+"""Element tree construction of the live landing page: the section builder vs. the hand-written page it replaced.
+
+Builds the page into a fresh NiceGUI client in-process, without HTTP or a browser, and reports
+the build time, elements created per second and the time to serialize the tree into the initial
+page (NiceGUI's `build_response`). The hand-written builder below is the page as it was before
+`app.landing_sections`, kept as the baseline.
+
+Usage:
+
+    uv run python -m benchmarks.bench_landing_build --renders 300
+"""
+
+import gc
+import json
+import logging
+import statistics
+import time
+from typing import Callable
+
+from nicegui import Client, core, ui
+from nicegui.page import page
+from starlette.requests import Request
+
+from app import landing_content as content
+from app.assets import asset_url
+from app.landing import contact_form
+from app.landing_sections import SECTIONS, build_sections, install_theme
+from benchmarks._cli import benchmark_parser
+
+logger = logging.getLogger(__name__)
+
+REQUEST_SCOPE = {"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""}
+
+
+def handwritten_page() -> None:
+    # Apply modern color theme and custom CSS
+    ui.colors(**content.THEME_COLORS)
+    ui.add_head_html(f'<link href="{asset_url("landing.css")}" rel="stylesheet">')
+
+    # Hero Section
+    with ui.column().classes("hero-section w-full min-h-screen flex items-center justify-center p-8"):
+        with ui.column().classes("max-w-6xl mx-auto text-center"):
+            ui.label(content.HERO_TITLE).classes("text-4xl md:text-6xl font-bold mb-6 leading-tight")
+            ui.label(content.HERO_SUBTITLE).classes(
+                "text-xl md:text-2xl mb-8 opacity-90 max-w-4xl mx-auto leading-relaxed"
+            )
+
+            # CTA Button
+            ui.html(
+                f'<a href="#{content.CONTACT_ANCHOR}" class="gradient-button inline-block px-8 py-4 rounded-lg '
+                f'text-lg font-semibold no-underline">{content.HERO_CTA}</a>'
+            )
+
+            # Hero Image Placeholder
+            with ui.card().classes("mt-12 p-6 section-card rounded-xl shadow-2xl max-w-4xl mx-auto"):
+                ui.image(asset_url(content.HERO_IMAGE)).classes("w-full h-auto rounded-lg")
+
+    # Problem Section
+    with ui.column().classes("w-full bg-gray-50 py-16 px-8"):
+        with ui.column().classes("max-w-6xl mx-auto"):
+            ui.label(content.PROBLEMS_TITLE).classes("text-3xl font-bold text-gray-800 text-center mb-12")
+
+            with ui.row().classes("gap-6 flex-wrap justify-center"):
+                for problem in content.PROBLEMS:
+                    with ui.card().classes("p-6 max-w-sm shadow-lg rounded-xl hover:shadow-xl transition-shadow"):
+                        ui.icon("error_outline", color="negative").classes("text-4xl mb-4")
+                        ui.label(problem).classes("text-gray-700 font-medium leading-relaxed")
+
+    # Solution Section
+    with ui.column().classes("w-full bg-white py-16 px-8"):
+        with ui.column().classes("max-w-6xl mx-auto"):
+            ui.label(content.SOLUTION_TITLE).classes("text-3xl font-bold text-gray-800 text-center mb-8")
+            ui.label(content.SOLUTION_INTRO).classes(
+                "text-xl text-gray-600 text-center mb-12 max-w-4xl mx-auto leading-relaxed"
+            )
+
+            with ui.row().classes("gap-8 flex-wrap justify-center"):
+                for product in content.PRODUCTS:
+                    with ui.card().classes("product-card p-8 max-w-sm rounded-xl shadow-lg"):
+                        ui.image(asset_url(product["icon"])).classes("w-16 h-16 mb-6 mx-auto")
+                        ui.label(product["name"]).classes("text-xl font-semibold text-gray-800 text-center")
+
+    # Market Section
+    with ui.column().classes("w-full bg-gradient-to-br from-blue-50 to-indigo-100 py-16 px-8"):
+        with ui.column().classes("max-w-6xl mx-auto"):
+            ui.label(content.MARKETS_TITLE).classes("text-3xl font-bold text-gray-800 text-center mb-12")
+
+            with ui.row().classes("gap-6 flex-wrap justify-center"):
+                for market in content.MARKETS:
+                    with ui.card().classes(
+                        "p-6 max-w-sm shadow-lg rounded-xl bg-white hover:shadow-xl transition-shadow"
+                    ):
+                        ui.icon("business", color="primary").classes("text-4xl mb-4")
+                        ui.label(market).classes("text-gray-700 font-medium text-center leading-relaxed")
+
+    # Opportunity Section
+    with ui.column().classes("w-full bg-white py-16 px-8"):
+        with ui.column().classes("max-w-6xl mx-auto"):
+            ui.label(content.OPPORTUNITIES_TITLE).classes("text-3xl font-bold text-gray-800 text-center mb-12")
+
+            with ui.column().classes("max-w-4xl mx-auto space-y-4"):
+                for opportunity in content.OPPORTUNITIES:
+                    with ui.row().classes("items-center p-4 bg-green-50 rounded-lg"):
+                        ui.icon("trending_up", color="positive").classes("text-2xl mr-4")
+                        ui.label(opportunity).classes("text-gray-700 font-medium text-lg")
+
+    # Investment Section
+    with ui.column().classes("w-full bg-gradient-to-r from-purple-600 to-blue-600 py-16 px-8 text-white"):
+        with ui.column().classes("max-w-4xl mx-auto text-center"):
+            ui.label(content.INVESTMENT_TITLE).classes("text-3xl font-bold mb-8")
+            ui.label(content.INVESTMENT_TEXT).classes("text-xl leading-relaxed opacity-90")
+
+    # Contact Section
+    with ui.column().classes("w-full bg-gray-50 py-16 px-8").props(f"id={content.CONTACT_ANCHOR}"):
+        with ui.column().classes("max-w-4xl mx-auto"):
+            ui.label(content.CONTACT_TITLE).classes("text-3xl font-bold text-gray-800 text-center mb-6")
+            ui.label(content.CONTACT_INTRO).classes("text-xl text-gray-600 text-center mb-12 leading-relaxed")
+
+            # Contact Form
+            contact_form()
+
+    # Footer
+    with ui.column().classes("w-full bg-gray-800 text-white py-12 px-8"):
+        with ui.column().classes("max-w-6xl mx-auto text-center"):
+            ui.label(content.FOOTER_TITLE).classes("text-2xl font-bold mb-4")
+            ui.label(content.FOOTER_TEXT).classes("text-gray-300 text-lg")
+
+
+def section_page() -> None:
+    build_sections(SECTIONS, {"contact_form": contact_form})
+
+
+def _measure(name: str, build: Callable[[], None], renders: int) -> None:
+    build_ms: list[float] = []
+    serialize_ms: list[float] = []
+    elements = 0
+    for i in range(renders + 1):
+        gc.collect()
+        with Client(page("/"), request=Request(REQUEST_SCOPE)) as client:
+            start = time.perf_counter()
+            build()
+            built = time.perf_counter()
+            json.dumps({id: element._to_dict() for id, element in client.elements.items()})
+            serialized = time.perf_counter()
+        elements = len(client.elements)
+        client.delete()
+        if i > 0:  # the first build imports and warms up caches
+            build_ms.append((built - start) * 1000)
+            serialize_ms.append((serialized - built) * 1000)
+
+    build_p50 = statistics.median(build_ms)
+    serialize_p50 = statistics.median(serialize_ms)
+    logger.info(
+        f"{name:<12} build p50={build_p50:6.2f} ms  {elements / build_p50 * 1000:8.0f} elements/s  "
+        f"serialize p50={serialize_p50:5.2f} ms  render={build_p50 + serialize_p50:6.2f} ms  elements={elements}"
+    )
+
+
+def main(renders: int) -> None:
+    core.app.config.add_run_config(
+        reload=False,
+        title="bench",
+        viewport="",
+        favicon=None,
+        dark=False,
+        language="en-US",
+        binding_refresh_interval=0.1,
+        reconnect_timeout=3.0,
+        message_history_length=1000,
+        tailwind=True,
+        prod_js=True,
+        show_welcome_message=False,
+    )
+    install_theme()
+    for _ in range(3):
+        _measure("handwritten", handwritten_page, renders)
+        _measure("sections", section_page, renders)
+
+
+if __name__ == "__main__":
+    parser = benchmark_parser(__doc__)
+    parser.add_argument("--renders", type=int, default=300, help="page builds per builder and round")
+    args = parser.parse_args()
+    main(args.renders)
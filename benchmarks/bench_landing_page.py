@@ -0,0 +1,88 @@
+"""Time to first byte and memory per visitor: live NiceGUI landing page vs. pre-rendered HTML.
+
+Drives the ASGI app in-process (no network, no browser), so the numbers isolate server-side
+work: building the element tree and rendering it for the live page, a cached byte string for
+the static one. Memory is the Python heap growth (tracemalloc) left behind per visit; for the
+live page that is the NiceGUI client kept alive until its websocket would time out.
+
+Usage:
+
+    uv run python -m benchmarks.bench_landing_page --visits 200
+"""
+
+import asyncio
+import gc
+import logging
+import statistics
+import time
+import tracemalloc
+
+import httpx
+from nicegui import Client, app, core
+
+import app.landing
+from app.landing_static import static_landing_response
+from benchmarks._cli import benchmark_parser
+
+logger = logging.getLogger(__name__)
+
+STATIC_PATH = "/_bench/static"
+
+
+async def _measure(client: httpx.AsyncClient, path: str, visits: int) -> None:
+    await client.get(path)  # warm-up: imports, template compilation, render cache
+    gc.collect()
+    clients_before = len(Client.instances)
+    tracemalloc.start()
+    heap_before = tracemalloc.get_traced_memory()[0]
+
+    latencies: list[float] = []
+    size = 0
+    for _ in range(visits):
+        start = time.perf_counter()
+        response = await client.get(path)
+        latencies.append(time.perf_counter() - start)
+        size = len(response.content)
+
+    gc.collect()
+    heap_growth = tracemalloc.get_traced_memory()[0] - heap_before
+    tracemalloc.stop()
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    logger.info(
+        f"{path:<16} ttfb p50={statistics.median(latencies_ms):7.2f} ms  p95={latencies_ms[int(visits * 0.95) - 1]:7.2f} ms  "
+        f"retained={heap_growth / visits / 1024:8.1f} KiB/visit  clients+={len(Client.instances) - clients_before:<5} "
+        f"body={size / 1024:6.1f} KiB"
+    )
+
+
+async def main(visits: int) -> None:
+    core.app.config.add_run_config(
+        reload=False,
+        title="bench",
+        viewport="",
+        favicon=None,
+        dark=False,
+        language="en-US",
+        binding_refresh_interval=0.1,
+        reconnect_timeout=3.0,
+        message_history_length=1000,
+        tailwind=True,
+        prod_js=True,
+        show_welcome_message=False,
+    )
+    app.landing.create()
+    core.app.get(STATIC_PATH)(static_landing_response)
+
+    async with core.app.router.lifespan_context(core.app):
+        transport = httpx.ASGITransport(core.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await _measure(client, "/", visits)
+            await _measure(client, STATIC_PATH, visits)
+
+
+if __name__ == "__main__":
+    parser = benchmark_parser(__doc__, "httpx")
+    parser.add_argument("--visits", type=int, default=200, help="page views per mode")
+    args = parser.parse_args()
+    asyncio.run(main(args.visits))
@@ -0,0 +1,107 @@
+"""Requests/sec through the security headers middleware: BaseHTTPMiddleware vs. pure ASGI.
+
+The app is called directly through the ASGI interface (no server, no HTTP client) so the
+numbers reflect the middleware and endpoint only. `/health` is a small JSON endpoint and
+`/static/fonts.css` a FileResponse from NiceGUI's own static directory.
+
+Usage:
+
+    uv run python -m benchmarks.bench_security_headers --requests 5000
+"""
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+
+import nicegui
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message
+
+from app.middleware import CONTENT_SECURITY_POLICY, SecurityHeadersMiddleware
+from benchmarks._cli import benchmark_parser
+
+logger = logging.getLogger(__name__)
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """The implementation main.py used before the pure ASGI middleware."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        response.headers["Content-Security-Policy"] = CONTENT_SECURITY_POLICY
+        return response
+
+
+async def health(request):
+    return JSONResponse({"status": "healthy", "service": "nicegui-app"})
+
+
+def make_app(middleware: type | None) -> Starlette:
+    static_dir = Path(nicegui.__file__).parent / "static"
+    app = Starlette(routes=[Route("/health", health), Mount("/static", StaticFiles(directory=static_dir))])
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+async def _call(app: ASGIApp, path: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    status = 0
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def main(requests: int) -> None:
+    for path in ("/health", "/static/fonts.css"):
+        for name, middleware in (
+            ("none", None),
+            ("BaseHTTPMiddleware", LegacySecurityHeadersMiddleware),
+            ("pure ASGI", SecurityHeadersMiddleware),
+        ):
+            app = make_app(middleware)
+            for _ in range(200):  # warm-up
+                assert await _call(app, path) == 200
+            start = time.perf_counter()
+            for _ in range(requests):
+                await _call(app, path)
+            elapsed = time.perf_counter() - start
+            logger.info(
+                f"{path:<18} {name:<20} {requests / elapsed:10.0f} req/s  {elapsed / requests * 1e6:7.1f} µs/req"
+            )
+
+
+if __name__ == "__main__":
+    parser = benchmark_parser(__doc__)
+    parser.add_argument("--requests", type=int, default=5000, help="requests per path and implementation")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,106 @@
+"""Event-loop latency while many visitors submit the contact form at once.
+
+Runs the same burst of concurrent submissions through a blocking session commit (as the form
+handler used to store inquiries), one async session per submission, and the write buffer the
+form uses now, while a heartbeat coroutine measures how late the loop wakes it up. The heartbeat
+lag is what every other NiceGUI websocket client experiences during the burst.
+
+Usage (against a disposable database, rows are deleted afterwards):
+
+    APP_DATABASE_URL=postgresql://... uv run python -m benchmarks.bench_submit_event_loop --submitters 200
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from sqlmodel import col, delete
+
+from app.database import create_tables, dispose_async_engine, get_async_session, get_session
+from app.inquiry_buffer import InquiryWriteBuffer
+from app.models import ContactInquiry, ContactInquiryCreate
+from app.validation import inquiry_from_create
+from benchmarks._cli import benchmark_parser
+
+logger = logging.getLogger(__name__)
+
+BENCH_COMPANY = "__bench_submit_event_loop__"
+HEARTBEAT_INTERVAL = 0.005
+
+
+def _payload(i: int) -> ContactInquiryCreate:
+    return ContactInquiryCreate(
+        name=f"Bench {i}", email=f"bench{i}@example.com", company=BENCH_COMPANY, message="benchmark"
+    )
+
+
+async def _blocking_submit(data: ContactInquiryCreate) -> ContactInquiry | None:
+    with get_session() as session:
+        inquiry = inquiry_from_create(data)
+        session.add(inquiry)
+        session.commit()
+        session.refresh(inquiry)
+        return inquiry
+
+
+async def _async_session_submit(data: ContactInquiryCreate) -> ContactInquiry | None:
+    async with get_async_session() as session:
+        inquiry = inquiry_from_create(data)
+        session.add(inquiry)
+        await session.commit()
+        await session.refresh(inquiry)
+        return inquiry
+
+
+async def _heartbeat(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(time.perf_counter() - start - HEARTBEAT_INTERVAL)
+
+
+async def _run(submit: Callable[[ContactInquiryCreate], Awaitable[ContactInquiry | None]], submitters: int) -> None:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(stop, lags))
+    await asyncio.sleep(HEARTBEAT_INTERVAL * 2)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(submit(_payload(i)) for i in range(submitters)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await heartbeat
+
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    p99 = lags_ms[int(len(lags_ms) * 0.99) - 1] if len(lags_ms) >= 100 else lags_ms[-1]
+    stored = sum(1 for result in results if result is not None)
+    logger.info(
+        f"{submit.__name__:<30} stored={stored:<5} wall={elapsed * 1000:8.1f} ms  "
+        f"loop lag p50={statistics.median(lags_ms):7.2f} ms  p99={p99:7.2f} ms  max={lags_ms[-1]:7.2f} ms"
+    )
+
+
+def _cleanup() -> None:
+    with get_session() as session:
+        session.exec(delete(ContactInquiry).where(col(ContactInquiry.company) == BENCH_COMPANY))  # type: ignore[call-overload]
+        session.commit()
+
+
+async def main(submitters: int) -> None:
+    create_tables()
+    try:
+        await _run(_blocking_submit, submitters)
+        await _run(_async_session_submit, submitters)
+        await _run(InquiryWriteBuffer().submit, submitters)
+    finally:
+        await dispose_async_engine()
+        _cleanup()
+
+
+if __name__ == "__main__":
+    parser = benchmark_parser(__doc__)
+    parser.add_argument("--submitters", type=int, default=200, help="number of concurrent form submissions")
+    args = parser.parse_args()
+    asyncio.run(main(args.submitters))
@@ -0,0 +1,84 @@
+"""Validations per second of contact form input, from raw field values to the `ContactInquiry` row.
+
+Compares the path the form handler and the write buffer used to take (required-field check,
+`import re` and an uncompiled `re.match`, a `ContactInquiryCreate`, then `model_dump()` and a
+second `ContactInquiry(**data)`) with `app.validation.validate_inquiry()`. The bare `ContactInquiry`
+construction is reported as the floor: building an instrumented SQLModel row is most of the cost
+of either path.
+
+Usage:
+
+    uv run python -m benchmarks.bench_validation --seconds 2
+"""
+
+import logging
+import time
+from typing import Callable
+
+from app.models import ContactInquiry, ContactInquiryCreate
+from app.validation import validate_inquiry
+from benchmarks._cli import benchmark_parser
+
+logger = logging.getLogger(__name__)
+
+FIELDS = (
+    "  Budi Santoso ",
+    "Budi.Santoso@Perusahaan.co.id",
+    "PT Teknologi Maju",
+    "Kami tertarik dengan solusi AI untuk meningkatkan efisiensi bisnis kami.",
+)
+
+
+def previous_path(name: str, email: str, company: str, message: str) -> ContactInquiry | None:
+    """The checks of the old form handler plus the copy `inquiry_buffer.submit` made of the payload."""
+    if not all([name, email, company, message]):
+        return None
+    import re
+
+    email_pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
+    if not re.match(email_pattern, email):
+        return None
+    data = ContactInquiryCreate(
+        name=name.strip(), email=email.strip().lower(), company=company.strip(), message=message.strip()
+    )
+    inquiry_data = data.model_dump()
+    inquiry_data["email"] = inquiry_data["email"].lower()
+    return ContactInquiry(**inquiry_data)
+
+
+def row_only(name: str, email: str, company: str, message: str) -> ContactInquiry:
+    return ContactInquiry(name=name, email=email, company=company, message=message)
+
+
+def rate(fn: Callable[..., ContactInquiry | None], seconds: float) -> float:
+    done = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(1000):
+            fn(*FIELDS)
+        done += 1000
+    return done / (time.perf_counter() - start)
+
+
+def main(seconds: float) -> None:
+    assert previous_path(*FIELDS) is not None
+    rates = {
+        "previous path": rate(previous_path, seconds),
+        "validate_inquiry": rate(validate_inquiry, seconds),
+        "ContactInquiry() alone": rate(row_only, seconds),
+    }
+    baseline = rates["previous path"]
+    floor = 1e6 / rates["ContactInquiry() alone"]
+    for name, value in rates.items():
+        logger.info(
+            f"{name:<24} {value:>10,.0f} validations/s  {1e6 / value:6.1f} µs "
+            f"({1e6 / value - floor:5.1f} µs above the row)  x{value / baseline:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = benchmark_parser(__doc__)
+    parser.add_argument("--seconds", type=float, default=2.0, help="measuring time per variant")
+    args = parser.parse_args()
+    main(args.seconds)
@@ -0,0 +1,125 @@
+"""Throughput of the landing page with 1..N app processes, to check how it scales with workers.
+
+Starts `main.py` once per worker on consecutive ports and spreads load over them round-robin,
+standing in for the sticky front of docker-compose.scale.yml (whose own overhead is therefore not
+measured). Load comes from several generator processes so the client side is not the
+bottleneck. Rate limiting is disabled for the measured workers.
+
+Scaling can only be near-linear while there are free cores: the workers and the load generators
+share the machine, so compare worker counts well below `os.cpu_count()`.
+
+Usage:
+
+    uv run python -m benchmarks.bench_workers --max-workers 4 --duration 10
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks._cli import benchmark_parser
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _start_workers(count: int, base_port: int) -> list[subprocess.Popen]:
+    env = os.environ | {"RATE_LIMIT_ENABLED": "false", "INQUIRY_API_TOKEN": ""}
+    return [
+        subprocess.Popen(
+            [sys.executable, "main.py"],
+            cwd=ROOT,
+            env=env | {"NICEGUI_PORT": str(base_port + i)},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        for i in range(count)
+    ]
+
+
+def _wait_ready(ports: list[int], timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    for port in ports:
+        while True:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                    break
+            except httpx.TransportError as e:
+                logger.debug(f"Worker on port {port} is not answering yet: {e}")
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"worker on port {port} did not become ready")
+            time.sleep(0.2)
+
+
+async def _load(ports: list[int], offset: int, concurrency: int, duration: float) -> int:
+    done = 0
+    deadline = time.monotonic() + duration
+
+    async def user(index: int) -> None:
+        nonlocal done
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{ports[(offset + index) % len(ports)]}") as client:
+            while time.monotonic() < deadline:
+                response = await client.get("/")
+                response.raise_for_status()
+                done += 1
+
+    await asyncio.gather(*(user(i) for i in range(concurrency)))
+    return done
+
+
+def _generator(ports: list[int], offset: int, concurrency: int, duration: float, results) -> None:
+    results.put(asyncio.run(_load(ports, offset, concurrency, duration)))
+
+
+def measure(workers: int, base_port: int, generators: int, concurrency: int, duration: float) -> float:
+    ports = [base_port + i for i in range(workers)]
+    processes = _start_workers(workers, base_port)
+    try:
+        _wait_ready(ports)
+        results: multiprocessing.Queue = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(target=_generator, args=(ports, i * concurrency, concurrency, duration, results))
+            for i in range(generators)
+        ]
+        for client in clients:
+            client.start()
+        total = sum(results.get() for _ in clients)
+        for client in clients:
+            client.join()
+        return total / duration
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+
+def main(max_workers: int, base_port: int, generators: int, concurrency: int, duration: float) -> None:
+    logger.info(f"{os.cpu_count()} CPUs, {generators} load generators x {concurrency} concurrent users")
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        throughput = measure(workers, base_port, generators, concurrency, duration)
+        baseline = baseline or throughput
+        logger.info(
+            f"workers={workers:<3} {throughput:8.1f} req/s  speedup={throughput / baseline:5.2f}x  "
+            f"efficiency={throughput / baseline / workers:6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = benchmark_parser(__doc__, "httpx")
+    parser.add_argument("--max-workers", type=int, default=4, help="measure 1 up to this many worker processes")
+    parser.add_argument("--base-port", type=int, default=8100, help="port of the first worker")
+    parser.add_argument("--generators", type=int, default=2, help="load generator processes")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent users per generator")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per worker count")
+    args = parser.parse_args()
+    main(args.max_workers, args.base_port, args.generators, args.concurrency, args.duration)
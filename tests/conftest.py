@@ -1,11 +1,18 @@
 from typing import Generator
 import pytest
+from app.database import create_tables
 from app.startup import startup
 from nicegui.testing import User
 
 pytest_plugins = ["nicegui.testing.plugin"]
 
 
+@pytest.fixture(scope="session", autouse=True)
+def migrated_db() -> None:
+    """Apply migrations once; the app only checks the schema version on startup."""
+    create_tables()
+
+
 @pytest.fixture
 def user(user: User) -> Generator[User, None, None]:
     startup()
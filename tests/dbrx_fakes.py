@@ -0,0 +1,191 @@
+"""In-process stand-ins for the parts of `databricks.sdk.WorkspaceClient` that app.dbrx uses."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Sequence, cast
+
+from databricks.sdk.service.sql import (
+    ColumnInfo,
+    ColumnInfoTypeName,
+    Disposition,
+    EndpointInfo,
+    ExternalLink,
+    ResultData,
+    ResultManifest,
+    ResultSchema,
+    ServiceError,
+    ServiceErrorCode,
+    State,
+    StatementResponse,
+    StatementState,
+    StatementStatus,
+)
+
+
+class FakeWarehouses:
+    def __init__(self, warehouses: Sequence[EndpointInfo]) -> None:
+        self.warehouses = list(warehouses)
+        self.list_calls = 0
+
+    def list(self) -> list[EndpointInfo]:
+        self.list_calls += 1
+        return list(self.warehouses)
+
+
+class FakeStatementExecution:
+    """Answers every statement with the configured columns and rows, recording what was run.
+
+    Statements submitted with `wait_timeout="0s"` stay RUNNING for `polls_until_done` calls to
+    `get_statement()`, like a warehouse that is still working on them. With `chunk_size` the result
+    is split into chunks; EXTERNAL_LINKS results point at `link_base_url` (see `ChunkServer`).
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str] = (),
+        rows: Sequence[Sequence[str | None]] = (),
+        polls_until_done: int = 0,
+        chunk_size: int | None = None,
+        link_base_url: str = "http://127.0.0.1:9/chunks",
+        column_types: Sequence[ColumnInfoTypeName] = (),
+    ) -> None:
+        self.columns = list(columns)
+        self.column_types = list(column_types)
+        self.rows = [list(row) for row in rows]
+        self.polls_until_done = polls_until_done
+        self.chunk_size = chunk_size
+        self.link_base_url = link_base_url
+        self.executed: list[dict[str, Any]] = []
+        self.polls: list[str] = []
+        self.cancelled: list[str] = []
+        self.chunk_requests: list[int] = []
+        self.fail_with: ServiceError | None = None
+        # seconds `execute_statement` blocks, like a slow submission round-trip
+        self.submit_delay = 0.0
+        self._remaining_polls: dict[str, int] = {}
+        self._external: set[str] = set()
+
+    def chunks(self) -> list[list[list[str | None]]]:
+        size = self.chunk_size or max(len(self.rows), 1)
+        return [self.rows[start : start + size] for start in range(0, len(self.rows), size)] or [[]]
+
+    def execute_statement(self, *, warehouse_id: str, statement: str, **kwargs: Any) -> StatementResponse:
+        if self.submit_delay:
+            time.sleep(self.submit_delay)
+        self.executed.append({"warehouse_id": warehouse_id, "statement": statement, **kwargs})
+        statement_id = f"stmt-{len(self.executed)}"
+        if kwargs.get("disposition") == Disposition.EXTERNAL_LINKS:
+            self._external.add(statement_id)
+        if kwargs.get("wait_timeout") == "0s" and self.polls_until_done > 0:
+            self._remaining_polls[statement_id] = self.polls_until_done
+            return StatementResponse(statement_id=statement_id, status=StatementStatus(state=StatementState.RUNNING))
+        return self._finished(statement_id)
+
+    def get_statement(self, statement_id: str) -> StatementResponse:
+        self.polls.append(statement_id)
+        if statement_id in self.cancelled:
+            return StatementResponse(statement_id=statement_id, status=StatementStatus(state=StatementState.CANCELED))
+        self._remaining_polls[statement_id] -= 1
+        if self._remaining_polls[statement_id] > 0:
+            return StatementResponse(statement_id=statement_id, status=StatementStatus(state=StatementState.RUNNING))
+        return self._finished(statement_id)
+
+    def cancel_execution(self, statement_id: str) -> None:
+        self.cancelled.append(statement_id)
+
+    def get_statement_result_chunk_n(self, statement_id: str, chunk_index: int) -> ResultData:
+        self.chunk_requests.append(chunk_index)
+        return self._chunk(statement_id, chunk_index)
+
+    def _column_infos(self) -> list[ColumnInfo]:
+        types = self.column_types or [ColumnInfoTypeName.STRING] * len(self.columns)
+        return [ColumnInfo(name=name, type_name=type_name) for name, type_name in zip(self.columns, types)]
+
+    def _chunk(self, statement_id: str, chunk_index: int) -> ResultData:
+        chunks = self.chunks()
+        next_index = chunk_index + 1 if chunk_index + 1 < len(chunks) else None
+        if statement_id in self._external:
+            link = ExternalLink(
+                chunk_index=chunk_index,
+                external_link=f"{self.link_base_url}/{chunk_index}",
+                http_headers={"x-chunk-key": "secret"},
+                next_chunk_index=next_index,
+            )
+            return ResultData(chunk_index=chunk_index, external_links=[link])
+        # the SDK annotates cells as str, but NULLs arrive as None on the wire
+        data_array = cast(list[list[str]], chunks[chunk_index])
+        return ResultData(chunk_index=chunk_index, data_array=data_array, next_chunk_index=next_index)
+
+    def _finished(self, statement_id: str) -> StatementResponse:
+        if self.fail_with is not None:
+            return StatementResponse(
+                statement_id=statement_id,
+                status=StatementStatus(state=StatementState.FAILED, error=self.fail_with),
+            )
+        return StatementResponse(
+            statement_id=statement_id,
+            status=StatementStatus(state=StatementState.SUCCEEDED),
+            manifest=ResultManifest(schema=ResultSchema(columns=self._column_infos())),
+            result=self._chunk(statement_id, 0),
+        )
+
+
+class ChunkServer:
+    """Local HTTP server standing in for the cloud storage behind EXTERNAL_LINKS results.
+
+    Serves the chunks of `statement_execution` as JSON arrays at `<url>/<chunk_index>` and records
+    the request headers it received.
+    """
+
+    def __init__(self, statement_execution: FakeStatementExecution) -> None:
+        self.statement_execution = statement_execution
+        self.headers: list[dict[str, str]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                server.headers.append(dict(self.headers))
+                chunk_index = int(self.path.rsplit("/", 1)[1])
+                body = json.dumps(server.statement_execution.chunks()[chunk_index]).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}/chunks"
+
+    def __enter__(self) -> "ChunkServer":
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        self.statement_execution.link_base_url = self.url
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class FakeWorkspaceClient:
+    def __init__(
+        self, warehouses: Sequence[EndpointInfo] = (), statement_execution: FakeStatementExecution | None = None
+    ) -> None:
+        self.warehouses = FakeWarehouses(warehouses)
+        self.statement_execution = statement_execution or FakeStatementExecution()
+
+
+def warehouse(warehouse_id: str, state: State = State.RUNNING, sessions: int = 0, clusters: int = 1) -> EndpointInfo:
+    return EndpointInfo(id=warehouse_id, state=state, num_active_sessions=sessions, num_clusters=clusters)
+
+
+def warehouse_stopped_error() -> ServiceError:
+    return ServiceError(error_code=ServiceErrorCode.TEMPORARILY_UNAVAILABLE, message="Warehouse was stopped")
+
+
+def sql_error() -> ServiceError:
+    return ServiceError(error_code=ServiceErrorCode.BAD_REQUEST, message="[PARSE_SYNTAX_ERROR] near 'SELEC'")
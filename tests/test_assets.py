@@ -0,0 +1,130 @@
+"""Tests for fingerprinted, precompressed static assets."""
+
+import gzip
+
+import httpx
+from fastapi import FastAPI
+
+from app.assets import (
+    ASSETS_PREFIX,
+    CACHE_CONTROL,
+    AssetManifest,
+    asset_manifest,
+    asset_response,
+    asset_url,
+    build_asset,
+    negotiate_encoding,
+)
+from app.landing_static import render_landing_html
+
+CSS = b".hero-section { color: white; }\n" * 20
+GZIP_ONLY = {"gzip": gzip.compress}
+
+
+async def get(path: str, headers: dict[str, str] | None = None) -> httpx.Response:
+    api = FastAPI()
+    api.get(f"{ASSETS_PREFIX}/{{path:path}}")(asset_response)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(api), base_url="http://test") as client:
+        return await client.get(path, headers=headers)
+
+
+def test_url_changes_with_content():
+    first = build_asset("landing.css", CSS, GZIP_ONLY)
+    second = build_asset("landing.css", CSS + b"a { color: red; }\n", GZIP_ONLY)
+
+    assert first.url.startswith(f"{ASSETS_PREFIX}/landing.")
+    assert first.url.endswith(".css")
+    assert first.url != second.url
+    assert first.url == build_asset("landing.css", CSS, GZIP_ONLY).url
+
+
+def test_text_assets_are_precompressed():
+    css = build_asset("landing.css", CSS, GZIP_ONLY)
+    tiny = build_asset("tiny.css", b"a{}", GZIP_ONLY)
+    image = build_asset("photo.png", CSS, GZIP_ONLY)
+
+    assert gzip.decompress(css.encodings["gzip"]) == CSS
+    assert css.media_type == "text/css; charset=utf-8"
+    assert set(tiny.encodings) == {"identity"}
+    assert set(image.encodings) == {"identity"}
+
+
+def test_manifest_keeps_subdirectories(tmp_path):
+    (tmp_path / "icons").mkdir()
+    (tmp_path / "icons" / "rag.svg").write_text("<svg/>")
+
+    manifest = AssetManifest.from_directory(tmp_path, GZIP_ONLY)
+
+    url = manifest.url("icons/rag.svg")
+    assert url is not None and url.startswith(f"{ASSETS_PREFIX}/icons/rag.")
+    assert manifest.url("missing.svg") is None
+
+
+def test_negotiate_encoding():
+    available = {"identity": b"", "gzip": b"", "br": b""}
+
+    assert negotiate_encoding("gzip, deflate, br", available) == "br"
+    assert negotiate_encoding("gzip, deflate", available) == "gzip"
+    assert negotiate_encoding("br;q=0.5, gzip", available) == "gzip"
+    assert negotiate_encoding("br;q=0, *", available) == "gzip"
+    assert negotiate_encoding("", available) == "identity"
+    assert negotiate_encoding("br", {"identity": b"", "gzip": b""}) == "identity"
+
+
+def test_missing_asset_is_linked_unversioned():
+    assert asset_url("does-not-exist.svg") == "does-not-exist.svg"
+
+
+def test_landing_page_links_cached_stylesheet():
+    """Test that the pre-rendered page links the fingerprinted stylesheet instead of inlining it."""
+    html = render_landing_html()
+
+    assert f'<link href="{asset_url("landing.css")}" rel="stylesheet">' in html
+    assert ".gradient-button" not in html
+
+
+async def test_asset_is_served_immutable_and_compressed():
+    url = asset_url("landing.css")
+    asset = asset_manifest().by_name["landing.css"]
+
+    response = await get(url, headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == CACHE_CONTROL
+    assert response.headers["etag"] == asset.etag_for("gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == asset.encodings["identity"]
+
+
+async def test_matching_etag_is_not_modified():
+    asset = asset_manifest().by_name["landing.css"]
+
+    response = await get(asset.url, headers={"If-None-Match": asset.etag_for("gzip"), "Accept-Encoding": "gzip"})
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_each_encoding_has_its_own_etag():
+    asset = build_asset("landing.css", CSS, GZIP_ONLY | {"br": gzip.compress})
+
+    etags = {encoding: asset.etag_for(encoding) for encoding in asset.encodings}
+
+    assert etags["identity"] == asset.etag
+    assert etags["gzip"] == f'{asset.etag[:-1]}-gzip"'
+    assert etags["br"] == f'{asset.etag[:-1]}-br"'
+
+
+async def test_etag_of_another_encoding_is_not_a_match():
+    asset = asset_manifest().by_name["landing.css"]
+
+    response = await get(asset.url, headers={"If-None-Match": asset.etag_for("gzip"), "Accept-Encoding": "identity"})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == asset.etag
+    assert response.content == asset.encodings["identity"]
+
+
+async def test_unversioned_path_is_not_found():
+    assert (await get(f"{ASSETS_PREFIX}/landing.css")).status_code == 404
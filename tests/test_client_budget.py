@@ -0,0 +1,147 @@
+"""Tests for per-client memory accounting and eviction of idle and disconnected NiceGUI clients."""
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from nicegui import Client, ui
+from nicegui.page import page
+from nicegui.testing import User
+from starlette.requests import Request
+
+from app.client_budget import CONNECT_GRACE_S, RELEASE_GRACE_S, ClientBudget, client_budget, open_sockets
+from app.health import create_router
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def unconnected_client() -> Client:
+    """A client whose browser loaded the page but never opened the websocket, like a bot's."""
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+    with Client(page("/"), request=request) as client:
+        for _ in range(9):
+            ui.label("filler")
+    return client
+
+
+def landing_client() -> Client:
+    return next(client for client in Client.instances.values() if not client.shared and open_sockets(client))
+
+
+async def test_stats_count_elements_of_each_client(user: User) -> None:
+    await user.open("/")
+    budget = ClientBudget(element_bytes=1000)
+
+    usage = budget.usage(landing_client())
+    stats = budget.stats([landing_client()])
+
+    assert usage.connected
+    assert usage.elements > 50
+    assert usage.approx_bytes == usage.elements * 1000
+    assert stats["clients"] == stats["connected"] == 1
+    assert stats["approx_bytes"] == usage.approx_bytes
+
+
+async def test_evicts_oldest_disconnected_clients_until_within_budget(user: User) -> None:
+    clock = Clock()
+    budget = ClientBudget(max_clients=2, clock=clock)
+    clients = [unconnected_client() for _ in range(4)]
+    for client in clients:
+        budget.touch(client)
+        clock.now += 10
+    clock.now += CONNECT_GRACE_S
+
+    assert budget.enforce(clients) == 2
+
+    assert [client.id in Client.instances for client in clients] == [False, False, True, True]
+    assert budget.evictions["disconnected"] == 2
+    assert budget.enforce(clients[2:]) == 0
+
+
+async def test_keeps_clients_whose_browser_may_still_connect(user: User) -> None:
+    clock = Clock()
+    budget = ClientBudget(max_clients=1, clock=clock)
+    clients = [unconnected_client() for _ in range(2)]
+    for client in clients:
+        budget.touch(client)
+
+    assert budget.enforce(clients) == 0
+    assert all(client.id in Client.instances for client in clients)
+
+    for client in clients:
+        client.delete()
+
+
+async def test_byte_budget_evicts_by_estimated_size(user: User) -> None:
+    clock = Clock()
+    client = unconnected_client()
+    budget = ClientBudget(max_bytes=len(client.elements) * 100 - 1, element_bytes=100, clock=clock)
+    budget.touch(client)
+    clock.now += CONNECT_GRACE_S
+
+    assert budget.enforce([client]) == 1
+    assert client.id not in Client.instances
+
+
+async def test_idle_connected_client_is_released_before_it_is_evicted(user: User) -> None:
+    await user.open("/")
+    client = landing_client()
+    clock = Clock()
+    budget = ClientBudget(max_clients=1, idle_timeout=60, clock=clock)
+    budget.touch(client)
+    other = unconnected_client()
+    budget.touch(other)
+    clock.now += 60
+
+    # the unconnected client goes first; the connected one only when that is not enough
+    assert budget.enforce([client, other]) == 1
+    assert other.id not in Client.instances
+    assert budget.enforce([client]) == 0
+
+    budget.max_bytes = 1
+    assert budget.enforce([client]) == 1
+    assert budget.evictions["idle"] == 1
+    assert client.id in Client.instances
+
+    clock.now += RELEASE_GRACE_S
+    assert budget.enforce([client]) == 1
+    assert budget.evictions["unresponsive"] == 1
+    assert client.id not in Client.instances
+
+
+async def test_active_clients_are_never_evicted(user: User) -> None:
+    await user.open("/")
+    client = landing_client()
+    budget = ClientBudget(max_bytes=1, idle_timeout=60)
+    budget.touch(client)
+
+    assert budget.enforce([client]) == 0
+    assert client.id in Client.instances
+
+
+async def test_form_input_counts_as_activity(user: User) -> None:
+    await user.open("/")
+    client = landing_client()
+    await asyncio.sleep(0.1)
+    before = client_budget.usage(client).idle_s
+    user.find("Nama").type("Budi")
+
+    assert client_budget.usage(client).idle_s < before
+
+
+async def test_health_reports_client_usage(user: User) -> None:
+    await user.open("/")
+    api = FastAPI()
+    api.include_router(create_router([]))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(api), base_url="http://test") as http:
+        response = await http.get("/health/clients")
+
+    assert response.status_code == 200
+    assert response.json()["connected"] >= 1
+    assert response.json()["elements"] > 50
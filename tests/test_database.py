@@ -0,0 +1,113 @@
+"""Tests for engine configuration and connection pool statistics."""
+
+import pytest
+from sqlalchemy import exc, text
+
+from app.database import (
+    DATABASE_URL,
+    EngineSettings,
+    create_async_db_engine,
+    create_db_engine,
+    get_pool_stats,
+    pool_stats,
+)
+
+
+def test_engine_settings_defaults():
+    """Test that an empty environment keeps the previous engine behaviour."""
+    settings = EngineSettings.from_env({})
+
+    assert settings == EngineSettings()
+    assert settings.statement_timeout_ms == 1000
+    assert not settings.pgbouncer
+
+
+def test_engine_settings_from_env():
+    """Test that every pool knob is read from its environment variable."""
+    settings = EngineSettings.from_env(
+        {
+            "APP_DB_POOL_SIZE": "20",
+            "APP_DB_MAX_OVERFLOW": "0",
+            "APP_DB_POOL_TIMEOUT": "2.5",
+            "APP_DB_POOL_RECYCLE": "1800",
+            "APP_DB_POOL_PRE_PING": "true",
+            "APP_DB_STATEMENT_TIMEOUT_MS": "5000",
+            "APP_DB_CONNECT_TIMEOUT": "3",
+            "APP_DB_PGBOUNCER": "1",
+        }
+    )
+
+    assert settings == EngineSettings(
+        pool_size=20,
+        max_overflow=0,
+        pool_timeout=2.5,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        statement_timeout_ms=5000,
+        connect_timeout=3,
+        pgbouncer=True,
+    )
+
+
+def test_engine_applies_pool_settings():
+    engine = create_db_engine(DATABASE_URL, EngineSettings(pool_size=3, max_overflow=1, pool_pre_ping=True))
+    try:
+        stats = pool_stats(engine.pool)
+        assert stats["size"] == 3
+        assert stats["max_overflow"] == 1
+        assert engine.pool._pre_ping
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.parametrize("pgbouncer", [False, True])
+def test_statement_timeout_applied(pgbouncer: bool):
+    """Test that the statement timeout is set both via startup options and per transaction (PgBouncer mode)."""
+    engine = create_db_engine(DATABASE_URL, EngineSettings(statement_timeout_ms=1234, pgbouncer=pgbouncer))
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("SHOW statement_timeout")).scalar() == "1234ms"
+    finally:
+        engine.dispose()
+
+
+async def test_async_engine_pgbouncer_mode_disables_statement_cache():
+    engine = create_async_db_engine(DATABASE_URL, EngineSettings(statement_timeout_ms=1500, pgbouncer=True))
+    try:
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("SHOW statement_timeout"))).scalar() == "1500ms"
+            assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+    finally:
+        await engine.dispose()
+
+
+def test_pool_stats_track_checkouts_and_timeouts():
+    """Test that checked-out connections, overflow and checkout timeouts are reported."""
+    engine = create_db_engine(DATABASE_URL, EngineSettings(pool_size=1, max_overflow=1, pool_timeout=0.1))
+    try:
+        first = engine.connect()
+        second = engine.connect()
+        stats = pool_stats(engine.pool)
+        assert stats["checked_out"] == 2
+        assert stats["overflow"] == 1
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+        first.close()
+        second.close()
+        stats = pool_stats(engine.pool)
+        assert stats["checked_out"] == 0
+        assert stats["checkouts"] == 3
+        assert stats["timeouts"] == 1
+        assert stats["wait_max_ms"] >= 100
+    finally:
+        engine.dispose()
+
+
+def test_get_pool_stats_reports_both_engines():
+    stats = get_pool_stats()
+
+    assert set(stats) == {"sync", "async"}
+    for engine_stats in stats.values():
+        assert {"size", "checked_out", "overflow", "checkouts", "wait_avg_ms", "wait_max_ms"} <= set(engine_stats)
@@ -0,0 +1,557 @@
+"""Tests for the Databricks client singleton, warehouse selection cache and async execution."""
+
+import asyncio
+
+import pytest
+from pydantic import PrivateAttr
+
+pytest.importorskip("databricks.sdk")
+
+from databricks.sdk.service.sql import ColumnInfoTypeName, EndpointInfo, State  # noqa: E402
+
+from app.dbrx import (  # noqa: E402
+    DatabricksModel,
+    WarehouseResolver,
+    execute_databricks_queries,
+    execute_databricks_query,
+    execute_databricks_query_arrow,
+    execute_databricks_query_async,
+    execute_databricks_query_columnar,
+    execute_databricks_query_rows,
+    gather_bounded,
+    get_workspace_client,
+    least_loaded,
+    pin_warehouse,
+    prefer_running,
+    query_cache,
+    set_workspace_client,
+    stream_databricks_batches,
+    stream_databricks_query,
+    warehouse_resolver,
+)
+from app.metrics import DATABRICKS_EXECUTION_SECONDS, DATABRICKS_MODEL_ROWS, DATABRICKS_RESULT_ROWS  # noqa: E402
+from dbrx_fakes import (  # noqa: E402
+    ChunkServer,
+    FakeStatementExecution,
+    FakeWorkspaceClient,
+    sql_error,
+    warehouse,
+    warehouse_stopped_error,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fake_client():
+    """Install a fake WorkspaceClient as the shared client for the duration of a test."""
+    client = FakeWorkspaceClient(
+        warehouses=[warehouse("stopped", State.STOPPED), warehouse("wh-1")],
+        statement_execution=FakeStatementExecution(columns=["id", "name"], rows=[["1", "a"], ["2", "b"]]),
+    )
+    set_workspace_client(client)  # type: ignore[arg-type]
+    query_cache.invalidate()
+    yield client
+    set_workspace_client(None)
+    query_cache.invalidate()
+
+
+class Customer(DatabricksModel):
+    __catalog__ = "main"
+    __schema__ = "sales"
+    __table__ = "customers"
+    __cache_ttl__ = 60
+
+    id: int
+    name: str
+
+    @classmethod
+    def fetch(cls, **params) -> list["Customer"]:
+        rows = cls.cached_query(f"SELECT id, name FROM {cls.table_name()}")
+        return [cls(**row) for row in rows]
+
+
+class UncachedCustomer(Customer):
+    __cache_ttl__ = 0
+
+
+def chosen(choice: EndpointInfo | None) -> str | None:
+    return choice.id if choice is not None else None
+
+
+def test_prefer_running_policy():
+    assert chosen(prefer_running([warehouse("a", State.STOPPED), warehouse("b")])) == "b"
+    assert chosen(prefer_running([warehouse("a", State.STOPPED), warehouse("b", State.STARTING)])) == "a"
+    assert prefer_running([]) is None
+
+
+def test_least_loaded_policy():
+    """Test that load is compared per cluster and only RUNNING warehouses are considered."""
+    warehouses = [
+        warehouse("busy", sessions=10, clusters=1),
+        warehouse("scaled", sessions=10, clusters=5),
+        warehouse("idle-but-stopped", State.STOPPED, sessions=0),
+    ]
+    assert chosen(least_loaded(warehouses)) == "scaled"
+    assert chosen(least_loaded([warehouse("a", State.STOPPED)])) == "a"
+
+
+def test_pin_warehouse_policy():
+    policy = pin_warehouse("wh-2")
+    assert chosen(policy([warehouse("wh-1"), warehouse("wh-2", State.STOPPED)])) == "wh-2"
+    assert policy([warehouse("wh-1")]) is None
+
+
+def test_resolver_caches_until_ttl_expires():
+    clock = FakeClock()
+    client = FakeWorkspaceClient(warehouses=[warehouse("wh-1")])
+    resolver = WarehouseResolver(ttl=60, clock=clock)
+
+    assert resolver.resolve(client) == "wh-1"  # type: ignore[arg-type]
+    assert resolver.resolve(client) == "wh-1"  # type: ignore[arg-type]
+    assert client.warehouses.list_calls == 1
+
+    clock.now = 61
+    client.warehouses.warehouses = [warehouse("wh-2")]
+    assert resolver.resolve(client) == "wh-2"  # type: ignore[arg-type]
+    assert client.warehouses.list_calls == 2
+
+
+def test_resolver_invalidate_forces_relist():
+    client = FakeWorkspaceClient(warehouses=[warehouse("wh-1")])
+    resolver = WarehouseResolver(ttl=60)
+
+    resolver.resolve(client)  # type: ignore[arg-type]
+    resolver.invalidate()
+    resolver.resolve(client)  # type: ignore[arg-type]
+
+    assert client.warehouses.list_calls == 2
+
+
+def test_resolver_without_warehouses_raises():
+    with pytest.raises(RuntimeError, match="No SQL warehouse"):
+        WarehouseResolver().resolve(FakeWorkspaceClient())  # type: ignore[arg-type]
+
+
+def test_shared_client_is_reused(fake_client):
+    assert get_workspace_client() is fake_client
+    assert get_workspace_client() is get_workspace_client()
+
+
+def test_queries_reuse_warehouse_selection(fake_client):
+    """Test that repeated queries list warehouses once and run on the RUNNING one."""
+    first = execute_databricks_query("SELECT * FROM t")
+    second = execute_databricks_query("SELECT * FROM t")
+
+    assert first == second == [{"id": "1", "name": "a"}, {"id": "2", "name": "b"}]
+    assert fake_client.warehouses.list_calls == 1
+    assert [run["warehouse_id"] for run in fake_client.statement_execution.executed] == ["wh-1", "wh-1"]
+
+
+def test_warehouse_failure_invalidates_selection(fake_client):
+    execute_databricks_query("SELECT 1")
+    fake_client.statement_execution.fail_with = warehouse_stopped_error()
+
+    with pytest.raises(RuntimeError, match="Warehouse was stopped"):
+        execute_databricks_query("SELECT 1")
+
+    fake_client.statement_execution.fail_with = None
+    execute_databricks_query("SELECT 1")
+    assert fake_client.warehouses.list_calls == 2
+
+
+def test_sql_error_keeps_selection(fake_client):
+    """Test that a plain SQL error does not cost another warehouse listing."""
+    execute_databricks_query("SELECT 1")
+    fake_client.statement_execution.fail_with = sql_error()
+
+    with pytest.raises(RuntimeError, match="PARSE_SYNTAX_ERROR"):
+        execute_databricks_query("SELEC 1")
+
+    assert fake_client.warehouses.list_calls == 1
+    assert warehouse_resolver.resolve(fake_client) == "wh-1"  # type: ignore[arg-type]
+
+
+def test_warm_fetch_costs_no_warehouse_call(fake_client):
+    """Test that a second dashboard load is served entirely from the result cache."""
+    first = Customer.fetch()
+    second = Customer.fetch()
+
+    assert first == second
+    assert [customer.name for customer in second] == ["a", "b"]
+    assert len(fake_client.statement_execution.executed) == 1
+    assert query_cache.stats()["hits"] >= 1
+
+
+def test_model_without_ttl_is_not_cached(fake_client):
+    UncachedCustomer.fetch()
+    UncachedCustomer.fetch()
+
+    assert len(fake_client.statement_execution.executed) == 2
+
+
+async def test_async_query_polls_until_done(fake_client):
+    fake_client.statement_execution.polls_until_done = 3
+
+    rows = await execute_databricks_query_async("SELECT * FROM t", poll_interval=0.001)
+
+    assert rows == [{"id": "1", "name": "a"}, {"id": "2", "name": "b"}]
+    assert fake_client.statement_execution.executed[0]["wait_timeout"] == "0s"
+    assert fake_client.statement_execution.polls == ["stmt-1"] * 3
+
+
+async def test_async_query_does_not_block_event_loop(fake_client):
+    """Test that other coroutines keep running while a statement is being polled."""
+    fake_client.statement_execution.polls_until_done = 5
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    task = asyncio.create_task(ticker())
+    await execute_databricks_query_async("SELECT 1", poll_interval=0.01)
+    task.cancel()
+
+    assert ticks > 5
+
+
+async def test_async_query_failure_raises(fake_client):
+    fake_client.statement_execution.polls_until_done = 1
+    fake_client.statement_execution.fail_with = warehouse_stopped_error()
+
+    with pytest.raises(RuntimeError, match="Warehouse was stopped"):
+        await execute_databricks_query_async("SELECT 1", poll_interval=0.001)
+    assert fake_client.warehouses.list_calls == 1
+
+    fake_client.statement_execution.fail_with = None
+    await execute_databricks_query_async("SELECT 1", poll_interval=0.001)
+    assert fake_client.warehouses.list_calls == 2
+
+
+async def test_cancelled_query_is_cancelled_on_warehouse(fake_client):
+    """Test that cancelling the awaiting task, e.g. on client disconnect, cancels the statement."""
+    fake_client.statement_execution.polls_until_done = 1_000_000
+
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(0.05):
+            await execute_databricks_query_async("SELECT 1", poll_interval=0.001)
+
+    assert fake_client.statement_execution.cancelled == ["stmt-1"]
+
+
+async def test_query_cancelled_during_submission_is_cancelled_on_warehouse(fake_client):
+    """Test that a statement still being submitted when the caller gives up is cancelled once it has an id."""
+    fake_client.statement_execution.polls_until_done = 1_000_000
+    fake_client.statement_execution.submit_delay = 0.2
+
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(0.05):
+            await execute_databricks_query_async("SELECT 1", poll_interval=0.001)
+
+    assert fake_client.statement_execution.cancelled == ["stmt-1"]
+    assert fake_client.statement_execution.polls == []
+
+
+async def test_fan_out_runs_queries_concurrently(fake_client):
+    fake_client.statement_execution.polls_until_done = 2
+
+    results = await execute_databricks_queries([f"SELECT {i}" for i in range(4)])
+
+    assert len(results) == 4
+    assert all(rows == results[0] for rows in results)
+    assert sorted(run["statement"] for run in fake_client.statement_execution.executed) == [
+        f"SELECT {i}" for i in range(4)
+    ]
+
+
+async def test_gather_bounded_limits_concurrency():
+    running = 0
+    peak = 0
+
+    async def call(i: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return i
+
+    results = await gather_bounded([lambda i=i: call(i) for i in range(10)], max_concurrency=3)
+
+    assert results == list(range(10))
+    assert peak == 3
+
+
+async def test_fetch_async(fake_client):
+    customers = await Customer.fetch_async()
+
+    assert [customer.id for customer in customers] == [1, 2]
+
+
+@pytest.fixture
+def chunked_client(fake_client):
+    """Shared fake client whose 10-row result comes back in chunks of 3 rows."""
+    fake_client.statement_execution.rows = [[str(i), f"name-{i}"] for i in range(10)]
+    fake_client.statement_execution.chunk_size = 3
+    return fake_client
+
+
+def test_query_reads_all_result_chunks(chunked_client):
+    rows = execute_databricks_query("SELECT * FROM t")
+
+    assert [row["id"] for row in rows] == [str(i) for i in range(10)]
+    assert chunked_client.statement_execution.chunk_requests == [1, 2, 3]
+
+
+def test_stream_fetches_chunks_lazily(chunked_client):
+    """Test that the next chunk is only requested once the previous one is consumed."""
+    stream = stream_databricks_query("SELECT * FROM t")
+
+    first = [next(stream) for _ in range(3)]
+    assert [row["id"] for row in first] == ["0", "1", "2"]
+    assert chunked_client.statement_execution.chunk_requests == []
+
+    next(stream)
+    assert chunked_client.statement_execution.chunk_requests == [1]
+
+
+def test_stream_batches_keep_columns(chunked_client):
+    batches = list(stream_databricks_batches("SELECT * FROM t"))
+
+    assert [len(batch.rows) for batch in batches] == [3, 3, 3, 1]
+    assert all(batch.columns == ["id", "name"] for batch in batches)
+
+
+def test_columnar_result(chunked_client):
+    columns = execute_databricks_query_columnar("SELECT * FROM t")
+
+    assert columns["id"] == [str(i) for i in range(10)]
+    assert columns["name"][-1] == "name-9"
+
+
+def test_columnar_result_without_rows_keeps_column_names(fake_client):
+    fake_client.statement_execution.rows = []
+
+    assert execute_databricks_query_columnar("SELECT * FROM t") == {"id": [], "name": []}
+
+
+def test_external_links_are_downloaded_with_their_headers(chunked_client):
+    with ChunkServer(chunked_client.statement_execution) as server:
+        rows = list(stream_databricks_query("SELECT * FROM t", external_links=True))
+
+    assert [row["id"] for row in rows] == [str(i) for i in range(10)]
+    assert chunked_client.statement_execution.executed[0]["disposition"].value == "EXTERNAL_LINKS"
+    assert len(server.headers) == 4
+    assert all(headers["x-chunk-key"] == "secret" for headers in server.headers)
+
+
+async def test_async_query_reads_all_result_chunks(chunked_client):
+    chunked_client.statement_execution.polls_until_done = 1
+
+    rows = await execute_databricks_query_async("SELECT * FROM t", poll_interval=0.001)
+
+    assert len(rows) == 10
+
+
+def test_arrow_result(chunked_client):
+    pyarrow = pytest.importorskip("pyarrow")
+
+    table = execute_databricks_query_arrow("SELECT * FROM t")
+
+    assert isinstance(table, pyarrow.Table)
+    assert table.num_rows == 10
+
+
+@pytest.fixture
+def typed_client(fake_client):
+    fake_client.statement_execution.column_types = [ColumnInfoTypeName.LONG, ColumnInfoTypeName.STRING]
+    return fake_client
+
+
+class TrustedCustomer(Customer):
+    __trusted_schema__ = True
+
+
+def test_typed_columnar_result_uses_manifest_types(typed_client):
+    assert execute_databricks_query_columnar("SELECT * FROM t", typed=True) == {"id": [1, 2], "name": ["a", "b"]}
+
+
+def test_query_rows_are_slotted(typed_client):
+    rows = execute_databricks_query_rows("SELECT * FROM t", name="CustomerRow")
+
+    assert [(row.id, row.name) for row in rows] == [(1, "a"), (2, "b")]
+    assert type(rows[0]).__name__ == "CustomerRow"
+    assert not hasattr(rows[0], "__dict__")
+
+
+def test_query_models_validates_untrusted_schema(fake_client):
+    """Test that string values are still coerced and checked when the schema is not trusted."""
+    assert Customer.query_models("SELECT * FROM t") == [Customer(id=1, name="a"), Customer(id=2, name="b")]
+
+    fake_client.statement_execution.rows = [["not a number", "a"]]
+    with pytest.raises(ValueError):
+        Customer.query_models("SELECT * FROM t")
+
+
+def test_queries_are_measured(fake_client):
+    """Test that execution time, result rows and rows per model end up in the metrics."""
+    executions = sum(DATABRICKS_EXECUTION_SECONDS.labels("sync", "SUCCEEDED").cells.totals()[:-1])
+    rows = DATABRICKS_RESULT_ROWS.labels().cells.totals()[0]
+    customers = DATABRICKS_MODEL_ROWS.labels("Customer").cells.totals()[0]
+
+    Customer.query_models("SELECT * FROM t")
+
+    assert sum(DATABRICKS_EXECUTION_SECONDS.labels("sync", "SUCCEEDED").cells.totals()[:-1]) == executions + 1
+    assert DATABRICKS_RESULT_ROWS.labels().cells.totals()[0] == rows + 2
+    assert DATABRICKS_MODEL_ROWS.labels("Customer").cells.totals()[0] == customers + 2
+
+
+def test_query_models_trusted_schema_skips_validation(typed_client):
+    customers = TrustedCustomer.query_models("SELECT * FROM t")
+
+    assert [(customer.id, customer.name) for customer in customers] == [(1, "a"), (2, "b")]
+    assert customers[0].model_fields_set == {"id", "name"}
+
+
+def test_from_columns_ignores_unknown_columns():
+    customers = TrustedCustomer.from_columns({"id": [1], "name": ["a"], "extra": ["x"]})
+
+    assert customers == [TrustedCustomer(id=1, name="a")]
+
+
+class TrustedCustomerWithSegment(TrustedCustomer):
+    segment: str = "retail"
+
+
+def test_trusted_schema_fills_defaults_for_missing_columns():
+    customers = TrustedCustomerWithSegment.from_columns({"id": [1], "name": ["a"]})
+
+    assert customers[0].segment == "retail"
+    assert customers[0].model_fields_set == {"id", "name"}
+
+
+class TrustedCustomerWithNotes(TrustedCustomer):
+    _notes: list[str] = PrivateAttr(default_factory=list)
+
+
+def test_trusted_schema_initializes_private_attributes():
+    customers = TrustedCustomerWithNotes.from_columns({"id": [1, 2], "name": ["a", "b"]})
+    customers[0]._notes.append("called back")
+
+    assert customers[0]._notes == ["called back"]
+    assert customers[1]._notes == []
+    assert customers[1] == TrustedCustomerWithNotes(id=2, name="b")
+
+
+class CustomerByName(DatabricksModel):
+    __catalog__ = "main"
+    __schema__ = "sales"
+    __table__ = "customers"
+    __statements__ = {
+        "fetch": "SELECT id, name FROM {table} WHERE name = :name",
+        "recent": "SELECT id, name FROM {table} ORDER BY id DESC LIMIT :limit",
+    }
+
+    id: int
+    name: str
+
+
+class CachedCustomerByName(CustomerByName):
+    __cache_ttl__ = 60
+
+
+def test_query_parameters_are_sent_as_named_parameters(fake_client):
+    execute_databricks_query("SELECT * FROM t WHERE name = :name", {"name": "o'brien"})
+
+    executed = fake_client.statement_execution.executed[0]
+    assert executed["statement"] == "SELECT * FROM t WHERE name = :name"
+    assert [(p.name, p.value) for p in executed["parameters"]] == [("name", "o'brien")]
+
+
+def test_parameter_values_are_not_logged(fake_client, caplog):
+    with caplog.at_level("INFO", logger="app.dbrx"):
+        execute_databricks_query("SELECT * FROM t WHERE email = :email", {"email": "someone@example.com"})
+
+    assert "with parameters email" in caplog.text
+    assert "someone@example.com" not in caplog.text
+
+
+def test_registered_statement_is_rendered_over_table_name():
+    assert (
+        CustomerByName.statement("recent") == "SELECT id, name FROM main.sales.customers ORDER BY id DESC LIMIT :limit"
+    )
+    with pytest.raises(KeyError, match="no statement 'missing'"):
+        CustomerByName.statement("missing")
+
+
+def test_fetch_uses_registered_statement(fake_client):
+    """Test that different filter values reuse one statement text."""
+    customers = CustomerByName.fetch(name="a")
+    CustomerByName.fetch(name="b")
+
+    assert customers == [CustomerByName(id=1, name="a"), CustomerByName(id=2, name="b")]
+    statements = {run["statement"] for run in fake_client.statement_execution.executed}
+    assert statements == {"SELECT id, name FROM main.sales.customers WHERE name = :name"}
+    assert [run["parameters"][0].value for run in fake_client.statement_execution.executed] == ["a", "b"]
+
+
+def test_cached_statement_keys_include_parameters(fake_client):
+    CachedCustomerByName.fetch(name="a")
+    CachedCustomerByName.fetch(name="a")
+    CachedCustomerByName.fetch(name="b")
+
+    assert len(fake_client.statement_execution.executed) == 2
+
+
+class LooselyTypedCustomerByName(DatabricksModel):
+    __catalog__ = "main"
+    __schema__ = "sales"
+    __table__ = "customers"
+    __statements__ = CustomerByName.__statements__
+
+    # the untyped cached path used to validate "1" against this union and keep the string
+    id: int | str
+    name: str
+
+
+class CachedLooselyTypedCustomerByName(LooselyTypedCustomerByName):
+    __cache_ttl__ = 60
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+def test_cached_run_returns_the_same_typed_rows(typed_client, trusted):
+    class Uncached(LooselyTypedCustomerByName):
+        __trusted_schema__ = trusted
+
+    class Cached(CachedLooselyTypedCustomerByName):
+        __trusted_schema__ = trusted
+
+    uncached = Uncached.run("recent", limit=5)
+    cached = Cached.run("recent", limit=5)
+    again = Cached.run("recent", limit=5)
+
+    assert [customer.model_dump() for customer in cached] == [customer.model_dump() for customer in uncached]
+    assert [customer.model_dump() for customer in again] == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+    assert again[0] is not cached[0]
+    assert len(typed_client.statement_execution.executed) == 2
+
+
+def test_run_other_statement(fake_client):
+    CustomerByName.run("recent", limit=5)
+
+    assert fake_client.statement_execution.executed[0]["parameters"][0].type == "BIGINT"
+
+
+async def test_async_query_with_parameters(fake_client):
+    await execute_databricks_query_async("SELECT :x", {"x": 1}, poll_interval=0.001)
+
+    assert fake_client.statement_execution.executed[0]["parameters"][0].value == "1"
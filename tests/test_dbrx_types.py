@@ -0,0 +1,84 @@
+"""Tests for column-wise conversion of Databricks result values."""
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("databricks.sdk")
+
+from databricks.sdk.service.sql import ColumnInfoTypeName  # noqa: E402
+
+from app.dbrx_types import convert_column, row_type, rows_from_columns, statement_parameters  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    ("type_name", "raw", "expected"),
+    [
+        (ColumnInfoTypeName.LONG, "42", 42),
+        (ColumnInfoTypeName.INT, "-7", -7),
+        (ColumnInfoTypeName.DOUBLE, "1.5", 1.5),
+        (ColumnInfoTypeName.DECIMAL, "10.25", Decimal("10.25")),
+        (ColumnInfoTypeName.BOOLEAN, "true", True),
+        (ColumnInfoTypeName.BOOLEAN, "false", False),
+        (ColumnInfoTypeName.DATE, "2024-02-29", date(2024, 2, 29)),
+        (ColumnInfoTypeName.TIMESTAMP, "2024-01-01T10:00:00.000Z", datetime(2024, 1, 1, 10, tzinfo=timezone.utc)),
+        (ColumnInfoTypeName.BINARY, "aGk=", b"hi"),
+        (ColumnInfoTypeName.ARRAY, "[1,2]", [1, 2]),
+        (ColumnInfoTypeName.STRING, "text", "text"),
+        (None, "raw", "raw"),
+    ],
+)
+def test_convert_column(type_name, raw, expected):
+    assert convert_column([raw], type_name) == [expected]
+
+
+def test_convert_column_keeps_nulls():
+    assert convert_column(("1", None, "3"), ColumnInfoTypeName.LONG) == [1, None, 3]
+
+
+def test_row_type_is_slotted_and_reused():
+    Row = row_type("Row", ("id", "name"))
+
+    row = Row(1, "a")
+
+    assert (row.id, row.name) == (1, "a")
+    assert not hasattr(row, "__dict__")
+    assert row_type("Row", ("id", "name")) is Row
+
+
+def test_rows_from_columns():
+    rows = rows_from_columns({"id": [1, 2], "name": ["a", "b"]})
+
+    assert [(row.id, row.name) for row in rows] == [(1, "a"), (2, "b")]
+
+
+def test_statement_parameters_are_typed():
+    params = statement_parameters(
+        {
+            "email": "a@b.c",
+            "limit": 10,
+            "ratio": 0.5,
+            "amount": Decimal("12.50"),
+            "active": True,
+            "since": date(2024, 1, 2),
+            "at": datetime(2024, 1, 2, 3, 4, 5),
+            "missing": None,
+        }
+    )
+
+    assert [(p.name, p.value, p.type) for p in params] == [
+        ("email", "a@b.c", "STRING"),
+        ("limit", "10", "BIGINT"),
+        ("ratio", "0.5", "DOUBLE"),
+        ("amount", "12.50", "DECIMAL(38,2)"),
+        ("active", "true", "BOOLEAN"),
+        ("since", "2024-01-02", "DATE"),
+        ("at", "2024-01-02T03:04:05", "TIMESTAMP"),
+        ("missing", None, None),
+    ]
+
+
+def test_statement_parameters_reject_unsupported_types():
+    with pytest.raises(TypeError, match="ids"):
+        statement_parameters({"ids": [1, 2]})
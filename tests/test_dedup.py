@@ -0,0 +1,136 @@
+"""Tests for duplicate contact inquiry suppression."""
+
+import asyncio
+
+import pytest
+from sqlmodel import select
+
+from app.database import dispose_async_engine, get_session, reset_db
+from app.dedup import DuplicateGuard, DuplicateInquiry, inquiry_fingerprint
+from app.inquiry_buffer import InquiryWriteBuffer
+from app.models import ContactInquiry, ContactInquiryCreate
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+async def new_db():
+    reset_db()
+    yield
+    await dispose_async_engine()
+    reset_db()
+
+
+def stored_count() -> int:
+    with get_session() as session:
+        return len(session.exec(select(ContactInquiry)).all())
+
+
+def make_inquiry(message: str = "Kami tertarik berinvestasi.") -> ContactInquiryCreate:
+    return ContactInquiryCreate(name="Siti", email="siti@venture.co.id", company="Venture", message=message)
+
+
+def test_fingerprint_normalizes_email_and_whitespace():
+    assert inquiry_fingerprint(" Siti@Venture.co.id", "Kami  tertarik\n berinvestasi") == inquiry_fingerprint(
+        "siti@venture.co.id", "kami tertarik berinvestasi"
+    )
+    assert inquiry_fingerprint("siti@venture.co.id", "Halo") != inquiry_fingerprint("siti@venture.co.id", "Hai")
+
+
+def test_guard_rejects_within_window_and_expires():
+    clock = Clock()
+    guard = DuplicateGuard(window=60, clock=clock)
+
+    assert guard.claim("a")
+    assert not guard.claim("a")
+    clock.now += 61
+    assert guard.claim("a")
+
+    assert guard.stats()["checked"] == 3
+    assert guard.stats()["duplicates"] == 1
+
+
+def test_guard_evicts_oldest_when_full():
+    guard = DuplicateGuard(window=60, max_entries=2, clock=Clock())
+
+    for fingerprint in "abc":
+        assert guard.claim(fingerprint)
+
+    assert guard.claim("a")
+    assert not guard.claim("c")
+    assert guard.stats()["entries"] == 2
+    assert guard.stats()["evictions"] == 2
+
+
+def test_guard_release_allows_retry():
+    guard = DuplicateGuard(clock=Clock())
+    guard.claim("a")
+    guard.release("a")
+    assert guard.claim("a")
+
+
+def test_dedup_key_changes_per_window_bucket():
+    clock = Clock(600.0)
+    guard = DuplicateGuard(window=600, clock=clock)
+    key = guard.dedup_key("a")
+    clock.now += 599
+    assert guard.dedup_key("a") == key
+    clock.now += 1
+    assert guard.dedup_key("a") != key
+
+
+def test_invalid_guard_settings_rejected():
+    with pytest.raises(ValueError):
+        DuplicateGuard(window=0)
+    with pytest.raises(ValueError):
+        DuplicateGuard(max_entries=0)
+
+
+async def test_buffer_rejects_duplicate_before_queueing(new_db):
+    """Test that a repeat within the window never reaches the database."""
+    buffer = InquiryWriteBuffer(max_batch_size=10, max_delay=0.01, guard=DuplicateGuard(clock=Clock()))
+
+    first = await buffer.submit(make_inquiry())
+    with pytest.raises(DuplicateInquiry):
+        await buffer.submit(make_inquiry("kami tertarik  berinvestasi."))
+
+    assert first is not None
+    assert first.dedup_key is not None
+    assert buffer.pending == 0
+    assert stored_count() == 1
+    assert (await buffer.submit(make_inquiry("Pesan lain"))) is not None
+
+
+async def test_database_rejects_duplicate_from_another_process(new_db):
+    """Test that the unique dedup_key catches a repeat the in-memory guard has not seen."""
+    clock = Clock()
+    first, second = (
+        InquiryWriteBuffer(max_batch_size=10, max_delay=0.01, guard=DuplicateGuard(clock=clock)) for _ in range(2)
+    )
+
+    assert (await first.submit(make_inquiry())) is not None
+    results = await asyncio.gather(
+        second.submit(make_inquiry()), second.submit(make_inquiry("Pesan lain")), return_exceptions=True
+    )
+
+    assert isinstance(results[0], DuplicateInquiry)
+    assert isinstance(results[1], ContactInquiry)
+    assert second.guard is not None and second.guard.stats()["db_duplicates"] == 1
+    assert stored_count() == 2
+
+
+async def test_failed_batch_releases_fingerprints(new_db):
+    """Test that a submission that could not be stored can be sent again."""
+    guard = DuplicateGuard(clock=Clock())
+    buffer = InquiryWriteBuffer(max_batch_size=1, max_delay=0.01, guard=guard)
+    too_long = ContactInquiryCreate.model_construct(name="A", email="a@b.co", company="X" * 300, message="Hi")
+
+    assert (await buffer.submit(too_long)) is None
+
+    assert guard.stats()["entries"] == 0
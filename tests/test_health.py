@@ -0,0 +1,160 @@
+"""Tests for the cached dependency checks behind /health/ready."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.database import dispose_async_engine
+from app.health import CachedCheck, create_router, probe_database
+from app.startup import startup_report
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingProbe:
+    def __init__(self, delay: float = 0.0, error: Exception | None = None) -> None:
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self) -> str | None:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return None
+
+
+@pytest.fixture
+def ready_app():
+    """Pretend startup finished so /health/ready gets as far as the dependency checks."""
+    saved = startup_report.ready
+    startup_report.ready = True
+    yield
+    startup_report.ready = saved
+
+
+async def get(checks: list[CachedCheck], path: str) -> httpx.Response:
+    api = FastAPI()
+    api.include_router(create_router(checks))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(api), base_url="http://test") as client:
+        return await client.get(path)
+
+
+async def test_result_is_cached_for_ttl():
+    clock = FakeClock()
+    probe = CountingProbe()
+    check = CachedCheck("db", probe, ttl=2.0, clock=clock)
+
+    await check.result()
+    clock.now = 1.9
+    await check.result()
+    assert probe.calls == 1
+
+    clock.now = 2.0
+    await check.result()
+    assert probe.calls == 2
+
+
+async def test_concurrent_callers_share_one_probe():
+    """Test that a burst of readiness probes costs one query, not one per probe."""
+    probe = CountingProbe(delay=0.05)
+    check = CachedCheck("db", probe, ttl=2.0)
+
+    results = await asyncio.gather(*(check.result() for _ in range(20)))
+
+    assert probe.calls == 1
+    assert all(result.ok for result in results)
+
+
+async def test_slow_probe_times_out():
+    check = CachedCheck("db", CountingProbe(delay=1.0), timeout=0.05)
+
+    result = await check.result()
+
+    assert not result.ok
+    assert result.detail is not None and "timed out" in result.detail
+    assert result.latency_ms < 1000
+
+
+async def test_database_probe_reports_latency():
+    try:
+        result = await CachedCheck("database", probe_database).result()
+    finally:
+        await dispose_async_engine()
+
+    assert result.ok
+    assert result.latency_ms > 0
+
+
+async def test_failing_required_check_makes_app_unready(ready_app):
+    checks = [CachedCheck("database", CountingProbe(error=ConnectionError("connection refused")))]
+
+    response = await get(checks, "/health/ready")
+
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "unavailable"
+    assert body["checks"]["database"] == {
+        "ok": False,
+        "latency_ms": body["checks"]["database"]["latency_ms"],
+        "age_s": body["checks"]["database"]["age_s"],
+        "detail": "connection refused",
+    }
+
+
+async def test_failing_optional_check_is_reported_only(ready_app):
+    checks = [
+        CachedCheck("database", CountingProbe()),
+        CachedCheck("databricks", CountingProbe(error=RuntimeError("warehouse gone")), required=False),
+    ]
+
+    response = await get(checks, "/health/ready")
+
+    assert response.status_code == 200
+    assert response.json()["checks"]["databricks"]["ok"] is False
+
+
+async def test_live_does_not_run_checks():
+    probe = CountingProbe(error=ConnectionError("connection refused"))
+
+    response = await get([CachedCheck("database", probe)], "/health/live")
+
+    assert response.status_code == 200
+    assert probe.calls == 0
+
+
+async def test_databricks_probe_reads_warehouse_state():
+    pytest.importorskip("databricks.sdk")
+    from databricks.sdk.service.sql import State
+
+    from app.dbrx import set_workspace_client
+    from app.health import probe_databricks
+    from dbrx_fakes import FakeWorkspaceClient, warehouse
+
+    set_workspace_client(FakeWorkspaceClient(warehouses=[warehouse("wh-1", State.STARTING)]))  # type: ignore[arg-type]
+    try:
+        result = await CachedCheck("databricks", probe_databricks, timeout=5.0).result()
+    finally:
+        set_workspace_client(None)
+
+    assert result.ok
+    assert result.detail == "STARTING"
+
+
+async def test_query_cache_stats_are_served():
+    pytest.importorskip("databricks.sdk")
+    from app.dbrx import query_cache
+
+    response = await get([], "/health/query-cache")
+
+    assert response.status_code == 200
+    assert response.json()["hits"] == query_cache.stats()["hits"]
@@ -0,0 +1,129 @@
+"""Tests for the inquiry listing and export API."""
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import insert
+
+from app.database import ENGINE, dispose_async_engine, reset_db
+from app.inquiry_api import create_router, decode_cursor, encode_cursor
+from app.inquiry_storage import INQUIRY_TABLE
+
+TOKEN = "test-token"
+START = datetime(2024, 1, 1, 12, 0)
+
+
+@pytest.fixture
+def inquiries():
+    """25 inquiries, one per minute, with two sharing a timestamp to exercise the id tie-breaker."""
+    reset_db()
+    rows = [
+        {
+            "name": f"Name {i}",
+            "email": "repeat@example.com" if i % 5 == 0 else f"user{i}@example.com",
+            "company": "Acme, Inc.",
+            "message": f'Line one\nline "two" {i}',
+            "created_at": START + timedelta(minutes=min(i, 23)),
+        }
+        for i in range(25)
+    ]
+    with ENGINE.begin() as conn:
+        conn.execute(insert(INQUIRY_TABLE), rows)
+    yield rows
+    reset_db()
+
+
+@pytest.fixture
+async def client():
+    api = FastAPI()
+    api.include_router(create_router(TOKEN))
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test", headers={"Authorization": f"Bearer {TOKEN}"}
+    ) as client:
+        yield client
+    await dispose_async_engine()
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(START, 7)) == (START, 7)
+
+
+async def test_requires_token(client, inquiries):
+    for headers in ({"Authorization": "Bearer wrong"}, {"Authorization": ""}):
+        response = await client.get("/api/inquiries", headers=headers)
+        assert response.status_code == 401
+    assert (await client.get("/api/inquiries/export", headers={"Authorization": "Bearer wrong"})).status_code == 401
+
+
+async def test_keyset_pagination_visits_every_row_once(client, inquiries):
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 10} | ({"cursor": cursor} if cursor else {})
+        page = (await client.get("/api/inquiries", params=params)).json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 25
+    assert len(set(seen)) == 25
+    assert seen[0] == max(seen)
+
+
+async def test_listing_filters_by_email(client, inquiries):
+    page = (await client.get("/api/inquiries", params={"email": " Repeat@Example.com"})).json()
+
+    assert {item["email"] for item in page["items"]} == {"repeat@example.com"}
+    assert len(page["items"]) == 5
+    assert page["next_cursor"] is None
+
+
+async def test_invalid_cursor(client, inquiries):
+    assert (await client.get("/api/inquiries", params={"cursor": "not-a-cursor"})).status_code == 400
+    assert (await client.get("/api/inquiries", params={"cursor": encode_cursor(START, 1)[:-3]})).status_code == 400
+
+
+async def test_csv_export(client, inquiries):
+    response = await client.get("/api/inquiries/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 25
+    assert rows[-1]["message"] == 'Line one\nline "two" 0'
+    assert rows[-1]["created_at"] == START.isoformat()
+
+
+async def test_csv_export_neutralizes_formulas(client, inquiries):
+    payloads = ['=HYPERLINK("http://evil.example","x")', "+1+1", "-2+3", "@SUM(A1)", "\t=1", "\r=1"]
+    rows = [
+        {"name": payload, "email": f"formula{i}@example.com", "company": "C", "message": "M", "created_at": START}
+        for i, payload in enumerate(payloads)
+    ]
+    with ENGINE.begin() as conn:
+        conn.execute(insert(INQUIRY_TABLE), rows)
+
+    response = await client.get("/api/inquiries/export", params={"format": "csv", "email": "formula0@example.com"})
+    exported = list(csv.DictReader(io.StringIO(response.text)))
+    assert exported[0]["name"] == """'=HYPERLINK("http://evil.example","x")"""
+    assert exported[0]["created_at"] == START.isoformat()
+
+    response = await client.get("/api/inquiries/export", params={"format": "csv"})
+    names = {row["name"] for row in csv.DictReader(io.StringIO(response.text)) if row["email"].startswith("formula")}
+    assert names == {f"'{payload}" for payload in payloads}
+
+
+async def test_ndjson_export_with_filter(client, inquiries):
+    response = await client.get("/api/inquiries/export", params={"format": "ndjson", "since": "2024-01-01T12:20:00"})
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert len(records) == 5
+    assert all(record["created_at"] >= "2024-01-01T12:20:00" for record in records)
@@ -0,0 +1,155 @@
+"""Tests for contact_inquiries partitioning and the retention job."""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import inspect, insert, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.database import ENGINE, create_tables, reset_db
+from app.inquiry_storage import ARCHIVE_TABLE, INQUIRY_TABLE, add_months, is_partitioned, partition_month, partitions
+from app.migrations import SCHEMA_VERSION_TABLE, migrate
+from app.retention import expire_inquiries
+
+INDEXES = {"ix_contact_inquiries_created_at", "ix_contact_inquiries_email_created_at"}
+
+
+def _drop_storage() -> None:
+    with ENGINE.begin() as conn:
+        for table in inspect(conn).get_table_names():
+            if table.startswith(INQUIRY_TABLE.name) or table == SCHEMA_VERSION_TABLE:
+                conn.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+
+
+@pytest.fixture
+def clean_storage():
+    """Start without any contact_inquiries tables and restore the regular table afterwards."""
+    _drop_storage()
+    yield
+    _drop_storage()
+    reset_db()
+
+
+def _insert(*created_at: datetime) -> None:
+    rows = [
+        {"name": "N", "email": f"user{i}@example.com", "company": "C", "message": "M", "created_at": ts}
+        for i, ts in enumerate(created_at)
+    ]
+    with ENGINE.begin() as conn:
+        conn.execute(insert(INQUIRY_TABLE), rows)
+
+
+def _count(table: str) -> int:
+    with ENGINE.connect() as conn:
+        return conn.execute(text(f"SELECT count(*) FROM {table}")).scalar_one()
+
+
+def _indexes() -> set[str]:
+    return {index["name"] for index in inspect(ENGINE).get_indexes(INQUIRY_TABLE.name)}
+
+
+def test_add_months():
+    assert add_months(date(2024, 11, 1), 2) == date(2025, 1, 1)
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+
+
+def test_partition_month():
+    assert partition_month("contact_inquiries_p202402") == date(2024, 2, 1)
+    assert partition_month("contact_inquiries_default") is None
+
+
+def test_monthly_partitioning(clean_storage):
+    migrate(ENGINE, partitioning="monthly", today=date(2024, 11, 15))
+    migrate(ENGINE, partitioning="monthly", today=date(2024, 11, 15))
+
+    with ENGINE.connect() as conn:
+        assert is_partitioned(conn)
+        assert partitions(conn) == [
+            "contact_inquiries_default",
+            "contact_inquiries_p202411",
+            "contact_inquiries_p202412",
+            "contact_inquiries_p202501",
+            "contact_inquiries_p202502",
+        ]
+    assert INDEXES <= _indexes()
+
+    _insert(datetime(2024, 11, 20), datetime(2020, 1, 1))
+    assert _count("contact_inquiries_p202411") == 1
+    assert _count("contact_inquiries_default") == 1
+
+
+def test_new_partition_takes_over_rows_from_default_partition(clean_storage):
+    """Test that a month whose rows already went to the default partition still gets its partition."""
+    migrate(ENGINE, partitioning="monthly", today=date(2024, 11, 15))
+    _insert(datetime(2025, 6, 3), datetime(2025, 6, 4), datetime(2030, 1, 1))
+
+    migrate(ENGINE, partitioning="monthly", today=date(2025, 6, 1))
+
+    assert _count("contact_inquiries_p202506") == 2
+    assert _count("contact_inquiries_default") == 1
+    assert _count(INQUIRY_TABLE.name) == 3
+
+
+def test_dedup_key_is_unique_within_each_partition(clean_storage):
+    migrate(ENGINE, partitioning="monthly", today=date(2024, 11, 15))
+    migrate(ENGINE, partitioning="monthly", today=date(2025, 1, 15))
+
+    with ENGINE.connect() as conn:
+        for partition in partitions(conn):
+            unique = {index["name"] for index in inspect(conn).get_indexes(partition) if index["unique"]}
+            assert unique == {f"ux_{partition}_dedup_key"}
+
+    row = {"name": "N", "email": "user@example.com", "company": "C", "message": "M", "dedup_key": "same"}
+    statement = pg_insert(INQUIRY_TABLE).on_conflict_do_nothing().returning(INQUIRY_TABLE.c.id)
+    with ENGINE.begin() as conn:
+        first = conn.execute(statement, {**row, "created_at": datetime(2024, 11, 20, 10)}).all()
+        repeated = conn.execute(statement, {**row, "created_at": datetime(2024, 11, 20, 11)}).all()
+    assert len(first) == 1
+    assert repeated == []
+
+
+def test_unknown_partitioning_mode_raises(clean_storage):
+    with pytest.raises(ValueError, match="weekly"):
+        migrate(ENGINE, partitioning="weekly")
+
+
+def test_retention_archives_old_rows_in_batches(clean_storage):
+    create_tables()
+    now = datetime.utcnow()
+    _insert(*[now - timedelta(days=400 + i) for i in range(5)], now - timedelta(days=1))
+
+    result = expire_inquiries(ENGINE, timedelta(days=365), batch_size=2)
+
+    assert result.rows == 5
+    assert result.batches == 3
+    assert _count(INQUIRY_TABLE.name) == 1
+    assert _count(ARCHIVE_TABLE.name) == 5
+
+
+def test_retention_delete(clean_storage):
+    create_tables()
+    now = datetime.utcnow()
+    _insert(now - timedelta(days=400), now)
+
+    result = expire_inquiries(ENGINE, timedelta(days=365), archive=False)
+
+    assert result.rows == 1
+    assert _count(INQUIRY_TABLE.name) == 1
+    assert not inspect(ENGINE).has_table(ARCHIVE_TABLE.name)
+
+
+def test_retention_detaches_old_partitions(clean_storage):
+    """Test that whole months before the cutoff are detached instead of moved row by row."""
+    old_month = add_months(datetime.utcnow().date().replace(day=1), -24)
+    migrate(ENGINE, partitioning="monthly", today=old_month)
+    _insert(datetime.combine(old_month, datetime.min.time()), datetime.utcnow())
+
+    result = expire_inquiries(ENGINE, timedelta(days=365))
+
+    detached = f"contact_inquiries_p{old_month:%Y%m}"
+    assert detached in result.partitions
+    assert result.rows == 0
+    assert _count(INQUIRY_TABLE.name) == 1
+    assert _count(detached) == 1
+    with ENGINE.connect() as conn:
+        assert detached not in partitions(conn)
@@ -0,0 +1,51 @@
+"""Tests for the declarative landing page sections and their builder."""
+
+import dataclasses
+
+import pytest
+from nicegui import Client, app, ui
+from nicegui.elements.colors import Colors
+from nicegui.testing import User
+
+from app import landing_content as content
+from app.landing_sections import SECTIONS, Label, classes, install_theme, theme_head_html
+
+
+def landing_client() -> Client:
+    return next(client for client in Client.instances.values() if not client.shared and client.elements)
+
+
+def test_sections_are_frozen_and_pre_split():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        SECTIONS[0].classes = ()  # type: ignore[misc]
+
+    assert classes("  p-6  max-w-sm ") == ("p-6", "max-w-sm")
+    labels = [block for section in SECTIONS for block in section.blocks if isinstance(block, Label)]
+    assert all(" " not in name for label in labels for name in label.classes)
+
+
+async def test_builder_applies_classes_and_props(user: User) -> None:
+    await user.open("/")
+
+    slot = next(iter(user.find(content.PROBLEMS[0]).elements)).parent_slot
+    assert slot is not None
+    card = slot.parent
+    assert "shadow-lg" in card.classes
+    icons = [element for element in card.descendants() if isinstance(element, ui.icon)]
+    assert icons[0].props["name"] == "error_outline"
+    assert icons[0].props["color"] == "negative"
+    anchors = [element for element in landing_client().elements.values() if element.props.get("id")]
+    assert [element.props["id"] for element in anchors] == [content.CONTACT_ANCHOR]
+
+
+async def test_theme_is_installed_once_for_every_page(user: User) -> None:
+    install_theme()
+    install_theme()
+    await user.open("/")
+
+    assert Client.shared_head_html.count(theme_head_html()) == 1
+    assert not any(isinstance(element, Colors) for element in landing_client().elements.values())
+    # Quasar applies the brand config as inline variables on <body>, over anything set on :root
+    assert app.config.quasar_config["brand"].items() >= content.THEME_COLORS.items()
+    page = await user.http_client.get("/")
+    assert f'"primary":"{content.THEME_COLORS["primary"]}"' in page.text
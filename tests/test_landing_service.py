@@ -1,9 +1,10 @@
-"""Tests for landing page service functionality."""
+"""Tests for storing contact inquiries the way the landing page form does."""
 
+import asyncio
 import pytest
-from app.landing import create_contact_inquiry
-from app.models import ContactInquiryCreate
-from app.database import get_session
+from app.inquiry_buffer import InquiryWriteBuffer
+from app.models import ContactInquiry, ContactInquiryCreate
+from app.database import dispose_async_engine, get_session
 from sqlmodel import select
 
 
@@ -17,6 +18,18 @@ def new_db():
     reset_db()
 
 
+@pytest.fixture
+async def async_engine():
+    """Release pooled asyncpg connections before the test's event loop closes."""
+    yield
+    await dispose_async_engine()
+
+
+async def store(data: ContactInquiryCreate) -> ContactInquiry | None:
+    """Store `data` through a write buffer, as the contact form does."""
+    return await InquiryWriteBuffer(max_delay=0).submit(data)
+
+
 @pytest.fixture
 def sample_inquiry_data():
     """Provide sample contact inquiry data for tests."""
@@ -28,9 +41,9 @@ def sample_inquiry_data():
     )
 
 
-def test_create_contact_inquiry_success(new_db, sample_inquiry_data):
+async def test_store_inquiry_success(new_db, async_engine, sample_inquiry_data):
     """Test successful creation of contact inquiry."""
-    inquiry = create_contact_inquiry(sample_inquiry_data)
+    inquiry = await store(sample_inquiry_data)
 
     assert inquiry is not None
     assert inquiry.id is not None
@@ -44,9 +57,9 @@ def test_create_contact_inquiry_success(new_db, sample_inquiry_data):
     assert inquiry.created_at is not None
 
 
-def test_create_contact_inquiry_stores_in_database(new_db, sample_inquiry_data):
+async def test_store_inquiry_stores_in_database(new_db, async_engine, sample_inquiry_data):
     """Test that contact inquiry is properly stored in database."""
-    inquiry = create_contact_inquiry(sample_inquiry_data)
+    inquiry = await store(sample_inquiry_data)
     assert inquiry is not None
 
     # Verify it's stored in database
@@ -57,30 +70,30 @@ def test_create_contact_inquiry_stores_in_database(new_db, sample_inquiry_data):
         assert stored_inquiry.email == "john.doe@example.com"
 
 
-def test_create_contact_inquiry_with_long_message(new_db):
+async def test_store_inquiry_with_long_message(new_db, async_engine):
     """Test contact inquiry with maximum length message."""
     long_message = "A" * 2000  # Maximum allowed length
     inquiry_data = ContactInquiryCreate(
         name="Jane Smith", email="jane@company.com", company="Big Corp", message=long_message
     )
 
-    inquiry = create_contact_inquiry(inquiry_data)
+    inquiry = await store(inquiry_data)
     assert inquiry is not None
     assert inquiry.message == long_message
 
 
-def test_create_contact_inquiry_normalizes_email(new_db):
+async def test_store_inquiry_normalizes_email(new_db, async_engine):
     """Test that email is stored in lowercase."""
     inquiry_data = ContactInquiryCreate(
         name="Test User", email="TEST.USER@EXAMPLE.COM", company="Test Company", message="Test message"
     )
 
-    inquiry = create_contact_inquiry(inquiry_data)
+    inquiry = await store(inquiry_data)
     assert inquiry is not None
     assert inquiry.email == "test.user@example.com"
 
 
-def test_create_contact_inquiry_with_unicode_characters(new_db):
+async def test_store_inquiry_with_unicode_characters(new_db, async_engine):
     """Test contact inquiry with Indonesian characters."""
     inquiry_data = ContactInquiryCreate(
         name="Budi Santoso",
@@ -89,14 +102,14 @@ def test_create_contact_inquiry_with_unicode_characters(new_db):
         message="Kami tertarik dengan solusi AI untuk meningkatkan efisiensi bisnis kami.",
     )
 
-    inquiry = create_contact_inquiry(inquiry_data)
+    inquiry = await store(inquiry_data)
     assert inquiry is not None
     assert inquiry.name == "Budi Santoso"
     assert inquiry.company == "PT Teknologi Maju"
     assert "efisiensi" in inquiry.message
 
 
-def test_multiple_inquiries_from_same_email(new_db):
+async def test_multiple_inquiries_from_same_email(new_db, async_engine):
     """Test that multiple inquiries from same email are allowed."""
     inquiry_data_1 = ContactInquiryCreate(
         name="John Doe", email="john@company.com", company="Company A", message="First inquiry"
@@ -105,8 +118,8 @@ def test_multiple_inquiries_from_same_email(new_db):
         name="John Doe", email="john@company.com", company="Company B", message="Second inquiry"
     )
 
-    inquiry1 = create_contact_inquiry(inquiry_data_1)
-    inquiry2 = create_contact_inquiry(inquiry_data_2)
+    inquiry1 = await store(inquiry_data_1)
+    inquiry2 = await store(inquiry_data_2)
 
     assert inquiry1 is not None
     assert inquiry2 is not None
@@ -115,28 +128,26 @@ def test_multiple_inquiries_from_same_email(new_db):
     assert inquiry2.company == "Company B"
 
 
-def test_inquiry_timestamps_are_different(new_db):
+async def test_inquiry_timestamps_are_different(new_db, async_engine):
     """Test that inquiries created at different times have different timestamps."""
-    import time
-
     inquiry_data = ContactInquiryCreate(
         name="Test User", email="test@example.com", company="Test Co", message="Test message"
     )
 
-    inquiry1 = create_contact_inquiry(inquiry_data)
-    time.sleep(0.001)  # Small delay to ensure different timestamps
-    inquiry2 = create_contact_inquiry(inquiry_data)
+    inquiry1 = await store(inquiry_data)
+    await asyncio.sleep(0.001)  # Small delay to ensure different timestamps
+    inquiry2 = await store(inquiry_data)
 
     assert inquiry1 is not None
     assert inquiry2 is not None
     assert inquiry1.created_at != inquiry2.created_at
 
 
-def test_create_contact_inquiry_with_minimal_data(new_db):
+async def test_store_inquiry_with_minimal_data(new_db, async_engine):
     """Test contact inquiry with minimal required data."""
     inquiry_data = ContactInquiryCreate(name="A", email="a@b.co", company="X", message="Hi")
 
-    inquiry = create_contact_inquiry(inquiry_data)
+    inquiry = await store(inquiry_data)
     assert inquiry is not None
     assert inquiry.name == "A"
     assert inquiry.email == "a@b.co"
@@ -144,7 +155,7 @@ def test_create_contact_inquiry_with_minimal_data(new_db):
     assert inquiry.message == "Hi"
 
 
-def test_query_all_inquiries(new_db):
+async def test_query_all_inquiries(new_db, async_engine):
     """Test querying all contact inquiries."""
     # Create multiple inquiries
     inquiries_data = [
@@ -155,14 +166,12 @@ def test_query_all_inquiries(new_db):
 
     created_inquiries = []
     for data in inquiries_data:
-        inquiry = create_contact_inquiry(data)
+        inquiry = await store(data)
         assert inquiry is not None
         created_inquiries.append(inquiry)
 
     # Query all inquiries
     with get_session() as session:
-        from app.models import ContactInquiry
-
         all_inquiries = session.exec(select(ContactInquiry)).all()
         assert len(all_inquiries) == 3
 
@@ -171,3 +180,19 @@ def test_query_all_inquiries(new_db):
         assert "User 1" in names
         assert "User 2" in names
         assert "User 3" in names
+
+
+async def test_concurrent_submissions_are_stored_with_distinct_ids(new_db, async_engine):
+    """Test that concurrent submissions, batched by one buffer, are all stored with distinct ids."""
+    inquiries_data = [
+        ContactInquiryCreate(name=f"User {i}", email=f"user{i}@test.com", company=f"Co {i}", message=f"Msg {i}")
+        for i in range(20)
+    ]
+
+    buffer = InquiryWriteBuffer(max_batch_size=8)
+    inquiries = await asyncio.gather(*(buffer.submit(data) for data in inquiries_data))
+
+    ids = {inquiry.id for inquiry in inquiries if inquiry is not None}
+    assert len(ids) == 20
+    with get_session() as session:
+        assert len(session.exec(select(ContactInquiry)).all()) == 20
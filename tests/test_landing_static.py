@@ -0,0 +1,101 @@
+"""Tests for the pre-rendered landing page and the standalone contact form page."""
+
+from nicegui.testing import User
+from starlette.requests import Request
+
+from app import landing_content as content
+from app.landing_static import CONTACT_FORM_PATH, render_landing_html, rendered_landing_page, static_landing_response
+
+
+def make_request(headers: dict[str, str] | None = None) -> Request:
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers, "query_string": b""})
+
+
+def test_render_contains_all_sections():
+    """Test that every piece of landing page copy ends up in the static HTML."""
+    html = render_landing_html()
+
+    for text in (
+        content.PROBLEMS_TITLE,
+        content.SOLUTION_TITLE,
+        content.MARKETS_TITLE,
+        content.OPPORTUNITIES_TITLE,
+        content.INVESTMENT_TITLE,
+        content.CONTACT_TITLE,
+        content.CONTACT_INTRO,
+        content.FOOTER_TEXT,
+    ):
+        assert text in html
+    for product in content.PRODUCTS:
+        assert product["name"] in html
+    for item in content.MARKETS + content.OPPORTUNITIES:
+        assert item.replace("&", "&amp;") in html
+    # HTML special characters are escaped
+    assert "Regulasi &amp; compliance makin kompleks" in html
+
+
+def test_render_embeds_contact_form_lazily():
+    html = render_landing_html()
+
+    assert f'<iframe src="{CONTACT_FORM_PATH}" loading="lazy"' in html
+    assert f'id="{content.CONTACT_ANCHOR}"' in html
+    assert "<input" not in html
+
+
+def test_rendered_page_is_cached():
+    assert rendered_landing_page() is rendered_landing_page()
+
+
+async def test_static_response_has_validators():
+    response = await static_landing_response(make_request())
+    page = rendered_landing_page()
+
+    assert response.status_code == 200
+    assert response.body == page.body
+    assert response.headers["etag"] == page.etag
+    assert response.headers["last-modified"] == page.last_modified_header
+    assert response.headers["content-type"] == "text/html; charset=utf-8"
+
+
+async def test_static_response_not_modified_by_etag():
+    """Test that a matching (strong or weak) ETag yields an empty 304."""
+    page = rendered_landing_page()
+
+    for if_none_match in (page.etag, f"W/{page.etag}", f'"other", {page.etag}', "*"):
+        response = await static_landing_response(make_request({"If-None-Match": if_none_match}))
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == page.etag
+
+
+async def test_static_response_etag_takes_precedence():
+    page = rendered_landing_page()
+
+    response = await static_landing_response(
+        make_request({"If-None-Match": '"stale"', "If-Modified-Since": page.last_modified_header})
+    )
+
+    assert response.status_code == 200
+
+
+async def test_static_response_not_modified_since():
+    page = rendered_landing_page()
+
+    fresh = await static_landing_response(make_request({"If-Modified-Since": page.last_modified_header}))
+    stale = await static_landing_response(make_request({"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}))
+    invalid = await static_landing_response(make_request({"If-Modified-Since": "yesterday"}))
+
+    assert fresh.status_code == 304
+    assert stale.status_code == 200
+    assert invalid.status_code == 200
+
+
+async def test_contact_form_page_only_has_form(user: User) -> None:
+    """Test that the embeddable page carries the live form but none of the marketing sections."""
+    await user.open(CONTACT_FORM_PATH)
+
+    await user.should_see("Kirim Pesan")
+    await user.should_see("Nama")
+    await user.should_not_see(content.PROBLEMS_TITLE)
+    await user.should_not_see(content.HERO_TITLE)
@@ -1,9 +1,12 @@
 """Smoke tests for landing page UI functionality."""
 
+import asyncio
+
 import pytest
+from nicegui import ui
 from nicegui.testing import User
 from app.models import ContactInquiry
-from app.database import get_session
+from app.database import dispose_async_engine, get_session
 from sqlmodel import select
 
 
@@ -17,6 +20,13 @@ def new_db():
     reset_db()
 
 
+@pytest.fixture
+async def async_engine():
+    """Release pooled asyncpg connections before the test's event loop closes."""
+    yield
+    await dispose_async_engine()
+
+
 async def test_landing_page_loads(user: User) -> None:
     """Test that the landing page loads successfully."""
     await user.open("/")
@@ -114,12 +124,12 @@ async def test_contact_form_elements(user: User) -> None:
     await user.should_see("Kirim Pesan")
 
 
-async def test_contact_form_submission_success(user: User, new_db) -> None:
+async def test_contact_form_submission_success(user: User, new_db, async_engine) -> None:
     """Test successful contact form submission functionality."""
     await user.open("/")
 
-    # Test the underlying service directly for reliability
-    from app.landing import create_contact_inquiry
+    # Store through the form's write buffer directly for reliability
+    from app.inquiry_buffer import inquiry_buffer
     from app.models import ContactInquiryCreate
 
     inquiry_data = ContactInquiryCreate(
@@ -129,7 +139,7 @@ async def test_contact_form_submission_success(user: User, new_db) -> None:
         message="We are interested in discussing potential investment opportunities in your AI solutions.",
     )
 
-    inquiry = create_contact_inquiry(inquiry_data)
+    inquiry = await inquiry_buffer.submit(inquiry_data)
     assert inquiry is not None
 
     # Verify data was stored in database
@@ -143,6 +153,48 @@ async def test_contact_form_submission_success(user: User, new_db) -> None:
         assert "investment opportunities" in stored_inquiry.message.lower()
 
 
+async def test_contact_form_submission_through_ui(user: User, new_db, async_engine) -> None:
+    """Test that submitting the filled form stores the inquiry without blocking the page."""
+    await user.open("/")
+
+    user.find(kind=ui.input, content="Nama").type("Siti Investor")
+    user.find(kind=ui.input, content="Email").type("Siti@Venture.co.id")
+    user.find(kind=ui.input, content="Perusahaan").type("Venture Nusantara")
+    user.find(kind=ui.textarea).type("Kami tertarik berinvestasi.")
+    user.find("Kirim Pesan").click()
+
+    await user.should_see("Terima kasih! Pesan Anda telah terkirim. Tim kami akan segera menghubungi Anda.")
+
+    with get_session() as session:
+        inquiries = session.exec(select(ContactInquiry)).all()
+        assert len(inquiries) == 1
+        assert inquiries[0].email == "siti@venture.co.id"
+
+
+async def test_contact_form_submissions_are_rate_limited_per_session(user: User, new_db, async_engine) -> None:
+    """Test that a session submitting faster than the form limit is told to wait, also after a reload."""
+    await user.open("/")
+
+    for i in range(4):
+        if i == 3:
+            await user.open("/")
+        user.find(kind=ui.input, content="Nama").type("Siti Investor")
+        user.find(kind=ui.input, content="Email").type("siti@venture.co.id")
+        user.find(kind=ui.input, content="Perusahaan").type("Venture Nusantara")
+        user.find(kind=ui.textarea).type(f"Pertanyaan nomor {i}")
+        user.find("Kirim Pesan").click()
+        if i < 3:
+            # wait until the form was cleared after the acknowledged submission
+            for _ in range(100):
+                if not user.find(kind=ui.textarea).elements.pop().value:
+                    break
+                await asyncio.sleep(0.02)
+
+    await user.should_see("Terlalu banyak pengiriman")
+    with get_session() as session:
+        assert len(session.exec(select(ContactInquiry)).all()) == 3
+
+
 async def test_contact_form_validation_empty_fields(user: User) -> None:
     """Test contact form validation for empty fields."""
     await user.open("/")
@@ -171,7 +223,7 @@ async def test_contact_form_validation_invalid_email(user: User) -> None:
     await user.should_see("Kirim Pesan")
 
 
-async def test_contact_form_behavior(user: User, new_db) -> None:
+async def test_contact_form_behavior(user: User, new_db, async_engine) -> None:
     """Test contact form behavior and service integration."""
     await user.open("/")
 
@@ -183,14 +235,14 @@ async def test_contact_form_behavior(user: User, new_db) -> None:
     await user.should_see("Kirim Pesan")
 
     # Test the underlying functionality with service layer
-    from app.landing import create_contact_inquiry
+    from app.inquiry_buffer import inquiry_buffer
     from app.models import ContactInquiryCreate
 
     inquiry_data = ContactInquiryCreate(
         name="Jane Doe", email="jane@company.com", company="Tech Corp", message="Interested in partnership."
     )
 
-    inquiry = create_contact_inquiry(inquiry_data)
+    inquiry = await inquiry_buffer.submit(inquiry_data)
     assert inquiry is not None
 
     # Verify the data was stored
@@ -200,7 +252,7 @@ async def test_contact_form_behavior(user: User, new_db) -> None:
         assert inquiries[0].name == "Jane Doe"
 
 
-async def test_multiple_form_submissions_service(user: User, new_db) -> None:
+async def test_multiple_form_submissions_service(user: User, new_db, async_engine) -> None:
     """Test multiple contact form submissions via service layer."""
     await user.open("/")
 
@@ -208,7 +260,7 @@ async def test_multiple_form_submissions_service(user: User, new_db) -> None:
     await user.should_see("Kirim Pesan")
 
     # Test multiple submissions through service layer
-    from app.landing import create_contact_inquiry
+    from app.inquiry_buffer import inquiry_buffer
     from app.models import ContactInquiryCreate
 
     # First submission
@@ -216,7 +268,7 @@ async def test_multiple_form_submissions_service(user: User, new_db) -> None:
         name="User One", email="user1@test.com", company="Company One", message="First inquiry"
     )
 
-    inquiry1 = create_contact_inquiry(inquiry_data_1)
+    inquiry1 = await inquiry_buffer.submit(inquiry_data_1)
     assert inquiry1 is not None
 
     # Second submission
@@ -224,7 +276,7 @@ async def test_multiple_form_submissions_service(user: User, new_db) -> None:
         name="User Two", email="user2@test.com", company="Company Two", message="Second inquiry"
     )
 
-    inquiry2 = create_contact_inquiry(inquiry_data_2)
+    inquiry2 = await inquiry_buffer.submit(inquiry_data_2)
     assert inquiry2 is not None
 
     # Verify both submissions were stored
@@ -0,0 +1,189 @@
+"""Tests for the metrics registry, the request metrics middleware and the session timing hooks."""
+
+import threading
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlmodel import delete
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocket
+
+from app.database import dispose_async_engine, get_async_session, get_session
+from app.metrics import (
+    CONTENT_TYPE,
+    DB_COMMIT_SECONDS,
+    DB_TRANSACTION_SECONDS,
+    HTTP_REQUEST_SECONDS,
+    WEBSOCKETS,
+    Counter,
+    Histogram,
+    MetricsMiddleware,
+    Registry,
+    create_router,
+)
+from app.models import ContactInquiry
+
+
+def count(histogram: Histogram, *labels: str) -> float:
+    """Observations recorded so far: the bucket counts, without the trailing sum."""
+    return sum(histogram.labels(*labels).cells.totals()[:-1])
+
+
+def make_app() -> FastAPI:
+    api = FastAPI()
+
+    @api.get("/items/{item_id}")
+    async def item(item_id: int) -> dict[str, int]:
+        return {"id": item_id}
+
+    @api.websocket("/ws")
+    async def echo(websocket: WebSocket) -> None:
+        await websocket.accept()
+        await websocket.send_text("connected")
+        await websocket.receive_text()
+        await websocket.close()
+
+    api.include_router(create_router())
+    api.add_middleware(MetricsMiddleware)
+    return api
+
+
+async def get(api: FastAPI, path: str) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(api), base_url="http://test") as client:
+        return await client.get(path)
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.register(Histogram("work_seconds", "Work", ["kind"], buckets=(0.1, 1.0)))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.labels("a").observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP work_seconds Work",
+        "# TYPE work_seconds histogram",
+        'work_seconds_bucket{kind="a",le="0.1"} 2',
+        'work_seconds_bucket{kind="a",le="1"} 3',
+        'work_seconds_bucket{kind="a",le="+Inf"} 4',
+        'work_seconds_sum{kind="a"} 3.65',
+        'work_seconds_count{kind="a"} 4',
+    ]
+
+
+def test_counts_from_many_threads_are_exact():
+    counter = Counter("events_total", "Events")
+
+    def record() -> None:
+        for _ in range(10_000):
+            counter.inc()
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.collect()[-1] == "events_total 80000"
+
+
+def test_label_combinations_are_capped():
+    counter = Counter("hits_total", "Hits", ["user"], max_series=2)
+    for user in ("a", "b", "c", "d"):
+        counter.labels(user).inc()
+
+    assert counter.collect()[2:] == ['hits_total{user="a"} 1', 'hits_total{user="b"} 1', 'hits_total{user="other"} 2']
+    with pytest.raises(ValueError):
+        counter.labels("a", "b")
+
+
+def test_registering_a_name_twice_fails():
+    registry = Registry()
+    registry.register(Counter("dup_total", "Dup"))
+    with pytest.raises(ValueError):
+        registry.register(Counter("dup_total", "Dup"))
+
+
+async def test_requests_are_labelled_by_route_template():
+    """Test that path parameters and unknown paths do not create a series per URL."""
+    api = make_app()
+    before = count(HTTP_REQUEST_SECONDS, "GET", "/items/{item_id}", "2xx")
+    unmatched = count(HTTP_REQUEST_SECONDS, "GET", "unmatched", "4xx")
+
+    for item_id in range(5):
+        await get(api, f"/items/{item_id}")
+    await get(api, "/no/such/page")
+
+    assert count(HTTP_REQUEST_SECONDS, "GET", "/items/{item_id}", "2xx") == before + 5
+    assert count(HTTP_REQUEST_SECONDS, "GET", "unmatched", "4xx") == unmatched + 1
+
+
+def test_open_websockets_are_counted():
+    before = WEBSOCKETS.labels().cells.totals()[0]
+    with TestClient(make_app()) as client:
+        with client.websocket_connect("/ws") as websocket:
+            assert websocket.receive_text() == "connected"
+            assert WEBSOCKETS.labels().cells.totals()[0] == before + 1
+            websocket.send_text("bye")
+
+    assert WEBSOCKETS.labels().cells.totals()[0] == before
+
+
+async def test_metrics_endpoint():
+    response = await get(make_app(), "/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert "# TYPE nicegui_clients gauge" in response.text
+
+
+def inquiry() -> ContactInquiry:
+    return ContactInquiry(name="A", email="a@example.com", company="C", message="metrics")
+
+
+async def test_session_commits_are_timed():
+    sync_before = count(DB_COMMIT_SECONDS, "psycopg2")
+    async_before = count(DB_COMMIT_SECONDS, "asyncpg")
+    rollbacks = count(DB_TRANSACTION_SECONDS, "psycopg2", "rollback")
+
+    with get_session() as session:
+        session.add(inquiry())
+        session.commit()
+    with get_session() as session:
+        session.add(inquiry())
+        session.flush()
+        session.rollback()
+    try:
+        async with get_async_session() as session:
+            session.add(inquiry())
+            await session.commit()
+            await (await session.connection()).execute(delete(ContactInquiry))
+            await session.commit()
+    finally:
+        await dispose_async_engine()
+
+    assert count(DB_COMMIT_SECONDS, "psycopg2") == sync_before + 1
+    assert count(DB_COMMIT_SECONDS, "asyncpg") == async_before + 2
+    assert count(DB_TRANSACTION_SECONDS, "psycopg2", "rollback") == rollbacks + 1
+
+
+async def test_query_cache_counters_are_exported():
+    pytest.importorskip("databricks.sdk")
+    from app.dbrx import query_cache
+
+    key = ("SELECT 'metrics'", ())
+    query_cache.get_or_load(key, lambda: [{"id": "1"}], ttl=60)
+    query_cache.get_or_load(key, lambda: [{"id": "1"}], ttl=60)
+    try:
+        stats = query_cache.stats()
+        text = (await get(make_app(), "/metrics")).text
+    finally:
+        query_cache.invalidate(key)
+
+    assert stats["hits"] >= 1
+    assert "# TYPE databricks_query_cache_events_total counter" in text
+    assert f'databricks_query_cache_events_total{{event="hit"}} {stats["hits"]}' in text
+    assert f'databricks_query_cache_events_total{{event="miss"}} {stats["misses"]}' in text
+    assert f"databricks_query_cache_entries {stats['entries']}" in text
+    assert f"databricks_query_cache_bytes {stats['bytes']}" in text
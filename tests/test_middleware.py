@@ -0,0 +1,110 @@
+"""Tests for the pure ASGI security headers middleware."""
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route, WebSocketRoute
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocket
+
+from app.middleware import CONTENT_SECURITY_POLICY, HeaderRule, SecurityHeadersMiddleware
+
+
+async def page(request):
+    return HTMLResponse("<h1>hi</h1>")
+
+
+async def health(request):
+    return JSONResponse({"status": "healthy"})
+
+
+async def asset(request):
+    return Response("<svg/>", media_type="image/svg+xml", headers={"Cache-Control": "no-cache"})
+
+
+async def text(request):
+    return PlainTextResponse("plain", headers={"X-Content-Type-Options": "custom"})
+
+
+async def echo(websocket: WebSocket):
+    await websocket.accept()
+    await websocket.send_text("connected")
+    await websocket.close()
+
+
+def make_app(*rules: HeaderRule) -> Starlette:
+    app = Starlette(
+        routes=[
+            Route("/", page),
+            Route("/health", health),
+            Route("/static/logo.svg", asset),
+            Route("/text", text),
+            WebSocketRoute("/ws", echo),
+        ]
+    )
+    if rules:
+        app.add_middleware(SecurityHeadersMiddleware, rules=rules)
+    else:
+        app.add_middleware(SecurityHeadersMiddleware)
+    return app
+
+
+async def get(app: Starlette, path: str) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app), base_url="http://test") as client:
+        return await client.get(path)
+
+
+async def test_default_headers_on_html():
+    """Test that HTML responses get the security headers and the CSP."""
+    response = await get(make_app(), "/")
+
+    assert response.text == "<h1>hi</h1>"
+    assert response.headers["x-xss-protection"] == "1; mode=block"
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["referrer-policy"] == "strict-origin-when-cross-origin"
+    assert response.headers["content-security-policy"] == CONTENT_SECURITY_POLICY
+
+
+async def test_csp_only_on_documents():
+    """Test that JSON gets no CSP while SVG, which browsers render as a document, does."""
+    health_response = await get(make_app(), "/health")
+    svg_response = await get(make_app(), "/static/logo.svg")
+
+    assert "content-security-policy" not in health_response.headers
+    assert health_response.headers["x-content-type-options"] == "nosniff"
+    assert health_response.headers["cache-control"] == "no-store"
+    assert svg_response.headers["content-security-policy"] == CONTENT_SECURITY_POLICY
+
+
+async def test_configured_header_replaces_endpoint_value():
+    response = await get(make_app(), "/text")
+
+    assert response.headers.get_list("x-content-type-options") == ["nosniff"]
+
+
+async def test_prefix_rules_are_cumulative_and_specific_rule_wins():
+    app = make_app(
+        HeaderRule("/", headers={"X-Frame-Options": "DENY", "Cache-Control": "no-cache"}),
+        HeaderRule("/static/", headers={"Cache-Control": "public, max-age=31536000, immutable"}),
+    )
+
+    asset_response = await get(app, "/static/logo.svg")
+    page_response = await get(app, "/")
+
+    assert asset_response.headers["x-frame-options"] == "DENY"
+    assert asset_response.headers.get_list("cache-control") == ["public, max-age=31536000, immutable"]
+    assert page_response.headers["cache-control"] == "no-cache"
+    assert "content-security-policy" not in page_response.headers
+
+
+async def test_unmatched_path_is_untouched():
+    response = await get(make_app(HeaderRule("/static/", headers={"X-Asset": "1"})), "/")
+
+    assert "x-asset" not in response.headers
+    assert response.text == "<h1>hi</h1>"
+
+
+def test_websocket_passes_through():
+    with TestClient(make_app()) as client:
+        with client.websocket_connect("/ws") as websocket:
+            assert websocket.receive_text() == "connected"
@@ -0,0 +1,134 @@
+"""Tests for versioned schema migrations and the startup schema check."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlmodel import SQLModel
+
+from app.database import ENGINE, create_tables, reset_db
+from app.inquiry_storage import ARCHIVE_TABLE, INQUIRY_TABLE
+from app.migrations import (
+    LATEST_VERSION,
+    MIGRATION_LOCK_KEY,
+    SCHEMA_VERSION_TABLE,
+    SchemaVersionError,
+    check_schema,
+    migrate,
+)
+
+
+def _drop_all() -> None:
+    with ENGINE.begin() as conn:
+        for table in inspect(conn).get_table_names():
+            conn.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+
+
+@pytest.fixture
+def empty_db():
+    """Start from a database without any tables and restore the migrated schema afterwards."""
+    _drop_all()
+    yield
+    _drop_all()
+    reset_db()
+
+
+def _indexes() -> set[str]:
+    return {index["name"] for index in inspect(ENGINE).get_indexes(INQUIRY_TABLE.name)}
+
+
+def test_migrate_applies_every_version_once(empty_db):
+    assert migrate(ENGINE) == list(range(1, LATEST_VERSION + 1))
+    assert migrate(ENGINE) == []
+
+    with ENGINE.connect() as conn:
+        versions = conn.execute(text(f"SELECT version FROM {SCHEMA_VERSION_TABLE} ORDER BY version")).scalars().all()
+    assert versions == list(range(1, LATEST_VERSION + 1))
+    assert check_schema(ENGINE) == LATEST_VERSION
+
+
+def test_migrated_schema_matches_models(empty_db):
+    """Test that the migrations create every column and index the models declare."""
+    migrate(ENGINE)
+
+    columns = {column["name"]: column for column in inspect(ENGINE).get_columns(INQUIRY_TABLE.name)}
+    for column in INQUIRY_TABLE.columns:
+        assert column.name in columns
+        assert columns[column.name]["nullable"] == column.nullable
+    assert {index.name for index in INQUIRY_TABLE.indexes} <= _indexes()
+
+
+def test_check_schema_rejects_unmigrated_database(empty_db):
+    with pytest.raises(SchemaVersionError, match="python -m app.migrations"):
+        check_schema(ENGINE)
+
+
+def test_database_created_before_migrations_is_adopted(empty_db):
+    """Test that tables created by create_all without indexes or dedup_key are brought up to date."""
+    SQLModel.metadata.create_all(ENGINE)
+    ARCHIVE_TABLE.create(ENGINE)
+    with ENGINE.begin() as conn:
+        for index in INQUIRY_TABLE.indexes:
+            conn.execute(text(f"DROP INDEX {index.name}"))
+        for table in (INQUIRY_TABLE.name, ARCHIVE_TABLE.name):
+            conn.execute(text(f"ALTER TABLE {table} DROP COLUMN dedup_key"))
+
+    migrate(ENGINE)
+
+    assert {index.name for index in INQUIRY_TABLE.indexes} <= _indexes()
+    assert "dedup_key" in {column["name"] for column in inspect(ENGINE).get_columns(ARCHIVE_TABLE.name)}
+
+
+def test_invalid_index_from_interrupted_build_is_rebuilt(empty_db):
+    migrate(ENGINE)
+    with ENGINE.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE pg_index SET indisvalid = false WHERE indexrelid = 'ix_contact_inquiries_created_at'::regclass"
+            )
+        )
+        conn.execute(text(f"DELETE FROM {SCHEMA_VERSION_TABLE} WHERE version >= 2"))
+
+    migrate(ENGINE)
+
+    with ENGINE.connect() as conn:
+        valid = conn.execute(
+            text("SELECT indisvalid FROM pg_index WHERE indexrelid = 'ix_contact_inquiries_created_at'::regclass")
+        ).scalar_one()
+    assert valid
+
+
+def test_concurrent_runs_wait_for_each_other(empty_db):
+    """Test that replicas running the migration command at the same time do not race each other's DDL."""
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = [future.result() for future in [pool.submit(migrate, ENGINE) for _ in range(4)]]
+
+    assert sorted(len(applied) for applied in results) == [0, 0, 0, LATEST_VERSION]
+    assert check_schema(ENGINE) == LATEST_VERSION
+
+
+def test_waiting_replica_does_not_block_concurrent_index_builds(empty_db):
+    """Test that a replica cold-starting while another holds the lock does not deadlock its CREATE INDEX CONCURRENTLY.
+
+    CONCURRENTLY waits for every transaction with an older snapshot, so a replica waiting for the
+    lock inside a transaction (or a blocking lock statement) would never let the holder finish.
+    """
+    with ENGINE.connect().execution_options(isolation_level="AUTOCOMMIT") as holder:
+        holder.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            replica = pool.submit(create_tables)
+            deadline = time.monotonic() + 10
+            while not holder.execute(
+                text("SELECT count(*) FROM pg_stat_activity WHERE query LIKE 'SELECT pg_try_advisory_lock%'")
+            ).scalar_one():
+                assert time.monotonic() < deadline, "the replica never started waiting for the lock"
+                time.sleep(0.05)
+
+            holder.execute(text("SET statement_timeout = '5s'"))
+            holder.execute(text("CREATE TABLE cic_probe (id int)"))
+            holder.execute(text("CREATE INDEX CONCURRENTLY ix_cic_probe ON cic_probe (id)"))
+            holder.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            replica.result(timeout=30)
+
+    assert check_schema(ENGINE) == LATEST_VERSION
@@ -0,0 +1,172 @@
+"""Tests for the query result cache."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.query_cache import QueryResultCache, cache_key, estimate_size, normalize_sql
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingLoader:
+    def __init__(self, rows: list[dict] | None = None, delay: float = 0.0) -> None:
+        self.rows = rows if rows is not None else [{"id": "1"}]
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self) -> list[dict]:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return self.rows
+
+
+def test_normalize_sql_collapses_whitespace_outside_literals():
+    assert normalize_sql("SELECT *\n  FROM   t\tWHERE x = 1 ;") == "SELECT * FROM t WHERE x = 1"
+    assert normalize_sql("SELECT 'a   b' FROM t") == "SELECT 'a   b' FROM t"
+    assert normalize_sql("SELECT 'it''s  here'  FROM t") == "SELECT 'it''s  here' FROM t"
+
+
+def test_normalize_sql_drops_comments_outside_literals():
+    assert normalize_sql("SELECT * FROM t -- all rows\nWHERE x = 1") == "SELECT * FROM t WHERE x = 1"
+    assert normalize_sql("SELECT /* every\ncolumn */ * FROM t") == "SELECT * FROM t"
+    assert normalize_sql("SELECT '-- not a comment', '/* nor this */' FROM t") == (
+        "SELECT '-- not a comment', '/* nor this */' FROM t"
+    )
+
+
+def test_commented_out_lines_do_not_share_a_key_with_the_remaining_query():
+    with_filter = "SELECT * FROM t -- recent rows\nWHERE created_at > '2026-01-01'"
+    without_filter = "SELECT * FROM t -- recent rows WHERE created_at > '2026-01-01'"
+
+    assert cache_key(with_filter) != cache_key(without_filter)
+    assert normalize_sql(without_filter) == "SELECT * FROM t"
+
+
+def test_normalize_sql_keeps_backslash_escaped_quotes_inside_literals():
+    assert normalize_sql(r"SELECT 'it\'s  here'  FROM t") == r"SELECT 'it\'s  here' FROM t"
+    assert normalize_sql(r'SELECT "a\"  b"  FROM t') == r'SELECT "a\"  b" FROM t'
+    assert normalize_sql(r"SELECT 'a\\'  FROM t") == r"SELECT 'a\\' FROM t"
+    assert cache_key(r"SELECT 'x\'  y'") != cache_key(r"SELECT 'x\' y'")
+
+
+def test_cache_key_includes_sorted_params():
+    assert cache_key("SELECT 1", {"b": 2, "a": "x"}) == cache_key("SELECT  1", {"a": "x", "b": 2})
+    assert cache_key("SELECT 1", {"a": 1}) != cache_key("SELECT 1", {"a": "1"})
+    assert cache_key("SELECT 1") == cache_key("SELECT 1", {})
+
+
+def test_hit_within_ttl_and_reload_after_expiry():
+    clock = FakeClock()
+    cache = QueryResultCache(clock=clock)
+    loader = CountingLoader()
+
+    assert cache.get_or_load("k", loader, ttl=10) == [{"id": "1"}]
+    assert cache.get_or_load("k", loader, ttl=10) == [{"id": "1"}]
+    assert loader.calls == 1
+
+    clock.now = 11
+    cache.get_or_load("k", loader, ttl=10)
+    assert loader.calls == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["expirations"] == 1
+
+
+def test_zero_ttl_bypasses_cache():
+    cache = QueryResultCache()
+    loader = CountingLoader()
+
+    cache.get_or_load("k", loader, ttl=0)
+    cache.get_or_load("k", loader, ttl=0)
+
+    assert loader.calls == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_by_memory():
+    """Test that the least recently used entry is evicted once the byte budget is exceeded."""
+    rows = [{"value": "x" * 100}]
+    entry_size = estimate_size(rows)
+    cache = QueryResultCache(max_bytes=entry_size * 2)
+
+    cache.get_or_load("a", CountingLoader(rows), ttl=60)
+    cache.get_or_load("b", CountingLoader(rows), ttl=60)
+    cache.get_or_load("a", CountingLoader(rows), ttl=60)  # touch a, b is now least recently used
+    cache.get_or_load("c", CountingLoader(rows), ttl=60)
+
+    reloaded_b = CountingLoader(rows)
+    reloaded_a = CountingLoader(rows)
+    cache.get_or_load("a", reloaded_a, ttl=60)
+    stats = cache.stats()
+    assert reloaded_a.calls == 0
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= cache.max_bytes
+    cache.get_or_load("b", reloaded_b, ttl=60)
+    assert reloaded_b.calls == 1
+
+
+def test_oversized_result_not_cached():
+    cache = QueryResultCache(max_bytes=10)
+    loader = CountingLoader([{"value": "x" * 100}])
+
+    cache.get_or_load("k", loader, ttl=60)
+    cache.get_or_load("k", loader, ttl=60)
+
+    assert loader.calls == 2
+    assert cache.stats()["bytes"] == 0
+
+
+def test_concurrent_misses_share_one_load():
+    """Test single-flight: many threads asking for the same key cause one query."""
+    cache = QueryResultCache()
+    loader = CountingLoader(delay=0.1)
+    results: list[list[dict]] = []
+
+    def call() -> None:
+        results.append(cache.get_or_load("k", loader, ttl=60))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loader.calls == 1
+    assert results == [[{"id": "1"}]] * 8
+    assert cache.stats()["coalesced"] == 7
+
+
+def test_failed_load_propagates_to_waiters_and_is_not_cached():
+    cache = QueryResultCache()
+
+    def failing() -> list[dict]:
+        time.sleep(0.1)
+        raise RuntimeError("warehouse down")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(cache.get_or_load, "k", failing, ttl=60) for _ in range(3)]
+    errors = [future.exception() for future in futures]
+
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert cache.stats()["entries"] == 0
+    assert cache.get_or_load("k", CountingLoader(), ttl=60) == [{"id": "1"}]
+
+
+def test_invalidate():
+    cache = QueryResultCache()
+    cache.get_or_load("a", CountingLoader(), ttl=60)
+    cache.get_or_load("b", CountingLoader(), ttl=60)
+
+    cache.invalidate("a")
+    assert cache.stats()["entries"] == 1
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
@@ -0,0 +1,167 @@
+"""Tests for the token-bucket rate limiter and its ASGI middleware."""
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from app.ratelimit import (
+    InMemoryBackend,
+    RateLimit,
+    RateLimitMiddleware,
+    RouteLimit,
+    client_ip,
+    form_submission_wait,
+    retry_after,
+)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def ok(request):
+    return PlainTextResponse("ok")
+
+
+async def echo(websocket: WebSocket):
+    await websocket.accept()
+    await websocket.send_text("connected")
+    await websocket.close()
+
+
+def make_app(backend: InMemoryBackend, **kwargs) -> Starlette:
+    app = Starlette(routes=[Route("/", ok), Route("/health", ok), Route("/ws/", ok), WebSocketRoute("/socket", echo)])
+    rules = (
+        RouteLimit("/", RateLimit.parse("2/minute")),
+        RouteLimit("/health", None),
+        RouteLimit("/ws", RateLimit.parse("1/minute"), new_sessions_only=True),
+        RouteLimit("/socket", RateLimit.parse("1/minute")),
+    )
+    app.add_middleware(RateLimitMiddleware, backend=backend, rules=rules, **kwargs)
+    return app
+
+
+async def get(app: Starlette, path: str, headers: dict[str, str] | None = None) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app), base_url="http://test") as client:
+        return await client.get(path, headers=headers)
+
+
+def test_parse():
+    assert RateLimit.parse("5/minute") == RateLimit(rate=5 / 60, burst=5)
+    assert RateLimit.parse(" 2/seconds ") == RateLimit(rate=2, burst=2)
+    with pytest.raises(ValueError, match="fortnight"):
+        RateLimit.parse("1/fortnight")
+    with pytest.raises(ValueError):
+        RateLimit.parse("0/minute")
+
+
+async def test_bucket_allows_burst_then_refills():
+    clock = Clock()
+    backend = InMemoryBackend(clock=clock)
+    limit = RateLimit(rate=1.0, burst=2)
+
+    assert await backend.acquire("a", limit) == 0
+    assert await backend.acquire("a", limit) == 0
+    assert await backend.acquire("a", limit) == pytest.approx(1.0)
+    assert await backend.acquire("b", limit) == 0
+
+    clock.now += 0.5
+    assert await backend.acquire("a", limit) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert await backend.acquire("a", limit) == 0
+    assert backend.stats()["limited"] == 2
+
+
+async def test_idle_buckets_are_evicted_first():
+    backend = InMemoryBackend(max_buckets=2, clock=Clock())
+    limit = RateLimit(rate=0.001, burst=1)
+
+    await backend.acquire("a", limit)
+    await backend.acquire("b", limit)
+    await backend.acquire("a", limit)
+    await backend.acquire("c", limit)
+
+    assert backend.stats()["buckets"] == 2
+    assert backend.stats()["evictions"] == 1
+    # "b" was idle the longest and starts over with a full bucket
+    assert await backend.acquire("b", limit) == 0
+    assert await backend.acquire("c", limit) > 0
+
+
+async def test_middleware_returns_429_with_retry_after():
+    app = make_app(InMemoryBackend())
+
+    statuses = [(await get(app, "/")).status_code for _ in range(3)]
+    response = await get(app, "/")
+
+    assert statuses == [200, 200, 429]
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "30"
+
+
+async def test_middleware_limits_per_client_ip():
+    app = make_app(InMemoryBackend(), trust_forwarded=True)
+
+    for _ in range(2):
+        assert (await get(app, "/", {"X-Forwarded-For": "10.0.0.1"})).status_code == 200
+    assert (await get(app, "/", {"X-Forwarded-For": "10.0.0.1"})).status_code == 429
+    assert (await get(app, "/", {"X-Forwarded-For": "10.0.0.1, 10.0.0.2"})).status_code == 200
+
+
+async def test_exempt_prefix_and_existing_sessions_are_not_counted():
+    app = make_app(InMemoryBackend())
+
+    assert [(await get(app, "/health")).status_code for _ in range(5)] == [200] * 5
+    assert (await get(app, "/ws/?EIO=4&transport=polling")).status_code == 200
+    assert (await get(app, "/ws/?EIO=4&transport=polling")).status_code == 429
+    assert (await get(app, "/ws/?EIO=4&transport=polling&sid=abc")).status_code == 200
+
+
+def test_websocket_handshake_rejected_when_limited():
+    with TestClient(make_app(InMemoryBackend())) as client:
+        with client.websocket_connect("/socket") as websocket:
+            assert websocket.receive_text() == "connected"
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/socket"):
+                pass
+
+
+def test_client_ip():
+    scope = {"client": ("1.2.3.4", 5000), "headers": [(b"x-forwarded-for", b"9.9.9.9, 5.6.7.8")]}
+    assert client_ip(scope, trust_forwarded=False) == "1.2.3.4"
+    assert client_ip(scope, trust_forwarded=True) == "5.6.7.8"
+    assert client_ip({"headers": []}, trust_forwarded=False) == "unknown"
+
+
+def test_retry_after_rounds_up():
+    assert retry_after(0.01) == "1"
+    assert retry_after(12.2) == "13"
+
+
+async def test_form_submission_limited_per_session_and_ip():
+    backend = InMemoryBackend(clock=Clock())
+
+    assert [await form_submission_wait("s1", "1.2.3.4", backend) for _ in range(3)] == [0, 0, 0]
+    assert await form_submission_wait("s1", "1.2.3.4", backend) > 0
+    # a fresh session from the same address still counts against the address
+    waits = [await form_submission_wait(f"s{i}", "1.2.3.4", backend) for i in range(2, 20)]
+    assert waits.count(0) == 17
+
+
+async def test_form_submission_refused_by_ip_keeps_the_session_token():
+    backend = InMemoryBackend(clock=Clock())
+    for i in range(20):
+        await form_submission_wait(f"other{i}", "1.2.3.4", backend)
+
+    assert await form_submission_wait("s1", "1.2.3.4", backend) > 0
+    # the refused attempts did not use up the session's own budget
+    assert [await form_submission_wait("s1", "5.6.7.8", backend) for _ in range(3)] == [0, 0, 0]
+    assert await form_submission_wait("s1", "5.6.7.8", backend) > 0
@@ -0,0 +1,86 @@
+"""Tests for startup phases, connection pool warm-up and the readiness endpoint."""
+
+import subprocess
+import sys
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.database import dispose_async_engine, get_pool_stats, warm_up_pools
+from app.health import create_router
+from app.startup import StartupReport, startup_report, warm_up
+
+
+@pytest.fixture
+async def fresh_report():
+    """Run against a clean startup report and restore the shared one afterwards."""
+    saved = (dict(startup_report.phases), startup_report.ready, startup_report.error)
+    startup_report.phases.clear()
+    startup_report.ready = False
+    startup_report.error = None
+    yield startup_report
+    startup_report.phases, startup_report.ready, startup_report.error = saved
+    await dispose_async_engine()
+
+
+async def get_ready() -> httpx.Response:
+    api = FastAPI()
+    api.include_router(create_router([]))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(api), base_url="http://test") as client:
+        return await client.get("/health/ready")
+
+
+def test_importing_the_app_does_not_load_databricks_or_database_drivers():
+    """Test that the drivers and the Databricks SDK are only imported when first used."""
+    code = (
+        "import sys, app.startup; "
+        "print(','.join(m for m in ('databricks.sdk', 'pyarrow', 'psycopg2', 'asyncpg') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_report_records_phases_and_failures():
+    report = StartupReport()
+    with report.phase("schema"):
+        pass
+    with pytest.raises(RuntimeError):
+        with report.phase("pages"):
+            raise RuntimeError("boom")
+
+    assert set(report.phases) == {"schema", "pages"}
+    assert report.error == "pages: boom"
+    assert report.as_dict()["status"] == "failed"
+    assert report.summary().startswith("Startup took")
+
+
+async def test_warm_up_fills_both_pools(fresh_report):
+    await dispose_async_engine()
+
+    await warm_up_pools(connections=3)
+
+    stats = get_pool_stats()
+    assert stats["sync"]["checked_in"] >= 3
+    assert stats["async"]["checked_in"] == 3
+
+
+async def test_ready_only_after_warm_up(fresh_report):
+    assert (await get_ready()).status_code == 503
+
+    await warm_up()
+
+    response = await get_ready()
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert "pool_warm_up" in response.json()["phases_ms"]
+
+
+async def test_not_ready_when_startup_failed(fresh_report):
+    fresh_report.error = "schema: database schema is at version 0"
+
+    await warm_up()
+
+    response = await get_ready()
+    assert response.status_code == 503
+    assert response.json()["status"] == "failed"
@@ -0,0 +1,218 @@
+"""Tests for spans, trace propagation and the tracing exporters."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from nicegui import ui
+from nicegui.testing import User
+
+from app.database import dispose_async_engine, get_async_session, get_session, reset_db
+from app.inquiry_buffer import InquiryWriteBuffer
+from app.models import ContactInquiry, ContactInquiryCreate
+from app.tracing import (
+    FileExporter,
+    InMemoryExporter,
+    Span,
+    SpanContext,
+    Tracer,
+    TracingMiddleware,
+    current_context,
+    set_exporter,
+    traced,
+    tracer,
+)
+from app.validation import inquiry_from_create
+
+
+@pytest.fixture
+def spans():
+    """Record spans in memory for the duration of a test."""
+    exporter = InMemoryExporter()
+    set_exporter(exporter)
+    yield exporter
+    set_exporter(None)
+
+
+@pytest.fixture
+def clean_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+def by_name(exporter: InMemoryExporter) -> dict[str, Span]:
+    return {span.name: span for span in exporter.spans}
+
+
+def inquiry(message: str = "Kami tertarik berinvestasi.") -> ContactInquiryCreate:
+    return ContactInquiryCreate(name="Siti", email="siti@venture.co.id", company="Venture", message=message)
+
+
+def test_spans_nest_and_record_errors(spans):
+    with tracer.span("outer") as outer:
+        with pytest.raises(ValueError):
+            with tracer.span("inner"):
+                raise ValueError("boom")
+        assert current_context() == outer.context
+    assert current_context() is None
+
+    recorded = by_name(spans)
+    assert recorded["inner"].parent_id == recorded["outer"].context.span_id
+    assert recorded["inner"].context.trace_id == recorded["outer"].context.trace_id
+    assert recorded["inner"].status == "ERROR"
+    assert recorded["inner"].attributes["exception"] == "ValueError: boom"
+    assert recorded["outer"].parent_id is None
+
+
+def test_nothing_is_recorded_while_disabled():
+    with Tracer().span("ignored") as span:
+        span.set_attribute("key", "value")
+        assert current_context() is None
+    assert span.attributes == {}
+
+
+async def test_traced_wraps_sync_and_async_functions(spans):
+    @traced()
+    def double(value: int) -> int:
+        return value * 2
+
+    @traced("async_double")
+    async def async_double(value: int) -> int:
+        return await asyncio.to_thread(double, value)
+
+    assert await async_double(2) == 4
+    recorded = by_name(spans)
+    assert recorded["double"].parent_id == recorded["async_double"].context.span_id
+
+
+def test_traceparent_parsing():
+    context = SpanContext.from_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01")
+
+    assert context == SpanContext("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7")
+    assert context is not None
+    assert context.traceparent == "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    assert SpanContext.from_traceparent("garbage") is None
+    assert SpanContext.from_traceparent(f"00-{'0' * 32}-00f067aa0ba902b7-01") is None
+
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    file_tracer = Tracer(FileExporter(path))
+
+    with file_tracer.span("parent"):
+        with file_tracer.span("child", attributes={"rows": 3}):
+            pass
+
+    child, parent = [json.loads(line) for line in path.read_text().splitlines()]
+    assert child["name"] == "child"
+    assert child["attributes"] == {"rows": 3}
+    assert child["parent_id"] == parent["span_id"]
+
+
+async def test_request_continues_incoming_trace(spans):
+    api = FastAPI()
+
+    @api.get("/items/{item_id}")
+    async def item(item_id: int) -> dict[str, int]:
+        with tracer.span("load_item"):
+            return {"id": item_id}
+
+    api.add_middleware(TracingMiddleware)
+    incoming = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(api), base_url="http://test") as client:
+        await client.get("/items/7", headers={"traceparent": incoming})
+        await client.get("/health")
+
+    recorded = by_name(spans)
+    assert set(recorded) == {"GET /items/{item_id}", "load_item"}
+    server = recorded["GET /items/{item_id}"]
+    assert server.kind == "server"
+    assert server.context.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert server.parent_id == "00f067aa0ba902b7"
+    assert server.attributes["http.status_code"] == 200
+    assert recorded["load_item"].parent_id == server.context.span_id
+
+
+@traced()
+def store_inquiry(data: ContactInquiryCreate) -> ContactInquiry:
+    with get_session() as session:
+        row = inquiry_from_create(data)
+        session.add(row)
+        with tracer.span("session.commit"):
+            session.commit()
+        with tracer.span("session.refresh"):
+            session.refresh(row)
+        return row
+
+
+@traced()
+async def store_inquiry_async(data: ContactInquiryCreate) -> ContactInquiry:
+    async with get_async_session() as session:
+        row = inquiry_from_create(data)
+        session.add(row)
+        with tracer.span("session.commit"):
+            await session.commit()
+        return row
+
+
+def test_sql_statements_are_spans_of_the_commit_and_refresh(clean_db, spans):
+    """Test that a slow submission can be attributed to checkout, INSERT, commit or refresh."""
+    assert store_inquiry(inquiry()) is not None
+
+    recorded = by_name(spans)
+    root = recorded["store_inquiry"]
+    assert {span.context.trace_id for span in spans.spans} == {root.context.trace_id}
+    assert recorded["session.commit"].parent_id == root.context.span_id
+    assert recorded["db.insert"].parent_id == recorded["session.commit"].context.span_id
+    assert recorded["db.insert"].attributes["db.statement"].startswith("INSERT INTO contact_inquiries")
+    assert recorded["db.select"].parent_id == recorded["session.refresh"].context.span_id
+    assert "db.pool.checkout" in recorded
+
+
+async def test_async_sql_spans_stay_in_the_trace(clean_db, spans):
+    try:
+        assert await store_inquiry_async(inquiry()) is not None
+    finally:
+        await dispose_async_engine()
+
+    recorded = by_name(spans)
+    assert recorded["db.insert"].parent_id == recorded["session.commit"].context.span_id
+    assert recorded["db.insert"].context.trace_id == recorded["store_inquiry_async"].context.trace_id
+
+
+async def test_batched_write_links_every_submitter(clean_db, spans):
+    buffer = InquiryWriteBuffer(max_batch_size=2, max_delay=1.0)
+    try:
+        await asyncio.gather(buffer.submit(inquiry("first")), buffer.submit(inquiry("second")))
+    finally:
+        await dispose_async_engine()
+
+    submits = [span for span in spans.spans if span.name == "inquiry_buffer.submit"]
+    flush = by_name(spans)["inquiry_buffer.flush"]
+    assert flush.attributes["batch_size"] == 2
+    assert set(flush.links) == {span.context for span in submits}
+    assert by_name(spans)["db.insert"].context.trace_id == flush.context.trace_id
+
+
+async def test_form_submission_joins_the_page_load_trace(user: User, clean_db, spans) -> None:
+    """Test that the websocket event handler continues the trace of the request that built the page."""
+    try:
+        await user.open("/")
+        user.find(kind=ui.input, content="Nama").type("Siti Investor")
+        user.find(kind=ui.input, content="Email").type("siti@venture.co.id")
+        user.find(kind=ui.input, content="Perusahaan").type("Venture Nusantara")
+        user.find(kind=ui.textarea).type("Bagaimana tim Anda melacak permintaan yang lambat?")
+        user.find("Kirim Pesan").click()
+        await user.should_see("Terima kasih! Pesan Anda telah terkirim. Tim kami akan segera menghubungi Anda.")
+    finally:
+        await dispose_async_engine()
+
+    recorded = by_name(spans)
+    page, submit = recorded["landing_page"], recorded["submit_contact_form"]
+    assert submit.parent_id == page.context.span_id
+    assert submit.context.trace_id == page.context.trace_id
+    for name in ("validate_inquiry", "rate_limit", "inquiry_buffer.submit"):
+        assert recorded[name].parent_id == submit.context.span_id
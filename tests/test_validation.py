@@ -0,0 +1,78 @@
+"""Tests for the shared contact inquiry validation."""
+
+import pytest
+from nicegui import ui
+from nicegui.testing import User
+
+from app.models import ContactInquiry, ContactInquiryCreate
+from app.validation import MAX_LENGTHS, InvalidInquiry, inquiry_from_create, validate_inquiry
+
+
+def test_normalizes_and_returns_the_table_row():
+    inquiry = validate_inquiry("  Budi Santoso ", " Budi@Perusahaan.CO.ID\n", " PT Maju ", "  Halo tim  ")
+
+    assert isinstance(inquiry, ContactInquiry)
+    assert (inquiry.name, inquiry.email, inquiry.company, inquiry.message) == (
+        "Budi Santoso",
+        "budi@perusahaan.co.id",
+        "PT Maju",
+        "Halo tim",
+    )
+    assert inquiry.id is None
+    assert inquiry.created_at is not None
+
+
+@pytest.mark.parametrize(
+    ("fields", "field", "message"),
+    [
+        (("Budi", "", "PT Maju", "Halo"), None, "Semua field harus diisi"),
+        (("   ", "budi@maju.id", "PT Maju", "Halo"), None, "Semua field harus diisi"),
+        ((None, "budi@maju.id", "PT Maju", "Halo"), None, "Semua field harus diisi"),
+        (("Budi", "invalid-email", "PT Maju", "Halo"), "email", "Format email tidak valid"),
+        (("Budi", "budi@maju.id\nx", "PT Maju", "Halo"), "email", "Format email tidak valid"),
+        (("Budi", "budi@maju.id", "X" * 201, "Halo"), "company", "Perusahaan terlalu panjang (maksimal 200 karakter)"),
+    ],
+)
+def test_rejects_invalid_input(fields, field, message):
+    with pytest.raises(InvalidInquiry) as raised:
+        validate_inquiry(*fields)
+
+    assert raised.value.field == field
+    assert raised.value.message == message
+
+
+def test_lengths_follow_the_table_columns():
+    assert MAX_LENGTHS == {"name": 100, "email": 255, "company": 200, "message": 2000}
+    assert validate_inquiry("A" * 100, "a@b.co", "C" * 200, "M" * 2000).message == "M" * 2000
+
+
+def test_inquiry_from_create_lowercases_email():
+    data = ContactInquiryCreate(name="Test User", email="TEST.USER@EXAMPLE.COM", company="Test Co", message="Hi")
+
+    inquiry = inquiry_from_create(data)
+
+    assert isinstance(inquiry, ContactInquiry)
+    assert inquiry.email == "test.user@example.com"
+    assert inquiry.name == "Test User"
+
+
+async def test_form_reports_overlong_input(user: User) -> None:
+    await user.open("/")
+    user.find(kind=ui.input, content="Nama").type("N" * 101)
+    user.find(kind=ui.input, content="Email").type("panjang@nama.id")
+    user.find(kind=ui.input, content="Perusahaan").type("PT Panjang")
+    user.find(kind=ui.textarea).type("Nama saya panjang sekali.")
+    user.find("Kirim Pesan").click()
+
+    await user.should_see("Nama terlalu panjang (maksimal 100 karakter)")
+
+
+async def test_form_reports_invalid_email(user: User) -> None:
+    await user.open("/")
+    user.find(kind=ui.input, content="Nama").type("Budi")
+    user.find(kind=ui.input, content="Email").type("budi-at-maju")
+    user.find(kind=ui.input, content="Perusahaan").type("PT Maju")
+    user.find(kind=ui.textarea).type("Halo")
+    user.find("Kirim Pesan").click()
+
+    await user.should_see("Format email tidak valid")